@@ -0,0 +1,155 @@
+"""Partition audit_logs by month and add tenant/action/time indexes
+
+Revision ID: a3e9c5d17f20
+Revises: 8d4f2b6a1c77
+Create Date: 2025-07-26 08:15:42.918311
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "a3e9c5d17f20"
+down_revision: Union[str, None] = "8d4f2b6a1c77"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+AUDIT_COLUMNS = (
+    "id, tenant_id, user_id, impersonating_super_admin_id, action, resource_type, resource_id, "
+    "old_values, new_values, ip_address, user_agent, created_at, updated_at"
+)
+
+# Monthly partitions created ahead of time; AuditLogPartitionService keeps extending them
+PARTITIONS_AHEAD = 3
+
+
+def _audit_log_columns():
+    return [
+        sa.Column("tenant_id", sa.UUID(), nullable=True),
+        sa.Column("user_id", sa.UUID(), nullable=True),
+        sa.Column("impersonating_super_admin_id", sa.UUID(), nullable=True),
+        sa.Column("action", sa.String(length=100), nullable=False),
+        sa.Column("resource_type", sa.String(length=100), nullable=True),
+        sa.Column("resource_id", sa.UUID(), nullable=True),
+        sa.Column("old_values", sa.JSON(), nullable=True),
+        sa.Column("new_values", sa.JSON(), nullable=True),
+        sa.Column("ip_address", postgresql.INET(), nullable=True),
+        sa.Column("user_agent", sa.Text(), nullable=True),
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["impersonating_super_admin_id"], ["users.id"], ondelete="SET NULL"
+        ),
+        sa.ForeignKeyConstraint(["tenant_id"], ["tenants.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+    ]
+
+
+def _enable_rls():
+    op.execute("ALTER TABLE audit_logs ENABLE ROW LEVEL SECURITY")
+    op.execute("""
+        CREATE POLICY tenant_isolation ON audit_logs
+        FOR ALL
+        USING (tenant_id = current_setting('app.current_tenant_id')::uuid)
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+    op.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+
+    # Partitioned parent; the partition key has to be part of the primary key
+    op.create_table(
+        "audit_logs",
+        *_audit_log_columns(),
+        sa.PrimaryKeyConstraint("id", "created_at", name="audit_logs_pkey"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index("idx_audit_logs_tenant_created", "audit_logs", ["tenant_id", "created_at"], unique=False)
+    op.create_index(
+        "idx_audit_logs_tenant_action_created",
+        "audit_logs",
+        ["tenant_id", "action", "created_at"],
+        unique=False,
+    )
+    op.create_index("idx_audit_logs_user_created", "audit_logs", ["user_id", "created_at"], unique=False)
+    op.create_index(
+        "idx_audit_logs_created_brin",
+        "audit_logs",
+        ["created_at"],
+        unique=False,
+        postgresql_using="brin",
+    )
+
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    # One partition per month from the oldest existing entry up to PARTITIONS_AHEAD months ahead
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month_start date;
+            last_month date := (date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{PARTITIONS_AHEAD} months')::date;
+        BEGIN
+            SELECT COALESCE(
+                date_trunc('month', min(created_at) AT TIME ZONE 'UTC'),
+                date_trunc('month', now() AT TIME ZONE 'UTC')
+            )::date
+            INTO month_start
+            FROM audit_logs_legacy;
+
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_p' || to_char(month_start, 'YYYYMM'),
+                    to_char(month_start, 'YYYY-MM-DD') || ' 00:00:00+00',
+                    to_char(month_start + interval '1 month', 'YYYY-MM-DD') || ' 00:00:00+00'
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END
+        $$;
+    """)
+
+    op.execute(f"INSERT INTO audit_logs ({AUDIT_COLUMNS}) SELECT {AUDIT_COLUMNS} FROM audit_logs_legacy")
+    op.drop_table("audit_logs_legacy")
+
+    _enable_rls()
+    # ### end Alembic commands ###
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+
+    op.create_table(
+        "audit_logs",
+        *_audit_log_columns(),
+        sa.PrimaryKeyConstraint("id", name="audit_logs_pkey"),
+    )
+    op.execute(f"INSERT INTO audit_logs ({AUDIT_COLUMNS}) SELECT {AUDIT_COLUMNS} FROM audit_logs_partitioned")
+
+    # Dropping the parent drops all partitions and their indexes
+    op.drop_table("audit_logs_partitioned")
+
+    _enable_rls()
+    # ### end Alembic commands ###
@@ -0,0 +1,65 @@
+"""Add denormalized cover images and property_count to projects and properties
+
+Revision ID: c4d8e2f61a35
+Revises: a3e9c5d17f20
+Create Date: 2025-07-27 09:10:27.530184
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4d8e2f61a35"
+down_revision: Union[str, None] = "a3e9c5d17f20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('property_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('projects', sa.Column('cover_image_url', sa.Text(), nullable=True))
+    op.add_column('properties', sa.Column('cover_image_url', sa.Text(), nullable=True))
+    op.add_column('properties', sa.Column('cover_thumbnail_url', sa.Text(), nullable=True))
+    
+    # Backfill: first image by display_order, created_at, id (same order as CoverImageService)
+    op.execute("""
+        UPDATE projects p SET
+            cover_image_url = (
+                SELECT i.image_url FROM project_images i
+                WHERE i.project_id = p.id
+                ORDER BY i.display_order, i.created_at, i.id
+                LIMIT 1
+            ),
+            property_count = (
+                SELECT count(*) FROM properties pr
+                WHERE pr.project_id = p.id AND pr.tenant_id = p.tenant_id
+            )
+    """)
+    op.execute("""
+        UPDATE properties pr SET
+            cover_image_url = (
+                SELECT i.image_url FROM property_images i
+                WHERE i.property_id = pr.id
+                ORDER BY i.display_order, i.created_at, i.id
+                LIMIT 1
+            )
+    """)
+    op.execute("""
+        UPDATE properties pr SET
+            cover_thumbnail_url = coalesce(pr.cover_image_url, p.cover_image_url)
+        FROM projects p
+        WHERE p.id = pr.project_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('properties', 'cover_thumbnail_url')
+    op.drop_column('properties', 'cover_image_url')
+    op.drop_column('projects', 'cover_image_url')
+    op.drop_column('projects', 'property_count')
@@ -0,0 +1,49 @@
+"""Add micro_location_summary to projects
+
+Revision ID: e7b3a91c4f02
+Revises: c4d8e2f61a35
+Create Date: 2025-07-28 11:30:12.604417
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b3a91c4f02"
+down_revision: Union[str, None] = "c4d8e2f61a35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('micro_location_summary', sa.JSON(), nullable=True))
+    
+    # Backfill with the same shape as GoogleMapsService.summarize_micro_location
+    op.execute("""
+        UPDATE projects p SET micro_location_summary = json_build_object(
+            'location', p.micro_location_v2 -> 'location',
+            'street_view', p.micro_location_v2 -> 'street_view',
+            'categories', coalesce((
+                SELECT json_object_agg(c.key, json_build_object(
+                    'count', json_array_length(c.value),
+                    'nearest_walking_meters', (
+                        SELECT min((place -> 'distances' -> 'walking' ->> 'distance_meters')::float)
+                        FROM json_array_elements(c.value) place
+                    )
+                ))
+                FROM json_each(p.micro_location_v2 -> 'categories') c
+            ), '{}'::json)
+        )
+        WHERE p.micro_location_v2 IS NOT NULL
+          AND p.micro_location_v2::text NOT IN ('null', '{}')
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('projects', 'micro_location_summary')
@@ -5,7 +5,7 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc, func
-from app.dependencies import get_db, get_super_admin_user
+from app.dependencies import get_db, get_read_db, get_super_admin_user
 from app.schemas.base import SuccessResponse
 from app.schemas.auth import AuthStatsResponse, AuthAuditFilterParams
 from app.schemas.rbac import RBACStatsResponse, RBACComplianceReport
@@ -27,7 +27,7 @@ router = APIRouter()
 @router.get("/dashboard")
 async def get_admin_dashboard(
     super_admin: User = Depends(get_super_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Super Admin Dashboard Overview"""
     try:
@@ -964,49 +964,32 @@ async def toggle_feature(
 
 @router.get("/performance/metrics")
 async def get_performance_metrics(
-    hours: int = Query(default=24, ge=1, le=168),
-    super_admin: User = Depends(get_super_admin_user),
-    db: Session = Depends(get_db)
+    super_admin: User = Depends(get_super_admin_user)
 ):
-    """Get system performance metrics"""
+    """
+    Get system performance metrics
+    
+    Werte sind kumuliert seit Start der Worker (collected_since) und über alle Worker
+    aggregiert; dieselben Daten stehen im Prometheus-Format unter /metrics bereit.
+    """
     try:
-        start_time = datetime.utcnow() - timedelta(hours=hours)
-        
-        # API endpoint usage (would implement actual tracking)
-        api_metrics = {
-            "/api/v1/auth/login": {"calls": 1250, "avg_response_ms": 145, "error_rate": 0.02},
-            "/api/v1/users/": {"calls": 890, "avg_response_ms": 89, "error_rate": 0.01},
-            "/api/v1/projects/": {"calls": 450, "avg_response_ms": 234, "error_rate": 0.03},
-            "/api/v1/admin/dashboard": {"calls": 67, "avg_response_ms": 567, "error_rate": 0.0}
+        from app.core.metrics import performance_summary
+        from app.core.db_routing import replica_monitor
+        from app.utils.audit import audit_writer
+        from app.utils.pdf_optimizer import PDFOptimizer
+        
+        summary = performance_summary()
+        summary["collected_since"] = datetime.utcfromtimestamp(summary["collected_since"]).isoformat()
+        
+        # Komponenten dieses Workers
+        summary["components"] = {
+            "audit_writer": audit_writer.get_metrics(),
+            "pdf_optimizer": PDFOptimizer.get_metrics(),
+            "read_replica": replica_monitor.status()
         }
+        summary["generated_at"] = datetime.utcnow().isoformat()
         
-        # Database query performance
-        db_metrics = {
-            "avg_query_time_ms": 45,
-            "slow_queries_count": 12,
-            "connection_pool_usage": 65,
-            "deadlocks_count": 0
-        }
-        
-        # System resource usage trends
-        resource_trends = []
-        for i in range(hours):
-            hour_ago = start_time + timedelta(hours=i)
-            # Would implement actual metrics collection
-            resource_trends.append({
-                "timestamp": hour_ago.isoformat(),
-                "cpu_percent": 20 + (i % 10),
-                "memory_percent": 55 + (i % 15),
-                "active_sessions": 100 + (i * 5)
-            })
-        
-        return {
-            "period_hours": hours,
-            "api_endpoints": api_metrics,
-            "database": db_metrics,
-            "resource_trends": resource_trends,
-            "generated_at": datetime.utcnow().isoformat()
-        }
+        return summary
     
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to get performance metrics")
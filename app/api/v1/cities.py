@@ -22,6 +22,7 @@ from app.schemas.base import SuccessResponse
 from app.services.city_service import CityService
 from app.services.s3_service import get_s3_service
 from app.core.exceptions import AppException
+from app.core.database import released_connection
 from app.config import settings
 
 router = APIRouter()
@@ -178,12 +179,13 @@ async def upload_city_image(
             # Other images can be slightly smaller
             resize_options = {'width': 1600, 'quality': 85}
         
-        upload_result = await s3_service.upload_image(
-            file=image,
-            folder=f"cities/{city_id}",
-            tenant_id=str(city.tenant_id),
-            resize_options=resize_options
-        )
+        async with released_connection(db):
+            upload_result = await s3_service.upload_image(
+                file=image,
+                folder=f"cities/{city_id}",
+                tenant_id=str(city.tenant_id),
+                resize_options=resize_options
+            )
         
         # Create image record with S3 data
         image_data = CityImageCreate(
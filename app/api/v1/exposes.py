@@ -4,10 +4,11 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Path, Request, File, UploadFile, Form
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 
-from app.dependencies import get_db, get_current_active_user, get_current_tenant_id, require_permission
+from app.dependencies import get_db, get_async_db, get_current_active_user, get_current_tenant_id, require_permission
 from app.models.user import User
 from app.schemas.business import (
     ExposeTemplateCreate,
@@ -25,6 +26,7 @@ from app.schemas.base import SuccessResponse
 from app.services.expose_service import ExposeService
 from app.services.city_service import CityService
 from app.core.exceptions import AppException
+from app.core.database import released_connection
 from app.models.business import ExposeLink
 
 router = APIRouter()
@@ -169,12 +171,13 @@ async def upload_template_image(
             # Resize images to max 1920px wide
             resize_options = {'width': 1920, 'quality': 85}
         
-        upload_result = await s3_service.upload_image(
-            file=image,
-            folder=f"expose_templates/{template_id}/{image_type}",
-            tenant_id=str(tenant_id),
-            resize_options=resize_options
-        )
+        async with released_connection(db):
+            upload_result = await s3_service.upload_image(
+                file=image,
+                folder=f"expose_templates/{template_id}/{image_type}",
+                tenant_id=str(tenant_id),
+                resize_options=resize_options
+            )
         
         # Create database record
         from app.models.business import ExposeTemplateImage
@@ -428,12 +431,70 @@ async def get_expose_link_stats(
 
 # Public Expose Access (No authentication required)
 
+def _build_public_expose(
+    db: Session,
+    link_id: str,
+    password: Optional[str],
+    viewer_info: Optional[Dict[str, Any]]
+) -> ExposeLinkPublicResponse:
+    """Lädt Link, Template, City und Kontakt und baut die Response (läuft in db.run_sync)"""
+    # Get expose link and track view
+    link = ExposeService.get_expose_link(
+        db, link_id, password, track_view=True, viewer_info=viewer_info
+    )
+    db.commit()
+    
+    # Get tenant's template if link doesn't have one
+    template = link.template
+    if not template:
+        from app.models.business import ExposeTemplate
+        template = db.query(ExposeTemplate).filter(
+            ExposeTemplate.tenant_id == link.tenant_id
+        ).first()
+    
+    # Get city information if available
+    city_info = None
+    if link.property and link.property.city:
+        city_info = CityService.get_city_for_location(
+            db, link.tenant_id, link.property.city, link.property.state
+        )
+    
+    # Get tenant contact information
+    from app.models.tenant import Tenant
+    tenant = db.query(Tenant).filter(Tenant.id == link.tenant_id).first()
+    tenant_contact = None
+    if tenant:
+        tenant_contact = {
+            "email": tenant.contact_email,
+            "phone": tenant.contact_phone,
+            "street": tenant.contact_street,
+            "house_number": tenant.contact_house_number,
+            "city": tenant.contact_city,
+            "state": tenant.contact_state,
+            "zip_code": tenant.contact_zip_code,
+            "country": tenant.contact_country,
+            "company_name": tenant.name,
+            "logo_url": tenant.logo_url,
+            "primary_color": tenant.primary_color,
+            "secondary_color": tenant.secondary_color
+        }
+    
+    # Build response (validates all ORM attributes while the session is still usable)
+    return ExposeLinkPublicResponse(
+        link_id=link.link_id,
+        property=link.property,
+        template=template,  # Use the tenant's template
+        preset_data=link.preset_data or {},
+        city_info=city_info,
+        tenant_contact=tenant_contact
+    )
+
 @router.get("/public/{link_id}", response_model=ExposeLinkPublicResponse, response_model_exclude_none=True)
 async def get_public_expose(
     link_id: str = Path(..., description="Public expose link ID"),
     password: Optional[str] = Query(None, description="Password if required"),
     request: Request = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Access a public expose link"""
     try:
@@ -446,63 +507,8 @@ async def get_public_expose(
                 "referrer": request.headers.get("referer")
             }
         
-        # Get expose link and track view
-        link = ExposeService.get_expose_link(
-            db, link_id, password, track_view=True, viewer_info=viewer_info
-        )
-        db.commit()
-        
-        # Get tenant's template if link doesn't have one
-        template = link.template
-        if not template:
-            from app.models.business import ExposeTemplate
-            template = db.query(ExposeTemplate).filter(
-                ExposeTemplate.tenant_id == link.tenant_id
-            ).first()
-        
-        # Get city information if available
-        city_info = None
-        if link.property and link.property.city:
-            from app.models.user import User
-            # Create a temporary user context for city lookup
-            temp_user = User(tenant_id=link.tenant_id, is_super_admin=False)
-            city = CityService.get_city_by_name(
-                db, link.property.city, link.property.state, temp_user
-            )
-            if city:
-                city_info = city
-        
-        # Get tenant contact information
-        from app.models.tenant import Tenant
-        tenant = db.query(Tenant).filter(Tenant.id == link.tenant_id).first()
-        tenant_contact = None
-        if tenant:
-            tenant_contact = {
-                "email": tenant.contact_email,
-                "phone": tenant.contact_phone,
-                "street": tenant.contact_street,
-                "house_number": tenant.contact_house_number,
-                "city": tenant.contact_city,
-                "state": tenant.contact_state,
-                "zip_code": tenant.contact_zip_code,
-                "country": tenant.contact_country,
-                "company_name": tenant.name,
-                "logo_url": tenant.logo_url,
-                "primary_color": tenant.primary_color,
-                "secondary_color": tenant.secondary_color
-            }
-        
-        # Build response
-        response = ExposeLinkPublicResponse(
-            link_id=link.link_id,
-            property=link.property,
-            template=template,  # Use the tenant's template
-            preset_data=link.preset_data or {},
-            city_info=city_info,
-            tenant_contact=tenant_contact
-        )
-        
-        return response
+        # Läuft über asyncpg, blockiert den Event Loop nicht
+        return await db.run_sync(_build_public_expose, link_id, password, viewer_info)
     
     except AppException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
@@ -513,29 +519,31 @@ async def get_public_expose(
 async def calculate_fees_public(
     link_id: str = Path(..., description="Public expose link ID"),
     request: FeeCalculationRequest = ...,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Calculate fees for a public expose link"""
-    try:
+    # Import the fee calculation service
+    from app.services.fee_calculation_service import FeeCalculationService
+    
+    def calculate(session: Session):
         # Verify the link exists and is valid
-        link = ExposeService.get_expose_link(db, link_id)
+        link = ExposeService.get_expose_link(session, link_id)
         
         # Get the property from the link
         if not link.property:
             raise HTTPException(status_code=404, detail="Property not found")
         
-        # Import the fee calculation service
-        from app.services.fee_calculation_service import FeeCalculationService
-        
         # Calculate fees using the property's tenant context
-        result = FeeCalculationService.calculate_fees(
-            db=db,
+        return FeeCalculationService.calculate_fees(
+            db=session,
             tenant_id=link.tenant_id,
             request=request,
             property_id=link.property_id
         )
-        
-        return result
+    
+    try:
+        # Läuft über asyncpg, blockiert den Event Loop nicht
+        return await db.run_sync(calculate)
         
     except AppException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
@@ -8,9 +8,11 @@ from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.dependencies import (
     get_db, 
+    get_async_db,
     get_current_active_user, 
     get_current_tenant_id,
     require_permission
@@ -153,18 +155,21 @@ async def update_fee_configuration(
 async def calculate_fees(
     request: FeeCalculationRequest,
     property_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     tenant_id: UUID = Depends(get_current_tenant_id),
-    _: bool = Depends(require_permission("fees", "read"))
+    _: bool = Depends(require_permission("fees", "read")),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Calculate notary and Grundbuch fees based on configuration"""
     try:
-        result = FeeCalculationService.calculate_fees(
-            db=db,
-            tenant_id=tenant_id,
-            request=request,
-            property_id=property_id
+        # Läuft über asyncpg, blockiert den Event Loop nicht
+        result = await db.run_sync(
+            lambda session: FeeCalculationService.calculate_fees(
+                db=session,
+                tenant_id=tenant_id,
+                request=request,
+                property_id=property_id
+            )
         )
         
         return result
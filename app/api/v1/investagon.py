@@ -16,6 +16,7 @@ from app.models.business import InvestagonSync
 from app.schemas.business import InvestagonSyncSchema
 from app.services.investagon_service import InvestagonSyncService
 from app.core.exceptions import AppException
+from app.core.database import released_connection
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -380,17 +381,19 @@ async def test_investagon_connection(
                 "error": "Missing Investagon credentials"
             }
         
-        # Try to fetch projects to test connection
-        projects = await api_client.get_projects()
-        
-        # Count total properties across all projects
-        total_properties = 0
-        if projects:
-            # Get details for first project to verify property fetching works
-            first_project = projects[0]
-            project_details = await api_client.get_project_by_id(first_project.get("id"))
-            property_urls = project_details.get("properties", [])
-            total_properties = len(property_urls)
+        # Only remote calls from here on: give the DB connection back while waiting
+        async with released_connection(db):
+            # Try to fetch projects to test connection
+            projects = await api_client.get_projects()
+            
+            # Count total properties across all projects
+            total_properties = 0
+            if projects:
+                # Get details for first project to verify property fetching works
+                first_project = projects[0]
+                project_details = await api_client.get_project_by_id(first_project.get("id"))
+                property_urls = project_details.get("properties", [])
+                total_properties = len(property_urls)
         
         return {
             "connected": True,
@@ -6,8 +6,9 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Form
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db, get_current_active_user, get_current_tenant_id, require_permission
+from app.dependencies import get_db, get_read_db, get_async_read_db, get_current_active_user, get_current_tenant_id, require_permission
 from app.schemas.business import (
     ProjectCreate, ProjectUpdate, ProjectResponse, ProjectListResponse,
     ProjectFilter, ProjectImageCreate, ProjectImageUpdate, ProjectImageSchema,
@@ -16,6 +17,8 @@ from app.schemas.business import (
 from app.models.user import User
 from app.services.project_service import ProjectService
 from app.core.exceptions import AppException
+from app.core.database import released_connection
+from app.core.responses import ModelResponse
 from app.services.s3_service import get_s3_service
 from app.mappers.project_mapper import map_project_to_response
 from app.mappers.property_mapper import map_property_to_overview
@@ -50,17 +53,20 @@ async def create_project(
 @router.get("", response_model=ProjectListResponse, response_model_exclude_none=True)
 async def list_projects(
     filters: ProjectFilter = Depends(),
-    db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
     tenant_id: UUID = Depends(get_current_tenant_id),
-    _: bool = Depends(require_permission("projects", "read"))
+    _: bool = Depends(require_permission("projects", "read")),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List all projects with filtering and pagination"""
-    return ProjectService.list_projects(
-        db=db,
-        tenant_id=tenant_id,
-        filters=filters,
-        current_user=current_user
+    # Läuft über asyncpg, blockiert den Event Loop nicht
+    return await db.run_sync(
+        lambda session: ProjectService.list_projects(
+            db=session,
+            tenant_id=tenant_id,
+            filters=filters,
+            current_user=current_user
+        )
     )
 
 # ================================
@@ -69,7 +75,7 @@ async def list_projects(
 
 @router.get("/aggregate-stats", response_model=ProjectAggregateStats)
 async def get_project_aggregate_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user),
     tenant_id: UUID = Depends(get_current_tenant_id)
 ):
@@ -97,7 +103,7 @@ async def get_project(
         from app.schemas.business import PropertyOverview
         from app.mappers.property_mapper import map_property_to_overview
         
-        project = ProjectService.get_project(db, project_id, tenant_id)
+        project = ProjectService.get_project(db, project_id, tenant_id, with_micro_location=True)
         
         # Convert properties to PropertyOverview using mapper
         property_overviews = []
@@ -124,7 +130,8 @@ async def get_project(
         # Add property overviews
         response_data['properties'] = property_overviews
         
-        return ProjectResponse(**response_data)
+        # Bereits validiert; ModelResponse spart das erneute Validieren und Encodieren
+        return ModelResponse(ProjectResponse(**response_data))
     except AppException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
@@ -262,12 +269,13 @@ async def upload_project_image(
                 detail="Image storage service is not available"
             )
             
-        upload_result = await s3_service.upload_image(
-            file=file,
-            folder="projects",
-            tenant_id=str(tenant_id),
-            resize_options={'width': 1920, 'quality': 85}
-        )
+        async with released_connection(db):
+            upload_result = await s3_service.upload_image(
+                file=file,
+                folder="projects",
+                tenant_id=str(tenant_id),
+                resize_options={'width': 1920, 'quality': 85}
+            )
         
         # Create database record
         image_data = ProjectImageCreate(
@@ -346,6 +354,20 @@ async def delete_project_image(
 # Micro Location Management
 # ================================
 
+@router.get("/{project_id}/micro-location", response_model=Optional[Dict[str, Any]])
+async def get_micro_location(
+    project_id: UUID,
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    _: bool = Depends(require_permission("projects", "read"))
+):
+    """Get the full micro location data of a project (places and distances per category)"""
+    try:
+        return ProjectService.get_micro_location(db, project_id, tenant_id)
+    except AppException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
 @router.post("/{project_id}/refresh-micro-location", response_model=ProjectResponse, response_model_exclude_none=True)
 async def refresh_micro_location(
     project_id: UUID,
@@ -376,7 +398,7 @@ async def refresh_micro_location(
         from app.schemas.business import PropertyOverview
         from app.mappers.property_mapper import map_property_to_overview
         
-        project = ProjectService.get_project(db, project_id, tenant_id)
+        project = ProjectService.get_project(db, project_id, tenant_id, with_micro_location=True)
         
         # Convert properties to PropertyOverview using mapper
         property_overviews = []
@@ -4,11 +4,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Path, UploadFile, File, Form, Body
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 import json
 
-from app.dependencies import get_db, get_current_user, require_permission, get_current_tenant_id
+from app.dependencies import get_db, get_read_db, get_async_read_db, get_current_user, require_permission, get_current_tenant_id
 from app.models.user import User
 from app.schemas.business import (
     PropertyCreate,
@@ -25,9 +26,13 @@ from app.schemas.business import (
 from app.schemas.base import SuccessResponse
 from app.services.property_service import PropertyService
 from app.services.s3_service import get_s3_service
+from app.services.media_service import MediaRegistry
 from app.core.exceptions import AppException
+from app.core.database import released_connection
+from app.core.responses import ModelResponse
 from app.config import settings
 from app.mappers.property_mapper import map_property_to_response
+from app.mappers.document_mapper import map_property_documents
 
 router = APIRouter()
 
@@ -37,16 +42,17 @@ async def list_properties(
     active: Optional[List[int]] = Query(None),
     current_user: User = Depends(get_current_user),
     tenant_id: Optional[UUID] = Depends(get_current_tenant_id),
-    db: Session = Depends(get_db),
-    _: bool = Depends(require_permission("properties", "read"))
+    _: bool = Depends(require_permission("properties", "read")),
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """List all properties with filtering (overview only)"""
     try:
         # Override the active filter with the list from query params
         if active is not None:
             filter_params.active = active
-        result = PropertyService.list_properties(db, current_user, filter_params, tenant_id)
-        db.commit()
+        # Läuft über asyncpg, blockiert den Event Loop nicht
+        result = await db.run_sync(PropertyService.list_properties, current_user, filter_params, tenant_id)
+        await db.commit()
         
         return PropertyListResponse(
             items=result["items"],  # Already PropertyOverview objects
@@ -57,15 +63,15 @@ async def list_properties(
         )
     
     except AppException as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/aggregate-stats", response_model=PropertyAggregateStats)
 async def get_property_aggregate_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
     tenant_id: UUID = Depends(get_current_tenant_id)
 ):
@@ -105,19 +111,28 @@ async def create_property(
 @router.get("/{property_id}", response_model=PropertyResponse, response_model_exclude_none=True)
 async def get_property(
     property_id: UUID = Path(..., description="Property ID"),
+    include: Optional[str] = Query(None, description="Comma-separated parts to include: project, city, documents (default: all)"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
     _: bool = Depends(require_permission("properties", "read"))
 ):
     """Get property details"""
     try:
-        property = PropertyService.get_property(db, property_id, current_user)
+        include = PropertyService.parse_detail_include(include)
+        property = PropertyService.get_property(
+            db, property_id, current_user, with_micro_location=True, include=include
+        )
         
         # Use mapper to get response data with calculated fields
-        response_data = map_property_to_response(property)
+        response_data = map_property_to_response(
+            property, include_project="project" in include, include_city="city" in include
+        )
+        
+        if "documents" in include:
+            response_data['documents'] = map_property_documents(property)
         
         # Convert related objects to dicts for proper serialization
-        if property.project:
+        if "project" in include and property.project:
             project_dict = property.project.__dict__.copy()
             project_dict.pop('_sa_instance_state', None)
             
@@ -187,7 +202,7 @@ async def get_property(
                 project_dict['images'] = project_images
             
             # Add city_ref to project if it exists
-            if hasattr(property.project, 'city_ref') and property.project.city_ref:
+            if "city" in include and property.project.city_ref:
                 city_dict = property.project.city_ref.__dict__.copy()
                 city_dict.pop('_sa_instance_state', None)
                 project_dict['city_ref'] = city_dict
@@ -208,7 +223,7 @@ async def get_property(
                 
         
         # The PropertyResponse validator will handle combining all_images
-        return PropertyResponse.model_validate(response_data)
+        return ModelResponse(PropertyResponse.model_validate(response_data))
     
     except AppException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
@@ -321,12 +336,13 @@ async def upload_property_image(
             # Keep floor plans larger
             resize_options = {'width': 2400, 'quality': 90}
         
-        upload_result = await s3_service.upload_image(
-            file=image,
-            folder=f"properties/{property_id}",
-            tenant_id=str(property.tenant_id),
-            resize_options=resize_options
-        )
+        async with released_connection(db):
+            upload_result = await s3_service.upload_image(
+                file=image,
+                folder=f"properties/{property_id}",
+                tenant_id=str(property.tenant_id),
+                resize_options=resize_options
+            )
         
         # Create image record with S3 data
         image_data = PropertyImageCreate(
@@ -424,7 +440,11 @@ async def delete_property_image(
         if image and image.image_url:
             # Extract S3 key from URL if it's an S3 URL
             s3_service = get_s3_service()
-            if s3_service.is_configured() and settings.S3_ENDPOINT_URL in image.image_url:
+            if (
+                s3_service.is_configured()
+                and settings.S3_ENDPOINT_URL in image.image_url
+                and MediaRegistry.release(db, image)
+            ):
                 # Extract key from URL
                 url_parts = image.image_url.split('/')
                 # Skip protocol, domain, and reconstruct key
@@ -450,7 +470,7 @@ async def delete_property_image(
 @router.get("/stats/overview", response_model=dict, response_model_exclude_none=True)
 async def get_property_statistics(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: bool = Depends(require_permission("properties", "read"))
 ):
     """Get property statistics for the tenant"""
@@ -473,6 +493,7 @@ from app.schemas.business import (
     PropertyAssignmentUpdate,
     PropertyAssignmentResponse,
     PropertyAssignmentBulkCreate,
+    PropertyAssignmentBulkDelete,
     PropertyAssignmentListResponse
 )
 from app.services.property_assignment_service import PropertyAssignmentService
@@ -537,6 +558,32 @@ async def bulk_assign_properties(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/assignments/bulk-delete", response_model=Dict[str, Any])
+async def bulk_unassign_properties(
+    bulk_data: PropertyAssignmentBulkDelete,
+    current_user: User = Depends(get_current_user),
+    tenant_id: UUID = Depends(get_current_tenant_id),
+    db: Session = Depends(get_db),
+    _: bool = Depends(require_permission("properties", "update"))
+):
+    """Bulk remove assignments between multiple properties and multiple users"""
+    try:
+        result = PropertyAssignmentService.bulk_unassign_properties(
+            db=db,
+            bulk_data=bulk_data,
+            current_user_id=current_user.id,
+            tenant_id=tenant_id
+        )
+        db.commit()
+        return result
+        
+    except AppException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{property_id}/assignments", response_model=List[PropertyAssignmentResponse])
 async def get_property_assignments(
     property_id: UUID = Path(..., description="Property ID"),
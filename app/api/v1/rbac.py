@@ -4,7 +4,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request
 from sqlalchemy.orm import Session
-from app.dependencies import get_db, get_current_user, require_permission, get_super_admin_user, get_current_tenant_id
+from app.dependencies import get_db, get_read_db, get_current_user, require_permission, get_super_admin_user, get_current_tenant_id
 from app.schemas.rbac import (
     RoleCreate, RoleUpdate, RoleResponse, RoleDetailResponse,
     RoleListResponse, PermissionResponse, PermissionCreate,
@@ -639,7 +639,7 @@ async def check_user_permission(
 @router.get("/stats", response_model=RBACStatsResponse, response_model_exclude_none=True)
 async def get_rbac_statistics(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: bool = Depends(require_permission("roles", "read"))
 ):
     """Get RBAC statistics - Uses RBACService"""
@@ -656,7 +656,7 @@ async def get_rbac_statistics(
 async def get_role_usage_report(
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     days: int = Query(default=30, ge=1, le=365, description="Report period in days"),
     tenant_id: Optional[uuid.UUID] = Depends(get_current_tenant_id),
     _: bool = Depends(require_permission("roles", "read"))
@@ -689,7 +689,7 @@ async def get_role_usage_report(
 @router.get("/reports/permission-usage")
 async def get_permission_usage_report(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: bool = Depends(require_permission("permissions", "read"))
 ):
     """Get permission usage report - Uses RBACService"""
@@ -709,7 +709,7 @@ async def get_permission_usage_report(
 async def get_rbac_compliance_report(
     request: Request,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     tenant_id: Optional[uuid.UUID] = Depends(get_current_tenant_id),
     _: bool = Depends(require_permission("roles", "read"))
 ):
@@ -741,7 +741,7 @@ async def get_rbac_compliance_report(
 @router.get("/global/stats")
 async def get_global_rbac_statistics(
     super_admin: User = Depends(get_super_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get global RBAC statistics (Super Admin only) - Uses RBACService"""
     try:
@@ -758,7 +758,7 @@ async def get_global_rbac_statistics(
 @router.get("/global/reports/permission-usage")
 async def get_global_permission_usage_report(
     super_admin: User = Depends(get_super_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get global permission usage report (Super Admin only) - Uses RBACService"""
     try:
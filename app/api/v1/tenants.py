@@ -2,9 +2,10 @@
 # TENANT MANAGEMENT API ROUTES (api/v1/tenants.py) - UPDATED
 # ================================
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, File, UploadFile, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from app.dependencies import get_db, get_super_admin_user, get_current_user, get_current_active_user, get_current_tenant_id, require_permission
+from app.dependencies import get_db, get_read_db, get_super_admin_user, get_current_user, get_current_active_user, get_current_tenant_id, require_permission
 from app.schemas.tenant import (
     TenantCreate, TenantUpdate, TenantAdminUpdate, TenantResponse, 
     TenantListResponse, TenantFilterParams, TenantStatsResponse,
@@ -16,6 +17,7 @@ from app.schemas.base import SuccessResponse
 from app.models.tenant import Tenant, TenantIdentityProvider
 from app.models.user import User
 from app.services.tenant_service import TenantService
+from app.services.tenant_export_service import TenantExportService, NDJSON_MEDIA_TYPE, GZIP_MEDIA_TYPE
 from app.core.exceptions import AppException
 from typing import List, Optional
 import uuid
@@ -616,7 +618,7 @@ async def delete_identity_provider(
 @router.get("/stats", response_model=TenantStatsResponse, response_model_exclude_none=True)
 async def get_tenant_statistics(
     super_admin: User = Depends(get_super_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get overall tenant statistics"""
     try:
@@ -630,7 +632,7 @@ async def get_tenant_statistics(
 async def get_tenant_details_stats(
     tenant_id: uuid.UUID = Path(..., description="Tenant ID"),
     super_admin: User = Depends(get_super_admin_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """Get detailed statistics for a specific tenant"""
     try:
@@ -697,15 +699,25 @@ async def export_tenant_data(
     include_users: bool = Query(default=True, description="Include user data"),
     include_projects: bool = Query(default=True, description="Include project data"),
     include_audit_logs: bool = Query(default=False, description="Include audit logs"),
+    compress: bool = Query(default=False, description="gzip-compressed NDJSON"),
+    resume_from: Optional[str] = Query(default=None, description="Restart the export at this section"),
     super_admin: User = Depends(get_super_admin_user),
     db: Session = Depends(get_db)
 ):
-    """Export tenant data for backup/migration"""
+    """
+    Stream tenant data for backup/migration as NDJSON (one JSON object per line).
+    
+    The body is streamed after the response starts, so large tenants are not cut off
+    by the request timeout; progress and errors arrive as event lines.
+    """
     try:
-        export_data = TenantService.export_tenant_data(
-            db, tenant_id, include_users, include_projects, include_audit_logs
+        sections = TenantExportService.resolve_sections(
+            include_users, include_projects, include_audit_logs, resume_from
         )
         
+        if not db.query(Tenant.id).filter(Tenant.id == tenant_id).first():
+            raise AppException("Tenant not found", 404, "TENANT_NOT_FOUND")
+        
         # Audit the export
         from app.utils.audit import AuditLogger
         audit_logger = AuditLogger()
@@ -715,17 +727,86 @@ async def export_tenant_data(
                 "include_users": include_users,
                 "include_projects": include_projects,
                 "include_audit_logs": include_audit_logs,
-                "export_size_kb": len(str(export_data)) // 1024
+                "sections": sections,
+                "compressed": compress
             }
         )
         
         db.commit()
-        return export_data
     
     except AppException as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
     except Exception as e:
         raise HTTPException(status_code=500, detail="Failed to export tenant data")
+    
+    filename = f"tenant-{tenant_id}-export.ndjson" + (".gz" if compress else "")
+    return StreamingResponse(
+        TenantExportService.stream_export(tenant_id, sections, compress, super_admin.id),
+        media_type=GZIP_MEDIA_TYPE if compress else NDJSON_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/{tenant_id}/export/jobs", status_code=202)
+async def start_tenant_export_job(
+    background_tasks: BackgroundTasks,
+    tenant_id: uuid.UUID = Path(..., description="Tenant ID"),
+    include_users: bool = Query(default=True, description="Include user data"),
+    include_projects: bool = Query(default=True, description="Include project data"),
+    include_audit_logs: bool = Query(default=False, description="Include audit logs"),
+    resume_job_id: Optional[uuid.UUID] = Query(default=None, description="Resume an earlier job, skipping its finished sections"),
+    super_admin: User = Depends(get_super_admin_user),
+    db: Session = Depends(get_db)
+):
+    """Export tenant data to S3 in the background (one gzip NDJSON file per section)"""
+    try:
+        from app.services.s3_service import get_s3_service
+        if not get_s3_service().is_configured():
+            raise AppException("File storage service is not available", 503, "STORAGE_UNAVAILABLE")
+        
+        if not db.query(Tenant.id).filter(Tenant.id == tenant_id).first():
+            raise AppException("Tenant not found", 404, "TENANT_NOT_FOUND")
+        
+        sections = TenantExportService.resolve_sections(include_users, include_projects, include_audit_logs)
+        job = TenantExportService.create_job(tenant_id, sections, super_admin.id, resume_job_id)
+        
+        from app.utils.audit import AuditLogger
+        audit_logger = AuditLogger()
+        audit_logger.log_auth_event(
+            db, "TENANT_DATA_EXPORTED", super_admin.id, tenant_id,
+            {
+                "include_users": include_users,
+                "include_projects": include_projects,
+                "include_audit_logs": include_audit_logs,
+                "sections": sections,
+                "job_id": job["job_id"]
+            }
+        )
+        db.commit()
+        
+        # Sync function -> runs in the threadpool after the response
+        background_tasks.add_task(TenantExportService.run_job, job["job_id"])
+        return TenantExportService.get_job(tenant_id, job["job_id"])
+    
+    except AppException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to start tenant export")
+
+@router.get("/{tenant_id}/export/jobs/{job_id}")
+async def get_tenant_export_job(
+    tenant_id: uuid.UUID = Path(..., description="Tenant ID"),
+    job_id: uuid.UUID = Path(..., description="Export job ID"),
+    super_admin: User = Depends(get_super_admin_user)
+):
+    """Progress of a tenant export job and download URLs of its finished sections"""
+    try:
+        return TenantExportService.get_job(tenant_id, job_id)
+    
+    except AppException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to get export job")
 
 @router.get("/{tenant_id}/usage-report")
 async def get_tenant_usage_report(
@@ -2,12 +2,13 @@
 # USER MANAGEMENT API ROUTES (api/v1/users.py) - UPDATED TO USE SERVICES
 # ================================
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Body, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_, desc
 from app.config import settings
 from app.dependencies import (
-    get_db, get_current_user, require_permission, 
+    get_db, get_read_db, get_current_user, require_permission, 
     get_pagination_params, get_sort_params,
     require_same_tenant_or_super_admin, get_current_tenant_id
 )
@@ -23,6 +24,7 @@ from app.schemas.user import (
 )
 from app.schemas.base import SuccessResponse
 from app.services.user_service import UserService
+from app.services.user_export_service import UserExportService
 from app.services.rbac_service import RBACService
 from app.models.user import User, UserSession
 from app.core.exceptions import AppException
@@ -234,6 +236,76 @@ async def list_users(
         print(traceback.format_exc())
         raise HTTPException(status_code=500, detail="Failed to retrieve users")
 
+# ================================
+# USER EXPORT & REPORTS
+# ================================
+
+# Vor den /{user_id}-Routen registriert, sonst wird "export" als user_id gematcht
+
+@router.get("/export")
+async def export_users(
+    format: str = Query(default="csv", description="Export format: csv, xlsx, json"),
+    compress: bool = Query(default=False, description="gzip-compress the file (csv, json)"),
+    current_user: User = Depends(get_current_user),
+    _: bool = Depends(require_permission("users", "read"))
+):
+    """Export user list - streamed from a server-side cursor, constant memory"""
+    try:
+        tenant_id = current_user.tenant_id if not current_user.is_super_admin else None
+        UserExportService.check_format(format)
+    
+    except AppException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    
+    filename = UserExportService.filename(format, compress)
+    return StreamingResponse(
+        UserExportService.stream_export(tenant_id, format, compress, current_user.id),
+        media_type=UserExportService.media_type(format, compress),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.post("/export/jobs", status_code=202)
+async def start_user_export_job(
+    background_tasks: BackgroundTasks,
+    format: str = Query(default="csv", description="Export format: csv, xlsx, json"),
+    compress: bool = Query(default=True, description="gzip-compress the file (csv, json)"),
+    current_user: User = Depends(get_current_user),
+    _: bool = Depends(require_permission("users", "read"))
+):
+    """Export user list to S3 in the background; poll the job for the download link"""
+    try:
+        from app.services.s3_service import get_s3_service
+        if not get_s3_service().is_configured():
+            raise AppException("File storage service is not available", 503, "STORAGE_UNAVAILABLE")
+        
+        tenant_id = current_user.tenant_id if not current_user.is_super_admin else None
+        UserExportService.check_format(format)
+        job = UserExportService.create_job(tenant_id, format, compress, current_user.id)
+        
+        # Sync function -> runs in the threadpool after the response
+        background_tasks.add_task(UserExportService.run_job, job["job_id"])
+        return UserExportService.get_job(job["job_id"], current_user)
+    
+    except AppException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to start user export")
+
+@router.get("/export/jobs/{job_id}")
+async def get_user_export_job(
+    job_id: uuid.UUID = Path(..., description="Export job ID"),
+    current_user: User = Depends(get_current_user),
+    _: bool = Depends(require_permission("users", "read"))
+):
+    """Status of a user export job; completed jobs include a presigned download link"""
+    try:
+        return UserExportService.get_job(job_id, current_user)
+    
+    except AppException as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="Failed to get export job")
+
 @router.get("/{user_id}", response_model=UserProfileResponse, response_model_exclude_none=True)
 async def get_user_by_id(
     user_id: uuid.UUID = Path(..., description="User ID"),
@@ -603,7 +675,7 @@ async def bulk_user_action(
 @router.get("/stats", response_model=UserStatsResponse, response_model_exclude_none=True)
 async def get_user_stats(
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     _: bool = Depends(require_permission("users", "read"))
 ):
     """User statistics for current tenant - Uses UserService"""
@@ -679,34 +751,6 @@ async def change_current_user_password(
         db.rollback()
         raise HTTPException(status_code=500, detail="Password change failed")
 
-# ================================
-# USER EXPORT & REPORTS
-# ================================
-
-@router.get("/export")
-async def export_users(
-    format: str = Query(default="csv", description="Export format: csv, xlsx, json"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-    _: bool = Depends(require_permission("users", "read"))
-):
-    """Export user list - Uses UserService"""
-    try:
-        tenant_id = current_user.tenant_id if not current_user.is_super_admin else None
-        result = UserService.export_users(db, tenant_id, format)
-        
-        if format == "json":
-            from fastapi.responses import JSONResponse
-            return JSONResponse(content=result)
-        else:
-            return SuccessResponse(
-                message=result["message"],
-                data={"download_url": result["download_url"], "total_users": result["total_users"]}
-            )
-    
-    except Exception as e:
-        raise HTTPException(status_code=500, detail="Export failed")
-
 # ================================
 # USER ROLE MANAGEMENT
 # ================================
@@ -0,0 +1,86 @@
+# ================================
+# CACHE INVALIDATION (core/cache_invalidation.py)
+# ================================
+
+from typing import Callable, Iterable, Optional, Any
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter, BooleanClauseList
+
+from app.utils import SimpleCache
+
+ALL_TENANTS = None  # Bulk-Statement ohne bekannten Tenant
+
+
+def _and_criteria(clause):
+    if isinstance(clause, BooleanClauseList) and clause.operator is operators.and_:
+        for criterion in clause.clauses:
+            yield from _and_criteria(criterion)
+    else:
+        yield clause
+
+
+def statement_tenant_id(statement, table) -> Optional[Any]:
+    """Tenant an ORM bulk statement on table is limited to, or ALL_TENANTS"""
+    # Nur "tenant_id == :wert" auf oberster AND-Ebene grenzt ein; alles andere gilt als global
+    whereclause = getattr(statement, "whereclause", None)
+    if whereclause is None:
+        return ALL_TENANTS
+    for criterion in _and_criteria(whereclause):
+        if not (isinstance(criterion, BinaryExpression) and criterion.operator is operators.eq):
+            continue
+        for column, value in ((criterion.left, criterion.right), (criterion.right, criterion.left)):
+            if (
+                getattr(column, "table", None) is table and column.key == "tenant_id"
+                and isinstance(value, BindParameter) and value.effective_value is not None
+            ):
+                return value.effective_value
+    return ALL_TENANTS
+
+
+class CommitScopedInvalidator:
+    """
+    Drops a tenant's cache entries once the transaction that changed its data commits.
+    
+    Tenant IDs are collected in session.info of the outermost transaction; after_commit
+    deletes the keys key_fn(tenant_id) returns (ALL_TENANTS clears the whole cache). A
+    rollback discards them, the cached values still match the database then.
+    """
+    
+    def __init__(self, cache: SimpleCache, key_fn: Callable[[Any], Iterable[str]]):
+        self.cache = cache
+        self.key_fn = key_fn
+        event.listen(Session, "after_commit", self._apply)
+        event.listen(Session, "after_transaction_end", self._discard)
+    
+    def invalidate(self, session: Session, *tenant_ids) -> None:
+        """Mark tenants whose entries go stale when the current transaction commits"""
+        session.info.setdefault(self, set()).update(tenant_ids)
+    
+    def track_bulk_statements(self, *models) -> None:
+        """Also mark tenants of ORM insert()/update()/delete() on models, which bypass the flush"""
+        def collect(orm_execute_state):
+            if orm_execute_state.is_select:
+                return
+            mapper = orm_execute_state.bind_mapper
+            if mapper is not None and mapper.class_ in models:
+                tenant_id = statement_tenant_id(orm_execute_state.statement, mapper.local_table)
+                self.invalidate(orm_execute_state.session, tenant_id)
+        
+        event.listen(Session, "do_orm_execute", collect)
+    
+    def _apply(self, session):
+        tenant_ids = session.info.pop(self, None)
+        if not tenant_ids:
+            return
+        if ALL_TENANTS in tenant_ids:
+            self.cache.clear()
+            return
+        for tenant_id in tenant_ids:
+            for key in self.key_fn(tenant_id):
+                self.cache.delete(key)
+    
+    def _discard(self, session, transaction):
+        if transaction.parent is None:
+            session.info.pop(self, None)
@@ -3,17 +3,26 @@
 # ================================
 
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
-from contextlib import contextmanager
+from contextlib import contextmanager, asynccontextmanager
+import logging
+import time
 import uuid
 
 from app.config import settings
+from app.core.metrics import metrics, InstrumentedQueuePool, InstrumentedAsyncQueuePool, instrument_engine
+from app.core import sql_profiler
+from app.core.db_routing import RoutingSession, replica_monitor
+
+logger = logging.getLogger(__name__)
 
 # Database Engine
 engine = create_engine(
     settings.DATABASE_URL,
+    poolclass=InstrumentedQueuePool,  # Misst Wartezeit beim Connection-Checkout
     pool_size=settings.DATABASE_POOL_SIZE,
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_pre_ping=True,  # Verify connections before use
@@ -23,16 +32,229 @@ engine = create_engine(
     }
 )
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+instrument_engine(engine)
+sql_profiler.instrument_engine(engine)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=RoutingSession)
+
+def _async_database_url(url: str) -> str:
+    """postgresql:// bzw. postgresql+psycopg2:// -> postgresql+asyncpg://"""
+    scheme, _, rest = url.partition("://")
+    url = f"postgresql+asyncpg://{rest}" if scheme.startswith("postgres") else url
+    if settings.DATABASE_TRANSACTION_POOLER:
+        # Prepared Statements überleben keinen Connection-Wechsel des Poolers
+        url += ("&" if "?" in url else "?") + "prepared_statement_cache_size=0"
+    return url
+
+def _async_connect_args() -> dict:
+    connect_args = {
+        "timeout": 30,  # Connection timeout
+        "server_settings": {"statement_timeout": "30000"}  # Query timeout in milliseconds
+    }
+    if settings.DATABASE_TRANSACTION_POOLER:
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    return connect_args
+
+# Async Engine (asyncpg) für I/O-lastige Endpoints, eigener Pool neben dem sync Engine
+async_engine = create_async_engine(
+    _async_database_url(settings.DATABASE_URL),
+    poolclass=InstrumentedAsyncQueuePool,
+    pool_size=settings.ASYNC_DATABASE_POOL_SIZE,
+    max_overflow=settings.ASYNC_DATABASE_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    connect_args=_async_connect_args()
+)
+instrument_engine(async_engine.sync_engine)
+sql_profiler.instrument_engine(async_engine.sync_engine)
+
+class AsyncRoutingSession(RoutingSession):
+    """Sync-Session hinter AsyncSession; eigener Replica-Bind (asyncpg)"""
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    sync_session_class=AsyncRoutingSession
+)
+
+# Read Replica (optional): read-only Sessions lesen von hier, solange der Lag im Limit ist
+replica_engine = None
+async_replica_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(
+        settings.DATABASE_REPLICA_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DATABASE_REPLICA_POOL_SIZE,
+        max_overflow=settings.DATABASE_REPLICA_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        connect_args={
+            "connect_timeout": 30,
+            "options": "-c statement_timeout=30000"
+        }
+    )
+    async_replica_engine = create_async_engine(
+        _async_database_url(settings.DATABASE_REPLICA_URL),
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=settings.DATABASE_REPLICA_POOL_SIZE,
+        max_overflow=settings.DATABASE_REPLICA_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        connect_args=_async_connect_args()
+    )
+    for replica in (replica_engine, async_replica_engine.sync_engine):
+        instrument_engine(replica)
+        sql_profiler.instrument_engine(replica)
+    
+    RoutingSession.replica_bind = replica_engine
+    AsyncRoutingSession.replica_bind = async_replica_engine.sync_engine
+    replica_monitor.engine = replica_engine
+
 Base = declarative_base()
 
 # Tenant Context für Row-Level Security
-def set_tenant_context(db: Session, tenant_id: uuid.UUID = None):
-    """Setzt den Tenant-Kontext für RLS"""
-    if tenant_id:
-        db.execute(text(f"SET app.current_tenant_id = '{tenant_id}'"))
+#
+# Der Tenant steht in session.info und gilt per set_config(..., true) (= SET LOCAL) nur für die
+# laufende Transaktion: nichts leakt in den nächsten Checkout einer Pool-Connection, und es
+# funktioniert hinter einem Pooler im Transaction-Mode (PgBouncer). Jede Transaktion der Session
+# bekommt den Wert beim Begin; mit psycopg2 wird er dem ersten Statement vorangestellt (kein
+# eigener Roundtrip).
+
+TENANT_CONTEXT_SQL = "SELECT set_config('app.current_tenant_id', %s, true)"
+_PENDING_TENANT_KEY = "pending_tenant_context"
+
+def _tenant_value(tenant_id) -> str:
+    # uuid.UUID() validiert: der Wert landet als Literal im vorangestellten Statement
+    return str(uuid.UUID(str(tenant_id))) if tenant_id else ""
+
+def _apply_tenant_context(connection, tenant_id) -> None:
+    value = _tenant_value(tenant_id)
+    if connection.dialect.driver == "psycopg2":
+        connection.info[_PENDING_TENANT_KEY] = value
     else:
-        db.execute(text("SET app.current_tenant_id = ''"))
+        connection.execute(
+            text("SELECT set_config('app.current_tenant_id', :tenant_id, true)"),
+            {"tenant_id": value}
+        )
+
+@event.listens_for(RoutingSession, "after_begin")
+def _tenant_context_on_begin(session, transaction, connection):
+    if "tenant_id" in session.info:
+        _apply_tenant_context(connection, session.info["tenant_id"])
+
+def _instrument_tenant_context(sync_engine) -> None:
+    """Stellt den vorgemerkten Tenant-Kontext dem ersten Statement der Transaktion voran"""
+    
+    @event.listens_for(sync_engine, "before_cursor_execute", retval=True)
+    def _prepend_tenant_context(conn, cursor, statement, parameters, context, executemany):
+        value = conn.info.pop(_PENDING_TENANT_KEY, None)
+        if value is None:
+            return statement, parameters
+        if executemany or getattr(cursor, "name", None):
+            # executemany / Server-Side Cursor (DECLARE ...) vertragen kein zweites Statement;
+            # ein Named Cursor erlaubt auch nur ein execute() -> eigener Cursor, gleiche Transaktion
+            context_cursor = cursor.connection.cursor()
+            try:
+                context_cursor.execute(TENANT_CONTEXT_SQL, (value,))
+            finally:
+                context_cursor.close()
+            return statement, parameters
+        # psycopg2 liefert das Ergebnis des letzten Statements
+        return f"SELECT set_config('app.current_tenant_id', '{value}', true); {statement}", parameters
+    
+    @event.listens_for(sync_engine, "checkin")
+    def _discard_pending_tenant_context(dbapi_connection, connection_record):
+        # Transaktion ohne Statement beendet -> Vormerkung darf nicht in den nächsten Checkout
+        connection_record.info.pop(_PENDING_TENANT_KEY, None)
+
+_instrument_tenant_context(engine)
+if replica_engine is not None:
+    _instrument_tenant_context(replica_engine)
+
+def set_tenant_context(db: Session, tenant_id: uuid.UUID = None):
+    """Setzt den Tenant-Kontext für RLS (None = kein Tenant) für alle folgenden Transaktionen der Session"""
+    _tenant_value(tenant_id)  # ValueError bei ungültiger ID, bevor sie in der Session landet
+    db.info["tenant_id"] = tenant_id
+    if db.in_transaction():
+        # Laufende Transaktion (z.B. nach dem User-Lookup in der Middleware) sofort umstellen
+        _apply_tenant_context(db.connection(), tenant_id)
+
+async def set_tenant_context_async(db: AsyncSession, tenant_id: uuid.UUID = None):
+    """Setzt den Tenant-Kontext für RLS auf einer AsyncSession (gleiches Verhalten wie sync)"""
+    await db.run_sync(set_tenant_context, tenant_id)
+
+# Connection während externer I/O freigeben
+#
+# Eine Session hält ihre Pool-Connection, solange eine Transaktion läuft - in Requests also ab
+# der ersten Query bis zum Commit, auch während auf Google Maps, Investagon, S3 oder bcrypt
+# gewartet wird. released_connection() beendet eine rein lesende Transaktion vorher; die nächste
+# Query holt sich eine neue Connection (Tenant-Kontext kommt über after_begin mit).
+
+_TX_WRITES_KEY = "transaction_has_writes"
+RELEASING_CONNECTION_KEY = "releasing_connection"
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info[_TX_WRITES_KEY] = True
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    # Bulk UPDATE/DELETE (query.update(), text() DML) laufen ohne Flush
+    if orm_execute_state.is_select:
+        return
+    sql = getattr(orm_execute_state.statement, "text", None)
+    if sql is None or not sql.lstrip().lower().startswith("select"):
+        orm_execute_state.session.info[_TX_WRITES_KEY] = True
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_transaction_writes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_TX_WRITES_KEY, None)
+
+def release_connection(db: Session) -> bool:
+    """
+    Gibt die Connection der Session zurück in den Pool, wenn die laufende Transaktion nichts
+    geschrieben hat und nichts ungeflusht ist. Geladene Objekte bleiben unverändert geladen.
+    Returns False, wenn die Connection gehalten werden muss.
+    """
+    if not db.in_transaction():
+        return True
+    if (
+        db.in_nested_transaction()
+        or db.info.get(_TX_WRITES_KEY)
+        or db.new or db.dirty or db.deleted
+    ):
+        metrics.inc("db_connection_releases_total", {"result": "held"})
+        logger.debug("Session has uncommitted writes, keeping its connection during external I/O")
+        return False
+    
+    # Lesende Transaktion beenden, ohne die geladenen Objekte zu expiren; vorgemerkte
+    # Audit-Events gehören weiter zum Request und bleiben bis zu dessen Commit liegen
+    expire_on_commit = db.expire_on_commit
+    db.expire_on_commit = False
+    db.info[RELEASING_CONNECTION_KEY] = True
+    try:
+        db.commit()
+    finally:
+        db.expire_on_commit = expire_on_commit
+        db.info.pop(RELEASING_CONNECTION_KEY, None)
+    metrics.inc("db_connection_releases_total", {"result": "released"})
+    return True
+
+@asynccontextmanager
+async def released_connection(db: Session):
+    """
+    async with released_connection(db):
+        response = await client.get(...)
+    
+    Die Session darf innerhalb des Blocks nicht benutzt werden; danach ganz normal weiter.
+    """
+    released = release_connection(db)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if released:
+            metrics.observe("db_connection_released_seconds", time.perf_counter() - started)
 
 @contextmanager
 def get_db_session():
@@ -0,0 +1,166 @@
+# ================================
+# READ REPLICA ROUTING (core/db_routing.py)
+# ================================
+
+from typing import Optional, Dict, Any
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+import logging
+import threading
+import time
+import uuid
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Lag is 0 on a primary (same instance as stand-in) and when the replica has replayed everything it received
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class ReplicaMonitor:
+    """
+    Background check of the replica lag.
+    
+    The request path only reads the cached flag; until the first successful check (or when
+    the monitor is not running, e.g. in scripts) everything goes to the primary.
+    """
+    
+    def __init__(self):
+        self.engine = None
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        # user_id -> monotonic deadline until which the user reads from the primary
+        self._sticky_users: Dict[uuid.UUID, float] = {}
+        self._sticky_lock = threading.Lock()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.engine is not None
+    
+    def start(self) -> None:
+        if not self.enabled or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-monitor", daemon=True)
+        self._thread.start()
+        logger.info("Read replica monitor started")
+    
+    def stop(self) -> None:
+        self._stop.set()
+    
+    def check(self) -> None:
+        try:
+            with self.engine.connect() as conn:
+                lag = float(conn.execute(REPLICA_LAG_QUERY).scalar() or 0)
+            was_healthy = self.healthy
+            self.lag_seconds = lag
+            self.healthy = lag <= settings.REPLICA_MAX_LAG_SECONDS
+            self.last_error = None
+            if was_healthy and not self.healthy:
+                logger.warning(f"Read replica lag {lag:.1f}s exceeds {settings.REPLICA_MAX_LAG_SECONDS}s, routing reads to primary")
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"Read replica unavailable, routing reads to primary: {e}")
+            self.healthy = False
+            self.last_error = str(e)
+        self.checked_at = time.time()
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.check()
+            self._stop.wait(settings.REPLICA_LAG_CHECK_INTERVAL_SECONDS)
+    
+    # Read-your-writes across requests of the same user (per worker process)
+    
+    def mark_user_wrote(self, user_id: uuid.UUID) -> None:
+        deadline = time.monotonic() + settings.REPLICA_STICKY_SECONDS
+        with self._sticky_lock:
+            self._sticky_users[user_id] = deadline
+            if len(self._sticky_users) > 10000:
+                now = time.monotonic()
+                self._sticky_users = {k: v for k, v in self._sticky_users.items() if v > now}
+    
+    def is_user_sticky(self, user_id: Optional[uuid.UUID]) -> bool:
+        if user_id is None:
+            return False
+        deadline = self._sticky_users.get(user_id)
+        return deadline is not None and deadline > time.monotonic()
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": settings.REPLICA_MAX_LAG_SECONDS,
+            "last_error": self.last_error,
+            "checked_at": self.checked_at
+        }
+
+
+replica_monitor = ReplicaMonitor()
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads of read-only scopes to the replica.
+    
+    A session becomes read-only via use_replica(). Writes (flush, DML, SELECT ... FOR UPDATE)
+    always go to the primary and make the rest of the session stick to the primary, so
+    reads after a write see it. Without a configured or healthy replica this behaves like
+    a plain Session.
+    """
+    
+    replica_bind = None
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self.replica_bind is not None and self._reads_from_replica(clause):
+            return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+    
+    def _reads_from_replica(self, clause) -> bool:
+        info = self.info
+        if not info.get("read_only") or info.get("wrote") or not replica_monitor.healthy:
+            return False
+        if self._flushing:
+            info["wrote"] = True
+            return False
+        if clause is None or (
+            getattr(clause, "is_dml", False)
+            or getattr(clause, "_for_update_arg", None) is not None
+            or not getattr(clause, "is_select", False)
+        ):
+            # DML, locking reads, textual statements and raw connection() calls stay on the primary
+            if getattr(clause, "is_dml", False):
+                info["wrote"] = True
+            return False
+        return True
+
+
+def use_replica(db: Session, user_id: Optional[uuid.UUID] = None) -> Session:
+    """Mark a session as read-only scope (unless the user wrote moments ago)"""
+    if replica_monitor.enabled and not replica_monitor.is_user_sticky(user_id):
+        db.info["read_only"] = True
+    return db
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+    # "wrote" stays set: later reads of this session keep going to the primary
+    if session.info.get("wrote") and session.info.get("user_id"):
+        replica_monitor.mark_user_wrote(session.info["user_id"])
@@ -0,0 +1,581 @@
+# ================================
+# METRICS (core/metrics.py)
+# ================================
+
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+import httpx
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sekunden-Buckets für Latenzen
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Anzahl Queries pro Request
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+
+# Per-request DB counters, set by MetricsMiddleware and filled by the engine events
+_request_db_stats: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_db_stats", default=None)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Optional[Dict[str, Any]]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in (labels or {}).items()))
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics registry (counters + histograms) with Prometheus text output.
+    
+    Every worker process keeps its own registry and periodically writes a snapshot to
+    METRICS_DIR/<master pid>/<worker pid>.json; collect() merges all snapshots of the
+    current worker generation so /metrics and the admin endpoint report totals across
+    gunicorn/uvicorn workers. Counters of exited workers stay in the totals, their
+    gauges are ignored.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self._started_at = time.time()
+        self._flush_thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+    
+    # ================================
+    # RECORDING
+    # ================================
+    
+    def counter(self, name: str, documentation: str) -> None:
+        self._meta[name] = {"type": "counter", "help": documentation}
+        self._counters.setdefault(name, {})
+    
+    def histogram(self, name: str, documentation: str, buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self._meta[name] = {"type": "histogram", "help": documentation, "buckets": list(buckets)}
+        self._histograms.setdefault(name, {})
+    
+    def inc(self, name: str, labels: Optional[Dict[str, Any]] = None, value: float = 1) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0) + value
+    
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, Any]] = None) -> None:
+        buckets = self._meta[name]["buckets"]
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms[name]
+            # [count per bucket..., +Inf count, sum]
+            values = series.get(key)
+            if values is None:
+                values = series[key] = [0.0] * (len(buckets) + 2)
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    values[index] += 1
+                    break
+            else:
+                values[len(buckets)] += 1
+            values[-1] += value
+    
+    # ================================
+    # SNAPSHOTS & AGGREGATION
+    # ================================
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state of this worker (gauges are read at call time)"""
+        with self._lock:
+            counters = {
+                name: [[list(key), value] for key, value in series.items()]
+                for name, series in self._counters.items()
+            }
+            histograms = {
+                name: [[list(key), list(values)] for key, values in series.items()]
+                for name, series in self._histograms.items()
+            }
+        return {
+            "pid": os.getpid(),
+            "started_at": self._started_at,
+            "updated_at": time.time(),
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": _collect_gauges()
+        }
+    
+    @staticmethod
+    def _generation_dir() -> Optional[str]:
+        if not settings.METRICS_DIR:
+            return None
+        # Workers of one gunicorn master share the parent pid
+        return os.path.join(settings.METRICS_DIR, str(os.getppid()))
+    
+    def write_snapshot(self) -> None:
+        directory = self._generation_dir()
+        if not directory:
+            return
+        try:
+            os.makedirs(directory, exist_ok=True)
+            target = os.path.join(directory, f"{os.getpid()}.json")
+            with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as handle:
+                json.dump(self.snapshot(), handle)
+            os.replace(handle.name, target)
+        except Exception as e:
+            logger.warning(f"Failed to write metrics snapshot: {e}")
+    
+    def _read_snapshots(self) -> List[Dict[str, Any]]:
+        own = self.snapshot()
+        directory = self._generation_dir()
+        if not directory or not os.path.isdir(directory):
+            return [own]
+        
+        snapshots = [own]
+        for filename in os.listdir(directory):
+            if not filename.endswith(".json") or filename == f"{own['pid']}.json":
+                continue
+            try:
+                with open(os.path.join(directory, filename)) as handle:
+                    snapshot = json.load(handle)
+            except (OSError, ValueError):
+                continue
+            if not _pid_alive(snapshot.get("pid")):
+                snapshot["gauges"] = []
+            snapshots.append(snapshot)
+        return snapshots
+    
+    def collect(self) -> Dict[str, Any]:
+        """Merged counters/histograms of all workers plus per-worker gauges"""
+        snapshots = self._read_snapshots()
+        counters: Dict[str, Dict[LabelKey, float]] = {}
+        histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        gauges = []
+        
+        for snapshot in snapshots:
+            for name, series in snapshot["counters"].items():
+                merged = counters.setdefault(name, {})
+                for key, value in series:
+                    key = tuple(tuple(pair) for pair in key)
+                    merged[key] = merged.get(key, 0) + value
+            for name, series in snapshot["histograms"].items():
+                merged = histograms.setdefault(name, {})
+                for key, values in series:
+                    key = tuple(tuple(pair) for pair in key)
+                    if key in merged:
+                        merged[key] = [a + b for a, b in zip(merged[key], values)]
+                    else:
+                        merged[key] = list(values)
+            for name, labels, value in snapshot["gauges"]:
+                gauges.append((name, dict(labels, pid=snapshot["pid"]), value))
+        
+        return {
+            "workers": len(snapshots),
+            "live_workers": sum(1 for s in snapshots if s["gauges"]),
+            "since": min(s["started_at"] for s in snapshots),
+            "counters": counters,
+            "histograms": histograms,
+            "gauges": gauges
+        }
+    
+    # ================================
+    # EXPORT
+    # ================================
+    
+    @staticmethod
+    def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+        pairs = [
+            '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for k, v in labels
+        ]
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+    
+    def render_prometheus(self, collected: Optional[Dict[str, Any]] = None) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        collected = collected or self.collect()
+        lines = []
+        
+        for name, series in collected["counters"].items():
+            lines.append(f"# HELP {name} {self._meta[name]['help']}")
+            lines.append(f"# TYPE {name} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{self._format_labels(key)} {value:g}")
+        
+        for name, series in collected["histograms"].items():
+            buckets = self._meta[name]["buckets"]
+            lines.append(f"# HELP {name} {self._meta[name]['help']}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, values in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(buckets, values):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{self._format_labels(key + (('le', f'{bound:g}'),))} {cumulative:g}")
+                total = cumulative + values[len(buckets)]
+                lines.append(f"{name}_bucket{self._format_labels(key + (('le', '+Inf'),))} {total:g}")
+                lines.append(f"{name}_sum{self._format_labels(key)} {values[-1]:.6f}")
+                lines.append(f"{name}_count{self._format_labels(key)} {total:g}")
+        
+        seen = set()
+        for name, labels, value in collected["gauges"]:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {GAUGE_HELP.get(name, name)}")
+                lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name}{self._format_labels(sorted(labels.items()))} {value:g}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def quantile(self, name: str, values: List[float], q: float) -> Optional[float]:
+        """Estimate a quantile from histogram buckets (linear within a bucket, like histogram_quantile)"""
+        buckets = self._meta[name]["buckets"]
+        total = sum(values[:-1])
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0.0
+        lower = 0.0
+        for bound, count in zip(buckets, values):
+            if cumulative + count >= rank and count:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative += count
+            lower = bound
+        return buckets[-1]
+    
+    # ================================
+    # LIFECYCLE
+    # ================================
+    
+    def start(self) -> None:
+        """Start periodic snapshot writing (one thread per worker)"""
+        if not settings.METRICS_DIR or (self._flush_thread and self._flush_thread.is_alive()):
+            return
+        _cleanup_old_generations()
+        self._stop.clear()
+        self._flush_thread = threading.Thread(target=self._flush_loop, name="metrics-writer", daemon=True)
+        self._flush_thread.start()
+    
+    def stop(self) -> None:
+        self._stop.set()
+        self.write_snapshot()
+    
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(settings.METRICS_FLUSH_INTERVAL_SECONDS):
+            self.write_snapshot()
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _cleanup_old_generations(max_age_seconds: int = 86400) -> None:
+    """Remove snapshot directories of previous deployments"""
+    try:
+        for entry in os.listdir(settings.METRICS_DIR):
+            path = os.path.join(settings.METRICS_DIR, entry)
+            if entry != str(os.getppid()) and os.path.isdir(path) and time.time() - os.path.getmtime(path) > max_age_seconds:
+                shutil.rmtree(path, ignore_errors=True)
+    except OSError:
+        pass
+
+
+# ================================
+# METRIC DEFINITIONS
+# ================================
+
+metrics = MetricsRegistry()
+
+metrics.counter("http_requests_total", "HTTP requests by route, method and status code")
+metrics.histogram("http_request_duration_seconds", "HTTP request latency by route")
+metrics.histogram("http_request_db_queries", "Database queries per HTTP request", QUERY_COUNT_BUCKETS)
+metrics.histogram("http_request_db_seconds", "Time spent in database queries per HTTP request")
+metrics.histogram("db_query_duration_seconds", "Duration of single database statements")
+metrics.counter("db_slow_queries_total", "Database statements slower than SLOW_QUERY_THRESHOLD_MS")
+metrics.counter("db_errors_total", "Failed database statements")
+metrics.histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection")
+metrics.counter("db_pool_timeouts_total", "Connection checkouts that timed out")
+metrics.histogram("db_pool_connection_hold_seconds", "Time a pooled connection stays checked out")
+metrics.counter("db_connection_releases_total", "Connection releases around external I/O (released / held)")
+metrics.histogram("db_connection_released_seconds", "External I/O time spent without holding a connection")
+metrics.histogram("http_client_request_duration_seconds", "Outbound HTTP latency by integration")
+metrics.counter("http_client_requests_total", "Outbound HTTP requests by integration and status")
+
+GAUGE_HELP = {
+    "db_pool_size": "Configured connection pool size",
+    "db_pool_checked_out": "Connections currently checked out",
+    "db_pool_overflow": "Overflow connections currently open",
+    "process_uptime_seconds": "Worker uptime",
+    "db_replica_lag_seconds": "Replication lag of the read replica (last check)",
+    "db_replica_healthy": "1 while reads are routed to the read replica",
+}
+
+
+def _collect_gauges() -> List[Tuple[str, Dict[str, str], float]]:
+    gauges = [("process_uptime_seconds", {}, round(time.time() - metrics._started_at, 1))]
+    try:
+        from app.core.database import engine, async_engine, replica_engine, async_replica_engine
+        from app.core.db_routing import replica_monitor
+        pools = [("sync", engine.pool), ("async", async_engine.sync_engine.pool)]
+        if replica_engine is not None:
+            pools += [("replica", replica_engine.pool), ("async_replica", async_replica_engine.sync_engine.pool)]
+            gauges.append(("db_replica_healthy", {}, 1 if replica_monitor.healthy else 0))
+            if replica_monitor.lag_seconds is not None:
+                gauges.append(("db_replica_lag_seconds", {}, replica_monitor.lag_seconds))
+        for name, pool in pools:
+            gauges.extend([
+                ("db_pool_size", {"engine": name}, pool.size()),
+                ("db_pool_checked_out", {"engine": name}, pool.checkedout()),
+                ("db_pool_overflow", {"engine": name}, max(pool.overflow(), 0)),
+            ])
+    except Exception:
+        pass
+    return gauges
+
+
+# ================================
+# DATABASE INSTRUMENTATION
+# ================================
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a free connection"""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.inc("db_pool_timeouts_total")
+            raise
+        finally:
+            metrics.observe("db_pool_checkout_wait_seconds", time.perf_counter() - started)
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Same checkout timing for the asyncpg engine"""
+
+
+def instrument_engine(engine) -> None:
+    """Attach statement timing and connection hold time to an engine"""
+    
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        connection_record.info["checked_out_at"] = time.perf_counter()
+    
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.observe("db_pool_connection_hold_seconds", time.perf_counter() - checked_out_at)
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        metrics.observe("db_query_duration_seconds", elapsed)
+        if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+            metrics.inc("db_slow_queries_total")
+        stats = _request_db_stats.get()
+        if stats is not None:
+            stats["queries"] += 1
+            stats["seconds"] += elapsed
+    
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        metrics.inc("db_errors_total")
+        starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+        if starts:
+            starts.pop()
+
+
+# ================================
+# REQUEST INSTRUMENTATION
+# ================================
+
+def start_request() -> Tuple[Dict[str, float], Any]:
+    """Begin per-request DB accounting; returns (stats, token) for finish_request"""
+    stats = {"queries": 0, "seconds": 0.0}
+    return stats, _request_db_stats.set(stats)
+
+
+def finish_request(
+    stats: Dict[str, float],
+    token: Any,
+    method: str,
+    route: str,
+    status_code: int,
+    duration: float
+) -> None:
+    _request_db_stats.reset(token)
+    labels = {"method": method, "route": route}
+    metrics.inc("http_requests_total", {**labels, "status": status_code})
+    metrics.observe("http_request_duration_seconds", duration, labels)
+    metrics.observe("http_request_db_queries", stats["queries"], labels)
+    metrics.observe("http_request_db_seconds", stats["seconds"], labels)
+
+
+# ================================
+# OUTBOUND HTTP INSTRUMENTATION
+# ================================
+
+def record_outbound(integration: str, duration: float, status: Any) -> None:
+    metrics.observe("http_client_request_duration_seconds", duration, {"integration": integration})
+    metrics.inc("http_client_requests_total", {"integration": integration, "status": status})
+
+
+@contextmanager
+def track_outbound(integration: str):
+    """Time a non-httpx outbound call (e.g. requests); status is set via the yielded dict"""
+    result = {"status": "error"}
+    started = time.perf_counter()
+    try:
+        yield result
+    finally:
+        record_outbound(integration, time.perf_counter() - started, result["status"])
+
+
+def http_client(integration: str, **kwargs) -> httpx.AsyncClient:
+    """httpx.AsyncClient whose requests are recorded under the given integration name"""
+    return InstrumentedAsyncClient(integration, **kwargs)
+
+
+class InstrumentedAsyncClient(httpx.AsyncClient):
+    """AsyncClient recording latency and status (or transport errors) per integration"""
+    
+    def __init__(self, integration: str, **kwargs):
+        super().__init__(**kwargs)
+        self._integration = integration
+    
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await super().send(request, **kwargs)
+        except httpx.TransportError:
+            record_outbound(self._integration, time.perf_counter() - started, "error")
+            raise
+        record_outbound(self._integration, time.perf_counter() - started, response.status_code)
+        return response
+
+
+# ================================
+# SUMMARY (admin dashboard)
+# ================================
+
+def _histogram_stats(name: str, values: List[float]) -> Dict[str, Any]:
+    count = sum(values[:-1])
+    return {
+        "count": int(count),
+        "avg_ms": round(values[-1] / count * 1000, 1) if count else None,
+        "p50_ms": _ms(metrics.quantile(name, values, 0.5)),
+        "p95_ms": _ms(metrics.quantile(name, values, 0.95)),
+        "p99_ms": _ms(metrics.quantile(name, values, 0.99)),
+    }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+def performance_summary() -> Dict[str, Any]:
+    """Aggregated request, database, pool and integration metrics for the admin API"""
+    collected = metrics.collect()
+    counters = collected["counters"]
+    histograms = collected["histograms"]
+    
+    # Requests per route
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    for key, values in histograms.get("http_request_duration_seconds", {}).items():
+        labels = dict(key)
+        endpoint = f"{labels['method']} {labels['route']}"
+        endpoints[endpoint] = _histogram_stats("http_request_duration_seconds", values)
+        endpoints[endpoint].update({"status_codes": {}, "error_rate": 0.0})
+    
+    for key, value in counters.get("http_requests_total", {}).items():
+        labels = dict(key)
+        endpoint = endpoints.get(f"{labels['method']} {labels['route']}")
+        if endpoint is not None:
+            endpoint["status_codes"][labels["status"]] = int(value)
+    
+    for endpoint_key, endpoint in endpoints.items():
+        errors = sum(count for status, count in endpoint["status_codes"].items() if status.startswith("5"))
+        endpoint["error_rate"] = round(errors / endpoint["count"], 4) if endpoint["count"] else 0.0
+        labels = (("method", endpoint_key.split(" ", 1)[0]), ("route", endpoint_key.split(" ", 1)[1]))
+        queries = histograms.get("http_request_db_queries", {}).get(labels)
+        db_time = histograms.get("http_request_db_seconds", {}).get(labels)
+        if queries and endpoint["count"]:
+            endpoint["avg_db_queries"] = round(queries[-1] / endpoint["count"], 1)
+            endpoint["p95_db_queries"] = metrics.quantile("http_request_db_queries", queries, 0.95)
+        if db_time and endpoint["count"]:
+            endpoint["avg_db_ms"] = round(db_time[-1] / endpoint["count"] * 1000, 1)
+    
+    # Database
+    query_values = next(iter(histograms.get("db_query_duration_seconds", {}).values()), None)
+    wait_values = next(iter(histograms.get("db_pool_checkout_wait_seconds", {}).values()), None)
+    hold_values = next(iter(histograms.get("db_pool_connection_hold_seconds", {}).values()), None)
+    released_values = next(iter(histograms.get("db_connection_released_seconds", {}).values()), None)
+    releases = {dict(key)["result"]: int(value) for key, value in counters.get("db_connection_releases_total", {}).items()}
+    pool: Dict[str, float] = {"size": 0, "checked_out": 0, "overflow": 0}
+    for name, labels, value in collected["gauges"]:
+        if name.startswith("db_pool_"):
+            pool[name[len("db_pool_"):]] += value
+    capacity = pool["size"] + (
+        settings.DATABASE_MAX_OVERFLOW + settings.ASYNC_DATABASE_MAX_OVERFLOW
+    ) * collected["live_workers"]
+    
+    database = {
+        "queries": _histogram_stats("db_query_duration_seconds", query_values) if query_values else {"count": 0},
+        "slow_queries_count": int(sum(counters.get("db_slow_queries_total", {}).values())),
+        "slow_query_threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "errors_count": int(sum(counters.get("db_errors_total", {}).values())),
+        "pool": {
+            **{k: int(v) for k, v in pool.items()},
+            "usage_percent": round(pool["checked_out"] / capacity * 100, 1) if capacity else 0.0,
+            "checkout_wait": _histogram_stats("db_pool_checkout_wait_seconds", wait_values) if wait_values else {"count": 0},
+            "timeouts": int(sum(counters.get("db_pool_timeouts_total", {}).values())),
+            "connection_hold": _histogram_stats("db_pool_connection_hold_seconds", hold_values) if hold_values else {"count": 0},
+            "released_during_io": {
+                "released": releases.get("released", 0),
+                "held": releases.get("held", 0),
+                "io_time": _histogram_stats("db_connection_released_seconds", released_values) if released_values else {"count": 0},
+            },
+        },
+    }
+    
+    # Outbound integrations
+    integrations: Dict[str, Dict[str, Any]] = {}
+    for key, values in histograms.get("http_client_request_duration_seconds", {}).items():
+        integration = dict(key)["integration"]
+        integrations[integration] = _histogram_stats("http_client_request_duration_seconds", values)
+        integrations[integration]["status_codes"] = {}
+    for key, value in counters.get("http_client_requests_total", {}).items():
+        labels = dict(key)
+        if labels["integration"] in integrations:
+            integrations[labels["integration"]]["status_codes"][labels["status"]] = int(value)
+    
+    return {
+        "workers": collected["workers"],
+        "live_workers": collected["live_workers"],
+        "collected_since": collected["since"],
+        "api_endpoints": dict(sorted(endpoints.items(), key=lambda item: -item[1]["count"])),
+        "database": database,
+        "integrations": integrations,
+    }
@@ -5,6 +5,7 @@
 from typing import Optional
 from fastapi import Request, Response, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal, set_tenant_context
 from app.models.user import User
@@ -13,6 +14,8 @@ import time
 import uuid
 import logging
 import asyncio
+import zlib
+import anyio
 
 logger = logging.getLogger(__name__)
 
@@ -31,13 +34,14 @@ class TenantMiddleware(BaseHTTPMiddleware):
         request.state.db = db
         
         try:
-            # Tenant-Kontext aus JWT Token extrahieren
-            tenant_id = await self._extract_tenant_from_request(request, db)
+            # Tenant-Kontext aus JWT Token extrahieren; im Thread, damit das Warten auf eine freie
+            # Pool-Connection nicht den Event Loop blockiert (sonst geben laufende async Requests
+            # ihre Connection nie zurück)
+            tenant_id = await anyio.to_thread.run_sync(self._extract_tenant_from_request, request, db)
             request.state.tenant_id = tenant_id
             
-            # RLS Kontext setzen
-            if tenant_id:
-                set_tenant_context(db, tenant_id)
+            # RLS Kontext setzen (auch "kein Tenant", gilt pro Transaktion)
+            set_tenant_context(db, tenant_id)
             
             response = await call_next(request)
             
@@ -54,7 +58,7 @@ class TenantMiddleware(BaseHTTPMiddleware):
         finally:
             db.close()
     
-    async def _extract_tenant_from_request(self, request: Request, db: Session) -> Optional[uuid.UUID]:
+    def _extract_tenant_from_request(self, request: Request, db: Session) -> Optional[uuid.UUID]:
         """Extrahiert Tenant-ID aus Authorization Header"""
         auth_header = request.headers.get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
@@ -74,6 +78,10 @@ class TenantMiddleware(BaseHTTPMiddleware):
         if not user:
             return None
         
+        # Für Read-your-writes beim Replica-Routing
+        request.state.user_id = user.id
+        db.info["user_id"] = user.id
+        
         # Super-Admin Impersonation Check
         impersonated_tenant = payload.get("impersonated_tenant_id")
         if user.is_super_admin and impersonated_tenant:
@@ -81,6 +89,52 @@ class TenantMiddleware(BaseHTTPMiddleware):
         
         return user.tenant_id
 
+class MetricsMiddleware(BaseHTTPMiddleware):
+    """Middleware für Request-Metriken (Latenz, Status, DB-Queries pro Route)"""
+    
+    async def dispatch(self, request: Request, call_next):
+        from app.core import metrics
+        
+        start_time = time.perf_counter()
+        stats, token = metrics.start_request()
+        status_code = 500
+        
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            # Route-Template statt Pfad, damit IDs keine eigenen Zeitreihen erzeugen
+            route = request.scope.get("route")
+            metrics.finish_request(
+                stats,
+                token,
+                request.method,
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - start_time
+            )
+
+class SQLProfilerMiddleware(BaseHTTPMiddleware):
+    """Opt-in SQL Profiling pro Request (X-SQL-Profile Header oder SQL_PROFILER_ENABLED)"""
+    
+    async def dispatch(self, request: Request, call_next):
+        from app.core import sql_profiler
+        
+        if not sql_profiler.wants_profile(request.headers.get("X-SQL-Profile")):
+            return await call_next(request)
+        
+        profile, token = sql_profiler.start(request.method, request.url.path)
+        try:
+            response = await call_next(request)
+        finally:
+            sql_profiler.stop(token)
+        
+        summary = profile.summary()
+        profile.log(summary)
+        response.headers["X-SQL-Profile"] = profile.header_value(summary)
+        return response
+
 class AuditMiddleware(BaseHTTPMiddleware):
     """Middleware für Audit-Logging"""
     
@@ -233,4 +287,104 @@ class TimeoutMiddleware(BaseHTTPMiddleware):
             raise HTTPException(
                 status_code=504,
                 detail=f"Request timeout after {self.timeout_seconds} seconds"
-            )
\ No newline at end of file
+            )
+
+
+class CompressionMiddleware:
+    """
+    Negotiated response compression: brotli (if installed) or gzip, by Accept-Encoding.
+    
+    Plain ASGI middleware, registered innermost: it sees the route's response before
+    any BaseHTTPMiddleware re-chunks the body. Only responses that arrive as a single
+    body message (Response/JSONResponse, not StreamingResponse) with a text or JSON
+    content type, no Content-Encoding and at least minimum_size bytes are compressed.
+    Streaming downloads and exports pass through unchanged.
+    """
+    
+    COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+    THREAD_OFFLOAD_BYTES = 256 * 1024  # Große Bodies nicht im Event Loop komprimieren
+    
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        try:
+            import brotli
+            self._brotli = brotli
+        except ImportError:
+            self._brotli = None
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = self._negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Header zurückhalten, bis feststeht, ob komprimiert wird
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            if message.get("more_body", False) or not self._compressible(headers, len(body)):
+                await send(start)
+                await send(message)
+                return
+            
+            if len(body) >= self.THREAD_OFFLOAD_BYTES:
+                body = await anyio.to_thread.run_sync(self._compress, encoding, body)
+            else:
+                body = self._compress(encoding, body)
+            
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+        
+        await self.app(scope, receive, send_compressed)
+    
+    def _negotiate(self, accept_encoding: str) -> Optional[str]:
+        accepted = set()
+        for item in accept_encoding.lower().split(","):
+            name, _, params = item.partition(";")
+            quality = 1.0
+            key, _, value = params.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+            if quality > 0:
+                accepted.add(name.strip())
+        if self._brotli is not None and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+    
+    def _compressible(self, headers: MutableHeaders, size: int) -> bool:
+        if size < self.minimum_size or "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").lower()
+        return content_type.startswith(self.COMPRESSIBLE_TYPES)
+    
+    def _compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "br":
+            return self._brotli.compress(body, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip-Container
+        return compressor.compress(body) + compressor.flush()
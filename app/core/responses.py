@@ -0,0 +1,64 @@
+# ================================
+# RESPONSES (core/responses.py)
+# ================================
+
+from typing import Any, Mapping, Optional
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+
+try:
+    import orjson
+except ImportError:  # Fallback auf json der Standardbibliothek
+    orjson = None
+
+
+def _orjson_default(value: Any) -> Any:
+    # datetime, date, UUID, Enum und dataclasses kann orjson selbst
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class: encodes with orjson when it is installed, otherwise
+    behaves exactly like JSONResponse.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ModelResponse(Response):
+    """
+    Response for a Pydantic model the service layer has already built and validated.
+    
+    Returning a Response bypasses FastAPI's response_model handling, which would dump
+    the model to a dict, validate it again and encode it a second time. The model is
+    serialized once by pydantic-core instead. Keep response_model on the route for the
+    OpenAPI schema; exclude_none mirrors response_model_exclude_none.
+    """
+    media_type = "application/json"
+    
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        exclude_none: bool = True,
+        background: Optional[BackgroundTask] = None
+    ) -> None:
+        self.exclude_none = exclude_none
+        super().__init__(content, status_code, headers, background=background)
+    
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json(by_alias=True, exclude_none=self.exclude_none).encode("utf-8")
@@ -290,6 +290,25 @@ async def cleanup_expired_sessions():
     finally:
         db.close()
 
+async def maintain_audit_log_partitions():
+    """Create upcoming audit log partitions and drop the ones past retention"""
+    db = SessionLocal()
+    try:
+        from app.services.audit_partition_service import AuditLogPartitionService
+        
+        created = AuditLogPartitionService.ensure_partitions(db)
+        dropped = AuditLogPartitionService.drop_expired_partitions(db)
+        db.commit()
+        
+        if created or dropped:
+            logger.info(f"Audit log partitions maintained: created {created}, dropped {dropped}")
+        
+    except Exception as e:
+        logger.error(f"Error maintaining audit log partitions: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
 async def generate_daily_reports():
     """Generate daily usage reports"""
     # This is a placeholder for future reporting functionality
@@ -320,6 +339,15 @@ def initialize_scheduler():
         enabled=True
     )
     
+    # Audit log partitions - once per day
+    scheduler.add_task(
+        name="audit_log_partitions",
+        func=maintain_audit_log_partitions,
+        interval_seconds=86400,  # 24 hours
+        initial_delay=120,  # Wait 2 minutes after startup
+        enabled=True
+    )
+    
     # Daily reports - once per day at midnight
     scheduler.add_task(
         name="daily_reports",
@@ -0,0 +1,158 @@
+# ================================
+# SQL PROFILER (core/sql_profiler.py)
+# ================================
+
+from typing import Optional, Dict, Any, List
+from contextvars import ContextVar
+from sqlalchemy import event
+import logging
+import os
+import re
+import sys
+import time
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Active profile of the current request; None = profiling off (engine hooks return immediately)
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("sql_profile", default=None)
+
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP_FILES = (os.path.abspath(__file__),)
+
+_PARAM_PATTERN = re.compile(r"%\(\w+\)s|\?|(?<!:):\w+|\$\d+")
+_POSTCOMPILE_PATTERN = re.compile(r"\(\s*__\[POSTCOMPILE_\w+\]\s*\)")
+_LITERAL_PATTERN = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so calls that only differ in parameters compare equal"""
+    shape = _POSTCOMPILE_PATTERN.sub("(?)", statement)
+    shape = _PARAM_PATTERN.sub("?", shape)
+    shape = _LITERAL_PATTERN.sub("?", shape)
+    return _WHITESPACE_PATTERN.sub(" ", shape).strip()
+
+
+def _call_site() -> str:
+    """First stack frame inside the application (outside SQLAlchemy and this module)"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_ROOT) and filename not in _SKIP_FILES:
+            return f"{os.path.relpath(filename, os.path.dirname(_APP_ROOT))}:{frame.f_lineno} ({frame.f_code.co_name})"
+        frame = frame.f_back
+    return "unknown"
+
+
+class RequestProfile:
+    """Statements of one request with timing and call site"""
+    
+    def __init__(self, method: str, path: str):
+        self.method = method
+        self.path = path
+        self.statements: List[Dict[str, Any]] = []
+        self.started = time.perf_counter()
+    
+    def record(self, statement: str, duration: float, executemany: bool) -> None:
+        self.statements.append({
+            "shape": statement_shape(statement),
+            "duration_ms": round(duration * 1000, 2),
+            "call_site": _call_site(),
+            "executemany": executemany
+        })
+    
+    def n_plus_one_candidates(self, threshold: int) -> List[Dict[str, Any]]:
+        """Statement shapes executed at least threshold times, most frequent first"""
+        groups: Dict[str, Dict[str, Any]] = {}
+        for item in self.statements:
+            group = groups.setdefault(item["shape"], {
+                "shape": item["shape"],
+                "count": 0,
+                "total_ms": 0.0,
+                "call_sites": {}
+            })
+            group["count"] += 1
+            group["total_ms"] += item["duration_ms"]
+            group["call_sites"][item["call_site"]] = group["call_sites"].get(item["call_site"], 0) + 1
+        
+        candidates = [group for group in groups.values() if group["count"] >= threshold]
+        for group in candidates:
+            group["total_ms"] = round(group["total_ms"], 2)
+        return sorted(candidates, key=lambda group: -group["count"])
+    
+    def summary(self) -> Dict[str, Any]:
+        candidates = self.n_plus_one_candidates(settings.SQL_PROFILER_N_PLUS_ONE_THRESHOLD)
+        return {
+            "queries": len(self.statements),
+            "db_ms": round(sum(item["duration_ms"] for item in self.statements), 2),
+            "request_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "n_plus_one": candidates
+        }
+    
+    def header_value(self, summary: Dict[str, Any]) -> str:
+        value = f"queries={summary['queries']}; db_ms={summary['db_ms']}; n_plus_one={len(summary['n_plus_one'])}"
+        if summary["n_plus_one"]:
+            worst = summary["n_plus_one"][0]
+            site = max(worst["call_sites"], key=worst["call_sites"].get)
+            value += f"; worst={worst['count']}x@{site}"
+        return value
+    
+    def log(self, summary: Dict[str, Any]) -> None:
+        message = (
+            f"SQL profile {self.method} {self.path}: {summary['queries']} queries, "
+            f"{summary['db_ms']} ms in DB, {summary['request_ms']} ms total"
+        )
+        if not summary["n_plus_one"]:
+            logger.info(message)
+            return
+        
+        lines = [message, f"N+1 candidates (>= {settings.SQL_PROFILER_N_PLUS_ONE_THRESHOLD} executions):"]
+        for group in summary["n_plus_one"]:
+            lines.append(f"  {group['count']}x, {group['total_ms']} ms: {group['shape'][:300]}")
+            for site, count in sorted(group["call_sites"].items(), key=lambda item: -item[1]):
+                lines.append(f"      {count}x at {site}")
+        logger.warning("\n".join(lines))
+
+
+def wants_profile(header_value: Optional[str]) -> bool:
+    """Profiling for every request (SQL_PROFILER_ENABLED) or on request via X-SQL-Profile header"""
+    if settings.SQL_PROFILER_ENABLED:
+        return True
+    if header_value and header_value.lower() in ("1", "true", "yes"):
+        return settings.DEBUG or settings.SQL_PROFILER_HEADER_ENABLED
+    return False
+
+
+def start(method: str, path: str):
+    """Activate profiling for the current context; returns (profile, token)"""
+    profile = RequestProfile(method, path)
+    return profile, _active_profile.set(profile)
+
+
+def stop(token) -> None:
+    _active_profile.reset(token)
+
+
+def instrument_engine(engine) -> None:
+    """Attach the profiler to an engine (no-op per statement while no profile is active)"""
+    
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _active_profile.get() is not None:
+            conn.info.setdefault("profile_start", []).append(time.perf_counter())
+    
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _active_profile.get()
+        starts = conn.info.get("profile_start")
+        if profile is None or not starts:
+            return
+        profile.record(statement, time.perf_counter() - starts.pop(), executemany)
+    
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("profile_start"):
+            connection.info["profile_start"].pop()
@@ -5,13 +5,17 @@
 from fastapi import Depends, HTTPException, status, Request, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
 from app.models.user import User
 from app.core.security import verify_token
 from app.core.exceptions import AuthenticationError, AuthorizationError
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, AsyncIterator
+import secrets
 import uuid
 
 security = HTTPBearer()
+metrics_security = HTTPBearer(auto_error=False)
 
 # ================================
 # BASIC DEPENDENCIES
@@ -21,6 +25,53 @@ def get_db(request: Request) -> Session:
     """Dependency für Database Session aus Middleware"""
     return request.state.db
 
+def _release_request_db(request: Request):
+    """
+    Gibt die Connection der sync Request-Session (User-Lookup, Permission-Checks) zurück,
+    bevor der Endpoint auf asyncpg wartet - sonst hält jeder laufende async Request eine
+    Connection aus beiden Pools. Der async Parameter muss daher nach den Auth-Dependencies stehen.
+    """
+    from app.core.database import release_connection
+    db = getattr(request.state, 'db', None)
+    if db is not None:
+        release_connection(db)
+
+async def get_async_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """
+    Dependency für AsyncSession (asyncpg) mit demselben Tenant-Kontext wie get_db.
+    
+    Bestehende Service-Funktionen laufen über db.run_sync(...) und damit non-blocking;
+    ORM-Objekte nur innerhalb von run_sync anfassen (Lazy Loads brauchen den Greenlet).
+    """
+    from app.core.database import AsyncSessionLocal, set_tenant_context_async
+    
+    _release_request_db(request)
+    async with AsyncSessionLocal() as db:
+        db.info["user_id"] = getattr(request.state, 'user_id', None)
+        await set_tenant_context_async(db, getattr(request.state, 'tenant_id', None))
+        yield db
+
+def get_read_db(request: Request) -> Session:
+    """
+    Dependency für read-only Endpoints: SELECTs gehen auf die Read Replica (falls konfiguriert
+    und der Lag im Limit ist). Schreibt die Session doch, liest sie ab da vom Primary.
+    """
+    from app.core.db_routing import use_replica
+    return use_replica(request.state.db, getattr(request.state, 'user_id', None))
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    """Wie get_async_db, aber mit Replica-Routing wie get_read_db"""
+    from app.core.database import AsyncSessionLocal, set_tenant_context_async
+    from app.core.db_routing import use_replica
+    
+    _release_request_db(request)
+    async with AsyncSessionLocal() as db:
+        user_id = getattr(request.state, 'user_id', None)
+        db.info["user_id"] = user_id
+        await set_tenant_context_async(db, getattr(request.state, 'tenant_id', None))
+        use_replica(db.sync_session, user_id)
+        yield db
+
 def get_current_tenant_id(request: Request) -> Optional[uuid.UUID]:
     """Dependency für aktuelle Tenant-ID"""
     return getattr(request.state, 'tenant_id', None)
@@ -87,6 +138,15 @@ async def get_super_admin_user(
         raise AuthorizationError("Super admin access required")
     return current_user
 
+async def require_metrics_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_security)
+) -> None:
+    """Dependency für /metrics: statisches Bearer-Token des Scrapers (METRICS_TOKEN)"""
+    if not settings.METRICS_TOKEN:
+        raise AuthorizationError("Metrics endpoint is disabled", "METRICS_DISABLED")
+    if credentials is None or not secrets.compare_digest(credentials.credentials, settings.METRICS_TOKEN):
+        raise AuthenticationError("Invalid metrics token")
+
 async def get_tenant_admin_user(
     current_user: User = Depends(get_current_active_user),
     tenant_id: uuid.UUID = Depends(get_current_tenant_id),
@@ -3,9 +3,9 @@
 # ================================
 
 from datetime import datetime, timezone
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
 from contextlib import asynccontextmanager
@@ -19,8 +19,13 @@ from app.core.middleware import (
     SecurityHeadersMiddleware,
     RateLimitMiddleware,
     HealthCheckMiddleware,
-    TimeoutMiddleware
+    TimeoutMiddleware,
+    MetricsMiddleware,
+    SQLProfilerMiddleware,
+    CompressionMiddleware
 )
+from app.core.responses import FastJSONResponse
+from app.dependencies import require_metrics_token
 
 # API Routes - UPDATED TO INCLUDE RBAC
 from app.api.v1 import auth, users, tenants, projects, properties, cities, exposes, admin, rbac, investagon, user_preferences, user_team, feedback, reservations, fees, documents
@@ -62,6 +67,18 @@ async def startup_tasks():
     # Initialize database
     await initialize_database()
     
+    # Start write-behind audit log writer
+    from app.utils.audit import audit_writer
+    audit_writer.start()
+    
+    # Start periodic metrics snapshots (aggregation across workers)
+    from app.core.metrics import metrics
+    metrics.start()
+    
+    # Start read replica lag monitor (no-op without DATABASE_REPLICA_URL)
+    from app.core.db_routing import replica_monitor
+    replica_monitor.start()
+    
     # Create super admin if not exists
     await create_initial_super_admin()
     
@@ -86,9 +103,27 @@ async def shutdown_tasks():
     # Stop background scheduler
     await stop_background_scheduler()
     
+    # Stop PDF optimizer worker processes
+    from app.utils.pdf_optimizer import PDFOptimizer
+    PDFOptimizer.shutdown()
+    
+    # Flush pending audit events before the engine is disposed
+    from app.utils.audit import audit_writer
+    audit_writer.stop()
+    
+    # Write final metrics snapshot of this worker
+    from app.core.metrics import metrics
+    metrics.stop()
+    
     # Close database connections
-    from app.core.database import engine
+    from app.core.db_routing import replica_monitor
+    replica_monitor.stop()
+    from app.core.database import engine, async_engine, replica_engine, async_replica_engine
     engine.dispose()
+    await async_engine.dispose()
+    if replica_engine is not None:
+        replica_engine.dispose()
+        await async_replica_engine.dispose()
     
     logger.info("Application shutdown complete")
 
@@ -350,6 +385,7 @@ app = FastAPI(
     description="Blackvesto - Real Estate Investment Platform API",
     docs_url="/docs" if settings.DEBUG else None,  # Disable docs in production
     redoc_url="/redoc" if settings.DEBUG else None,
+    default_response_class=FastJSONResponse,  # orjson, falls installiert
     lifespan=lifespan
 )
 
@@ -357,7 +393,16 @@ app = FastAPI(
 # MIDDLEWARE CONFIGURATION
 # ================================
 
-# Request Timeout (first - to prevent infinite loops)
+# Response Compression (first/innermost - sees the route's response before BaseHTTPMiddleware re-chunks it)
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        gzip_level=settings.RESPONSE_COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY
+    )
+
+# Request Timeout (to prevent infinite loops)
 app.add_middleware(TimeoutMiddleware, timeout_seconds=30)
 
 # Security Headers
@@ -373,7 +418,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
     allow_headers=["*"],
-    expose_headers=["X-Request-ID", "X-Process-Time"]
+    expose_headers=["X-Request-ID", "X-Process-Time", "X-SQL-Profile"]
 )
 
 # Health Check Bypass (before audit middleware)
@@ -382,9 +427,15 @@ app.add_middleware(HealthCheckMiddleware)
 # Audit Logging
 app.add_middleware(AuditMiddleware)
 
-# Tenant Context (last middleware)
+# Tenant Context
 app.add_middleware(TenantMiddleware)
 
+# SQL Profiling (opt-in, includes the tenant lookup queries)
+app.add_middleware(SQLProfilerMiddleware)
+
+# Request Metrics (outermost - measures the full request incl. all middleware)
+app.add_middleware(MetricsMiddleware)
+
 # ================================
 # EXCEPTION HANDLERS
 # ================================
@@ -481,6 +532,15 @@ async def health_check():
         "version": "1.0.0"
     }
 
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def prometheus_metrics(_: None = Depends(require_metrics_token)):
+    """Prometheus metrics, aggregated across all workers (Bearer METRICS_TOKEN)"""
+    from app.core.metrics import metrics
+    return PlainTextResponse(
+        metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 @app.get("/health/detailed", tags=["Health"])
 async def detailed_health_check():
     """Detailed health check with dependencies"""
@@ -1,5 +1,5 @@
-from typing import Union
-from app.models.business import ProjectDocument, PropertyDocument
+from typing import List, Union
+from app.models.business import ProjectDocument, PropertyDocument, Property
 from app.schemas.document import ProjectDocumentResponse, PropertyDocumentResponse, DocumentResponse
 
 
@@ -37,4 +37,28 @@ def map_document_to_response(
         return PropertyDocumentResponse(
             **base_data,
             property_id=document.property_id
-        )
\ No newline at end of file
+        )
+
+
+def map_property_documents(prop: Property) -> List[PropertyDocumentResponse]:
+    """
+    Map a property's documents plus the inherited project documents (is_inherited=True),
+    ordered like DocumentService.list_property_documents. Expects Property.documents
+    and Project.documents to be loaded.
+    """
+    documents = list(prop.documents)
+    if prop.project:
+        documents.extend(prop.project.documents)
+    documents.sort(key=lambda d: (d.document_type.value, d.display_order, d.uploaded_at))
+    
+    items = []
+    for document in documents:
+        mapped = map_document_to_response(document)
+        if isinstance(document, ProjectDocument):
+            mapped = PropertyDocumentResponse(
+                **mapped.model_dump(exclude={"project_id"}),
+                property_id=prop.id,
+                is_inherited=True
+            )
+        items.append(mapped)
+    return items
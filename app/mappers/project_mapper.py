@@ -7,38 +7,41 @@ from datetime import datetime, timezone
 from app.models.business import Project
 
 
-def map_project_to_overview(proj: Project) -> Dict[str, Any]:
+def visibility_status_from_counts(total: int, active: int, inactive: int) -> Optional[str]:
     """
-    Map a Project ORM object to ProjectOverview response format
+    Visibility status of a project from counts over its properties
     
     Args:
-        proj: Project ORM object with loaded relationships
+        total: Properties with a visibility value
+        active: Properties with visibility 1
+        inactive: Properties with visibility -1 or 0
         
     Returns:
-        Dictionary matching ProjectOverview schema
+        'active', 'inactive', 'mixed' or None if no property has a visibility value
+    """
+    if not total:
+        return None
+    if active:
+        return 'active'
+    if inactive == total:
+        return 'inactive'
+    return 'mixed'
+
+
+def map_project_to_overview(proj: Project, visibility_status: Optional[str] = None) -> Dict[str, Any]:
     """
-    # Calculate visibility status based on contained properties
-    visibility_status = None
-    if hasattr(proj, 'properties') and proj.properties:
-        visibility_values = [p.visibility for p in proj.properties if p.visibility is not None]
-        if visibility_values:
-            if any(v == 1 for v in visibility_values):
-                visibility_status = 'active'
-            elif all(v in [-1, 0] for v in visibility_values):
-                visibility_status = 'inactive'
-            else:
-                visibility_status = 'mixed'
+    Map a Project ORM object to ProjectOverview response format
     
-    # Get thumbnail from first image
-    thumbnail_url = None
-    if proj.images:
-        sorted_images = sorted(
-            proj.images,
-            key=lambda x: (x.display_order, x.created_at if x.created_at else datetime.min.replace(tzinfo=timezone.utc))
-        )
-        if sorted_images:
-            thumbnail_url = sorted_images[0].image_url
+    Uses the maintained cover_image_url and property_count columns, so no
+    relationships need to be loaded.
     
+    Args:
+        proj: Project ORM object
+        visibility_status: Precomputed visibility status (see visibility_status_from_counts)
+        
+    Returns:
+        Dictionary matching ProjectOverview schema
+    """
     overview_data = {
         "id": proj.id,
         "name": proj.name,
@@ -61,11 +64,12 @@ def map_project_to_overview(proj: Project) -> Dict[str, Any]:
         "max_rental_yield": proj.max_rental_yield,
         "min_initial_maintenance_expenses": proj.min_initial_maintenance_expenses,
         "max_initial_maintenance_expenses": proj.max_initial_maintenance_expenses,
-        "thumbnail_url": thumbnail_url,
-        "property_count": len(proj.properties) if hasattr(proj, 'properties') else 0,
+        "thumbnail_url": proj.cover_image_url,
+        "property_count": proj.property_count,
         "visibility_status": visibility_status,
         "investagon_id": proj.investagon_id,
-        "provision_percentage": proj.provision_percentage
+        "provision_percentage": proj.provision_percentage,
+        "micro_location_summary": proj.micro_location_summary
     }
     
     return overview_data
@@ -137,7 +141,6 @@ def map_project_to_response(proj: Project) -> Dict[str, Any]:
         "max_initial_maintenance_expenses": proj.max_initial_maintenance_expenses,
         "city_id": proj.city_id,
         "investagon_id": proj.investagon_id,
-        "investagon_data": proj.investagon_data,
         "tenant_id": proj.tenant_id,
         "created_by": proj.created_by,
         "updated_by": proj.updated_by,
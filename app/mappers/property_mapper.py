@@ -2,11 +2,43 @@
 Property Mapper Module
 Handles conversion of Property ORM objects to response dictionaries
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
 from app.models.business import Property, Project
 
 
+def _overview_figures(
+    purchase_price, parking, furniture, rent, rent_parking
+) -> Tuple[float, float, Optional[float]]:
+    """
+    Total purchase price, total monthly rent and gross rental yield of a property
+    
+    SQL counterpart for filtering/sorting: PropertyService._gross_rental_yield_expression
+    
+    Returns:
+        (price incl. parking and furniture, rent incl. parking, yield in percent or None)
+    """
+    # Calculate total purchase price including parking and furniture
+    total_purchase_price = float(purchase_price or 0)
+    if parking:
+        total_purchase_price += float(parking)
+    if furniture:
+        total_purchase_price += float(furniture)
+    
+    # Calculate total monthly rent including parking
+    total_monthly_rent = float(rent or 0)
+    if rent_parking:
+        total_monthly_rent += float(rent_parking)
+    
+    # Calculate gross rental yield (Bruttomietrendite) based on total price and total rent
+    gross_rental_yield = None
+    if total_purchase_price > 0 and total_monthly_rent > 0:
+        annual_rent = total_monthly_rent * 12
+        gross_rental_yield = (annual_rent / total_purchase_price) * 100
+    
+    return total_purchase_price, total_monthly_rent, gross_rental_yield
+
+
 def map_property_to_overview(prop: Property) -> Dict[str, Any]:
     """
     Map a Property ORM object to PropertyOverview response format
@@ -29,23 +61,10 @@ def map_property_to_overview(prop: Property) -> Dict[str, Any]:
         if sorted_project_images:
             thumbnail_url = sorted_project_images[0].image_url
     
-    # Calculate total purchase price including parking and furniture
-    total_purchase_price = float(prop.purchase_price or 0)
-    if prop.purchase_price_parking:
-        total_purchase_price += float(prop.purchase_price_parking)
-    if prop.purchase_price_furniture:
-        total_purchase_price += float(prop.purchase_price_furniture)
-    
-    # Calculate total monthly rent including parking
-    total_monthly_rent = float(prop.monthly_rent or 0)
-    if prop.rent_parking_month:
-        total_monthly_rent += float(prop.rent_parking_month)
-    
-    # Calculate gross rental yield (Bruttomietrendite) based on total price and total rent
-    gross_rental_yield = None
-    if total_purchase_price > 0 and total_monthly_rent > 0:
-        annual_rent = total_monthly_rent * 12
-        gross_rental_yield = (annual_rent / total_purchase_price) * 100
+    total_purchase_price, total_monthly_rent, gross_rental_yield = _overview_figures(
+        prop.purchase_price, prop.purchase_price_parking, prop.purchase_price_furniture,
+        prop.monthly_rent, prop.rent_parking_month
+    )
     
     overview_data = {
         "id": prop.id,
@@ -82,12 +101,62 @@ def map_property_to_overview(prop: Property) -> Dict[str, Any]:
     return overview_data
 
 
-def map_property_to_response(prop: Property) -> Dict[str, Any]:
+def map_property_row_to_overview(row) -> Dict[str, Any]:
+    """
+    Map a projected property row to PropertyOverview response format
+    
+    Same figures as map_property_to_overview, but from the columns selected by
+    PropertyService.list_properties instead of an ORM object with loaded relationships.
+    
+    Args:
+        row: Row with the overview columns, project name/address and thumbnail_url
+        
+    Returns:
+        Dictionary matching PropertyOverview schema
+    """
+    total_purchase_price, total_monthly_rent, gross_rental_yield = _overview_figures(
+        row.purchase_price, row.purchase_price_parking, row.purchase_price_furniture,
+        row.monthly_rent, row.rent_parking_month
+    )
+    
+    return {
+        "id": row.id,
+        "project_id": row.project_id,
+        "project_name": row.project_name,
+        "project_street": row.project_street,
+        "project_house_number": row.project_house_number,
+        "unit_number": row.unit_number,
+        "city": row.city,
+        "state": row.state,
+        "property_type": row.property_type,
+        "purchase_price": total_purchase_price,  # Total including parking and furniture
+        "monthly_rent": total_monthly_rent,  # Total including parking rent
+        "size_sqm": row.size_sqm,
+        "rooms": row.rooms,
+        "floor": row.floor,
+        "investagon_id": row.investagon_id,
+        "active": row.active,
+        "pre_sale": row.pre_sale,
+        "draft": row.draft,
+        "visibility": row.visibility,
+        "initial_maintenance_expenses": row.initial_maintenance_expenses,
+        "thumbnail_url": row.thumbnail_url,
+        "gross_rental_yield": gross_rental_yield
+    }
+
+
+def map_property_to_response(
+    prop: Property,
+    include_project: bool = True,
+    include_city: bool = True
+) -> Dict[str, Any]:
     """
     Map a Property ORM object to full PropertyResponse format
     
     Args:
         prop: Property ORM object with loaded relationships
+        include_project: Map the project (False = project None, not loaded)
+        include_city: Map the project's city_ref (False = city_ref None, not loaded)
         
     Returns:
         Dictionary matching PropertyResponse schema
@@ -175,7 +244,7 @@ def map_property_to_response(prop: Property) -> Dict[str, Any]:
             response_data["net_rental_yield"] = (net_annual_rent / total_purchase_price) * 100
     
     # Add related data
-    if hasattr(prop, 'project') and prop.project:
+    if include_project and hasattr(prop, 'project') and prop.project:
         # Convert project to dict to ensure all required fields are present
         project_dict = {
             "id": prop.project.id,
@@ -222,7 +291,7 @@ def map_property_to_response(prop: Property) -> Dict[str, Any]:
         }
         
         # Add city_ref if it exists
-        if hasattr(prop.project, 'city_ref') and prop.project.city_ref:
+        if include_city and hasattr(prop.project, 'city_ref') and prop.project.city_ref:
             project_dict["city_ref"] = {
                 "id": prop.project.city_ref.id,
                 "name": prop.project.city_ref.name,
@@ -22,7 +22,8 @@ from app.models.business import (
     ExposeTemplate, ExposeLink, ExposeLinkView,
     InvestagonSync, Project, ProjectImage,
     Reservation, ReservationStatusHistory,
-    ProjectDocument, PropertyDocument, DocumentType
+    ProjectDocument, PropertyDocument, DocumentType,
+    MediaAsset
 )
 from app.models.audit import AuditLog, SuperAdminSession
 from app.models.google_maps_cache import GoogleGeocodingCache, GooglePlacesCache, GoogleDistanceCache
@@ -56,6 +57,7 @@ __all__ = [
     "ProjectDocument",
     "PropertyDocument",
     "DocumentType",
+    "MediaAsset",
     "Reservation",
     "ReservationStatusHistory",
     "AuditLog", 
@@ -2,16 +2,31 @@
 # AUDIT & MONITORING MODELS (models/audit.py)
 # ================================
 
-from sqlalchemy import Column, String, Text, JSON, ForeignKey, DateTime
+from sqlalchemy import Column, String, Text, JSON, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, INET
 from app.models.base import Base
-from datetime import datetime
+from datetime import datetime, timezone
 
 class AuditLog(Base):
-    """Audit Log für alle wichtigen Aktionen"""
+    """
+    Audit Log für alle wichtigen Aktionen
+    
+    Monatlich nach created_at partitioniert (RANGE); Partitionen werden von
+    AuditLogPartitionService angelegt und nach Ablauf der Retention gedroppt.
+    created_at ist daher Teil des Primary Keys.
+    """
     __tablename__ = "audit_logs"
     
+    # Partition key, must be part of the primary key
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False
+    )
+    
     # Foreign Keys
     tenant_id = Column(UUID(as_uuid=True), ForeignKey('tenants.id', ondelete='CASCADE'), nullable=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id', ondelete='SET NULL'), nullable=True)
@@ -35,6 +50,14 @@ class AuditLog(Base):
     user = relationship("User", foreign_keys=[user_id], back_populates="audit_logs")
     impersonating_admin = relationship("User", foreign_keys=[impersonating_super_admin_id])
     
+    __table_args__ = (
+        Index('idx_audit_logs_tenant_created', 'tenant_id', 'created_at'),
+        Index('idx_audit_logs_tenant_action_created', 'tenant_id', 'action', 'created_at'),
+        Index('idx_audit_logs_user_created', 'user_id', 'created_at'),
+        Index('idx_audit_logs_created_brin', 'created_at', postgresql_using='brin'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
     def __repr__(self):
         return f"<AuditLog(action='{self.action}', user='{self.user_id}', tenant='{self.tenant_id}')>"
 
@@ -3,7 +3,7 @@
 # ================================
 
 from sqlalchemy import Column, String, Text, Integer, Float, Boolean, DateTime, ForeignKey, JSON, Numeric, and_, Index, Enum
-from sqlalchemy.orm import relationship, foreign
+from sqlalchemy.orm import relationship, foreign, deferred
 from sqlalchemy.dialects.postgresql import UUID
 from app.models.base import Base, TenantMixin, AuditMixin
 import uuid
@@ -59,7 +59,9 @@ class Project(Base, TenantMixin, AuditMixin):
     # Additional Information
     description = Column(Text, nullable=True)
     amenities = Column(JSON, nullable=True)  # List of building amenities
-    micro_location_v2 = Column(JSON, nullable=True)  # Enhanced micro location data from Google Maps API
+    # Large JSON payloads are deferred: loaded only by views that return them (undefer)
+    micro_location_v2 = deferred(Column(JSON, nullable=True))  # Enhanced micro location data from Google Maps API
+    micro_location_summary = Column(JSON, nullable=True)  # Location, street view and per-category counts for lists
     
     # Status
     status = Column(String(50), default="available", nullable=False)  # 'available', 'reserved', 'sold'
@@ -74,10 +76,14 @@ class Project(Base, TenantMixin, AuditMixin):
     max_rental_yield = Column(Numeric(5, 2), nullable=True)  # Maximum rental yield in project
     min_initial_maintenance_expenses = Column(Numeric(12, 2), nullable=True)  # Minimum initial maintenance expenses
     max_initial_maintenance_expenses = Column(Numeric(12, 2), nullable=True)  # Maximum initial maintenance expenses
+    property_count = Column(Integer, default=0, nullable=False)  # Number of properties in project
+    
+    # Cover Image (maintained from project_images, see services/cover_image_service.py)
+    cover_image_url = Column(Text, nullable=True)  # First image by display_order
     
     # External Reference
     investagon_id = Column(String(255), nullable=True, unique=True)  # Investagon project ID
-    investagon_data = Column(JSON, nullable=True)  # Store full API response
+    investagon_data = deferred(Column(JSON, nullable=True))  # Store full API response
     
     # Relationships
     tenant = relationship("Tenant")
@@ -118,6 +124,7 @@ class ProjectImage(Base, TenantMixin, AuditMixin):
     mime_type = Column(String(100), nullable=True)
     width = Column(Integer, nullable=True)
     height = Column(Integer, nullable=True)
+    media_asset_id = Column(UUID(as_uuid=True), ForeignKey('media_assets.id', ondelete='SET NULL'), nullable=True, index=True)
     
     # Relationships
     project = relationship("Project", back_populates="images")
@@ -199,9 +206,14 @@ class Property(Base, TenantMixin, AuditMixin):
     draft = Column(Integer, nullable=True)  # 0 or 1 from Investagon
     visibility = Column(Integer, nullable=True)  # Visibility value from Investagon (-1 to 1)
     
+    # Cover Image (maintained from property_images/project cover, see services/cover_image_service.py)
+    cover_image_url = Column(Text, nullable=True)  # First property image by display_order
+    cover_thumbnail_url = Column(Text, nullable=True)  # List thumbnail: own cover, else project cover
+    
     # Investagon Integration
     investagon_id = Column(String(255), nullable=True, unique=True)
-    investagon_data = Column(JSON, nullable=True)  # Cache for additional API data
+    investagon_data = deferred(Column(JSON, nullable=True))  # Cache for additional API data
+    investagon_data_hash = Column(String(64), nullable=True)  # SHA-256 of the payload the synced fields were mapped from
     last_sync = Column(DateTime, nullable=True)
     
     # Relationships
@@ -259,6 +271,7 @@ class PropertyImage(Base, TenantMixin, AuditMixin):
     mime_type = Column(String(100), nullable=True)
     width = Column(Integer, nullable=True)
     height = Column(Integer, nullable=True)
+    media_asset_id = Column(UUID(as_uuid=True), ForeignKey('media_assets.id', ondelete='SET NULL'), nullable=True, index=True)
     
     # Relationships
     property = relationship("Property", back_populates="images")
@@ -648,6 +661,7 @@ class ProjectDocument(Base, TenantMixin):
     display_order = Column(Integer, default=0)
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     uploaded_at = Column(DateTime, nullable=False)
+    media_asset_id = Column(UUID(as_uuid=True), ForeignKey("media_assets.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Relationships
     project = relationship("Project", back_populates="documents")
@@ -675,6 +689,7 @@ class PropertyDocument(Base, TenantMixin):
     display_order = Column(Integer, default=0)
     uploaded_by = Column(UUID(as_uuid=True), ForeignKey("users.id"))
     uploaded_at = Column(DateTime, nullable=False)
+    media_asset_id = Column(UUID(as_uuid=True), ForeignKey("media_assets.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Relationships
     property = relationship("Property", back_populates="documents")
@@ -684,6 +699,45 @@ class PropertyDocument(Base, TenantMixin):
         return f"<PropertyDocument(property='{self.property_id}', type='{self.document_type}')>"
 
 
+class MediaAsset(Base, TenantMixin):
+    """Registry of media imported from external sources, keyed by source URL and content hash"""
+    __tablename__ = "media_assets"
+
+    # Source
+    source = Column(String(50), nullable=False, default="investagon")
+    source_id = Column(String(255), nullable=True)  # e.g. Investagon photo/document ID
+    source_url = Column(Text, nullable=False)
+    source_url_hash = Column(String(64), nullable=False)  # SHA-256 of source_url (bounded index key)
+    kind = Column(String(20), nullable=False)  # 'image', 'document'
+
+    # Conditional fetch validators from the last download
+    etag = Column(String(255), nullable=True)
+    last_modified = Column(String(100), nullable=True)
+    last_checked_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Content
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the downloaded bytes
+    mime_type = Column(String(100), nullable=True)
+    file_size = Column(Integer, nullable=True)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+
+    # Stored object
+    url = Column(Text, nullable=True)
+    s3_key = Column(String(500), nullable=True)
+    s3_bucket = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index('idx_media_assets_source_url', 'tenant_id', 'kind', 'source_url_hash', unique=True),
+        Index('idx_media_assets_content_hash', 'tenant_id', 'kind', 'content_hash'),
+        Index('idx_media_assets_source_id', 'tenant_id', 'source', 'source_id'),
+        Index('idx_media_assets_s3_key', 's3_key'),
+    )
+
+    def __repr__(self):
+        return f"<MediaAsset(kind='{self.kind}', source_id='{self.source_id}', hash='{self.content_hash}')>"
+
+
 class PropertyAssignment(Base, TenantMixin, AuditMixin):
     """Property Assignment Model for assigning properties to specific users"""
     __tablename__ = "property_assignments"
@@ -15,6 +15,7 @@ from app.schemas.expose_template_types import (
     SpecialFeatureItem, ExposeHighlight
 )
 from app.schemas.user import UserBasicInfo
+from app.schemas.document import PropertyDocumentResponse
 
 # ================================
 # Project Schemas
@@ -446,6 +447,7 @@ class PropertyResponse(PropertyBase, BaseResponseSchema, TimestampMixin):
     # Include related data
     project: Optional["ProjectResponse"]
     images: List[PropertyImageSchema] = []  # Property-specific images only
+    documents: Optional[List[PropertyDocumentResponse]] = None  # Detail endpoint with include=documents
     
     # Computed fields - these fields are dynamically added in validator
     # We don't define them here to avoid them appearing in OpenAPI schema as nullable
@@ -953,6 +955,7 @@ class ProjectOverview(BaseSchema):
     min_initial_maintenance_expenses: Optional[float]  # Minimum initial maintenance expenses of properties
     max_initial_maintenance_expenses: Optional[float]  # Maximum initial maintenance expenses of properties
     provision_percentage: float  # Base provision percentage for this project
+    micro_location_summary: Optional[Dict[str, Any]] = None  # Location, street view, places per category (full data: /projects/{id}/micro-location)
     
     model_config = ConfigDict(from_attributes=True)
 
@@ -1197,6 +1200,11 @@ class PropertyAssignmentBulkCreate(BaseSchema):
     user_ids: List[UUID] = Field(..., description="List of user IDs to assign properties to")
     notes: Optional[str] = Field(None, description="Optional notes about the assignment")
 
+class PropertyAssignmentBulkDelete(BaseSchema):
+    """Schema for bulk removal of property assignments"""
+    property_ids: List[UUID] = Field(..., description="List of property IDs to unassign")
+    user_ids: List[UUID] = Field(..., description="List of user IDs to remove from the properties")
+
 class PropertyAssignmentListResponse(BaseSchema):
     """Schema for property assignment list responses"""
     assignments: List[PropertyAssignmentResponse]
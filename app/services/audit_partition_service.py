@@ -0,0 +1,144 @@
+# ================================
+# AUDIT LOG PARTITION SERVICE (services/audit_partition_service.py)
+# ================================
+
+from typing import List, Optional
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+import logging
+import re
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogPartitionService:
+    """
+    Maintenance of the monthly RANGE partitions of audit_logs.
+    
+    Partitions are named audit_logs_pYYYYMM and cover [first of month, first of next month).
+    Rows outside all partitions land in audit_logs_default; creating a partition moves
+    them over. Retention drops whole partitions instead of deleting rows.
+    """
+    
+    PARENT_TABLE = "audit_logs"
+    DEFAULT_PARTITION = "audit_logs_default"
+    PARTITION_PATTERN = re.compile(r"^audit_logs_p(\d{4})(\d{2})$")
+    
+    @staticmethod
+    def _month_start(value: date) -> date:
+        return date(value.year, value.month, 1)
+    
+    @staticmethod
+    def _add_months(month: date, count: int) -> date:
+        index = month.year * 12 + month.month - 1 + count
+        return date(index // 12, index % 12 + 1, 1)
+    
+    @staticmethod
+    def partition_name(month: date) -> str:
+        return f"{AuditLogPartitionService.PARENT_TABLE}_p{month.year:04d}{month.month:02d}"
+    
+    @staticmethod
+    def list_partitions(db: Session) -> List[str]:
+        """Names of the attached monthly partitions (default partition excluded)"""
+        rows = db.execute(text("""
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :parent
+            ORDER BY child.relname
+        """), {"parent": AuditLogPartitionService.PARENT_TABLE}).scalars().all()
+        return [name for name in rows if AuditLogPartitionService.PARTITION_PATTERN.match(name)]
+    
+    @staticmethod
+    def ensure_partition(db: Session, month: date) -> bool:
+        """
+        Create the partition for the given month if missing.
+        
+        Rows that already sit in the default partition for that month are moved into the
+        new table before it is attached, otherwise ATTACH would fail.
+        
+        Returns:
+            True if the partition was created
+        """
+        month = AuditLogPartitionService._month_start(month)
+        name = AuditLogPartitionService.partition_name(month)
+        if db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+            return False
+        
+        start = f"{month.isoformat()} 00:00:00+00"
+        end = f"{AuditLogPartitionService._add_months(month, 1).isoformat()} 00:00:00+00"
+        
+        db.execute(text(
+            f"CREATE TABLE {name} (LIKE {AuditLogPartitionService.PARENT_TABLE} "
+            f"INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        ))
+        moved = db.execute(text(f"""
+            WITH moved AS (
+                DELETE FROM {AuditLogPartitionService.DEFAULT_PARTITION}
+                WHERE created_at >= '{start}' AND created_at < '{end}'
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+        """)).rowcount
+        db.execute(text(
+            f"ALTER TABLE {AuditLogPartitionService.PARENT_TABLE} "
+            f"ATTACH PARTITION {name} FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+        
+        logger.info(f"Created audit log partition {name}" + (f" ({moved} rows moved from default)" if moved else ""))
+        return True
+    
+    @staticmethod
+    def ensure_partitions(db: Session, months_ahead: Optional[int] = None) -> List[str]:
+        """Make sure partitions exist for the current month and the next months_ahead months"""
+        if months_ahead is None:
+            months_ahead = settings.AUDIT_LOG_PARTITIONS_AHEAD
+        
+        current = AuditLogPartitionService._month_start(datetime.now(timezone.utc).date())
+        created = []
+        for offset in range(months_ahead + 1):
+            month = AuditLogPartitionService._add_months(current, offset)
+            if AuditLogPartitionService.ensure_partition(db, month):
+                created.append(AuditLogPartitionService.partition_name(month))
+        return created
+    
+    @staticmethod
+    def drop_expired_partitions(db: Session, retention_days: Optional[int] = None) -> List[str]:
+        """
+        Drop partitions whose whole range is older than the retention period.
+        
+        A partition is only dropped once its upper bound has passed the cutoff, so at most
+        one month more than retention_days is kept.
+        """
+        if retention_days is None:
+            retention_days = settings.AUDIT_LOG_RETENTION_DAYS
+        if retention_days <= 0:
+            return []
+        
+        cutoff = (datetime.now(timezone.utc) - timedelta(days=retention_days)).date()
+        dropped = []
+        
+        for name in AuditLogPartitionService.list_partitions(db):
+            match = AuditLogPartitionService.PARTITION_PATTERN.match(name)
+            month = date(int(match.group(1)), int(match.group(2)), 1)
+            if AuditLogPartitionService._add_months(month, 1) > cutoff:
+                continue
+            
+            db.execute(text(f"ALTER TABLE {AuditLogPartitionService.PARENT_TABLE} DETACH PARTITION {name}"))
+            db.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+            logger.info(f"Dropped expired audit log partition {name}")
+        
+        # Stray rows in the default partition (should normally be empty)
+        stray = db.execute(
+            text(f"DELETE FROM {AuditLogPartitionService.DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+            {"cutoff": datetime(cutoff.year, cutoff.month, cutoff.day, tzinfo=timezone.utc)}
+        ).rowcount
+        if stray:
+            logger.info(f"Deleted {stray} expired rows from {AuditLogPartitionService.DEFAULT_PARTITION}")
+        
+        return dropped
@@ -8,8 +8,10 @@ from app.models.tenant import Tenant
 from app.core.security import verify_password, get_password_hash, create_access_token, create_refresh_token, generate_reset_token
 from app.schemas.user import UserCreate
 from app.core.exceptions import AppException, AuthenticationError, AuthorizationError
+from app.core.database import released_connection
 from app.utils.audit import AuditLogger
 from datetime import datetime, timedelta, timezone
+import asyncio
 import uuid
 import logging
 import secrets
@@ -157,8 +159,12 @@ class AuthService:
             )
             raise AuthenticationError(GENERIC_ERROR_MESSAGE)
         
-        # Password verification
-        if not verify_password(password, user.password_hash):
+        # Password verification (bcrypt im Threadpool, ohne dabei eine DB-Connection zu halten)
+        async with released_connection(db):
+            password_valid = await asyncio.get_running_loop().run_in_executor(
+                None, verify_password, password, user.password_hash
+            )
+        if not password_valid:
             # Increment failed login attempts
             user.failed_login_attempts += 1
             
@@ -4,9 +4,10 @@
 
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, func
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
+import logging
 
 from app.models.business import City, CityImage
 from app.models.user import User
@@ -14,15 +15,208 @@ from app.schemas.business import (
     CityCreate, CityUpdate,
     CityImageSchema
 )
+from app.config import settings
+from app.core.cache_invalidation import CommitScopedInvalidator
 from app.core.exceptions import AppException
+from app.utils import SimpleCache
 from app.utils.audit import AuditLogger
 from app.services.rbac_service import RBACService
 
 audit_logger = AuditLogger()
+logger = logging.getLogger(__name__)
+
+# Shared per-tenant city indexes of this worker; see CityIndex
+_city_index_cache = SimpleCache(default_ttl=settings.CITY_INDEX_TTL_SECONDS)
+_city_index_invalidator = CommitScopedInvalidator(_city_index_cache, lambda tenant_id: (f"city_index:{tenant_id}",))
+
+
+class CityResolver:
+    """In-memory name/state index of a tenant's cities.
+
+    Loads ``(id, name, state)`` for all cities of the tenant with a single
+    query and resolves lookups case-insensitively without further round-trips.
+    Cities created through the resolver are added to the index, so a sync
+    touching hundreds of units in the same city hits the database once.
+    """
+
+    def __init__(self, db: Session, tenant_id: UUID):
+        self.db = db
+        self.tenant_id = tenant_id
+        self._by_name_state: Dict[Tuple[str, str], UUID] = {}
+        self._by_name: Dict[str, UUID] = {}
+        self._loaded = False
+
+    @staticmethod
+    def normalize(value: Optional[str]) -> str:
+        """Normalize a city or state name for matching (mirrors SQL lower(trim(...)))"""
+        return (value or "").strip().lower()
+
+    @staticmethod
+    def match_clause(city_name: str, state: Optional[str] = None):
+        """SQL filter with the same matching rules as the in-memory index"""
+        clause = func.lower(func.trim(City.name)) == CityResolver.normalize(city_name)
+        if state is not None:
+            clause = and_(clause, func.lower(func.trim(City.state)) == CityResolver.normalize(state))
+        return clause
+
+    def load(self) -> "CityResolver":
+        """Preload the tenant's cities into the index"""
+        rows = self.db.query(City.id, City.name, City.state).filter(
+            City.tenant_id == self.tenant_id
+        ).order_by(City.created_at).all()
+
+        self._by_name_state.clear()
+        self._by_name.clear()
+        for city_id, name, state in rows:
+            self._add(city_id, name, state)
+
+        self._loaded = True
+        logger.debug(f"City index loaded for tenant {self.tenant_id}: {len(rows)} cities")
+        return self
+
+    def _add(self, city_id: UUID, name: str, state: str) -> None:
+        name_key = self.normalize(name)
+        # First city wins, matching the .first() semantics of the previous queries
+        self._by_name_state.setdefault((name_key, self.normalize(state)), city_id)
+        self._by_name.setdefault(name_key, city_id)
+
+    def register(self, city: City) -> None:
+        """Add a newly created or externally loaded city to the index"""
+        self._add(city.id, city.name, city.state)
+
+    def resolve(self, city_name: str, state: Optional[str] = None) -> Optional[UUID]:
+        """Return the city ID for name (and state, if given) or None"""
+        if not self._loaded:
+            self.load()
+
+        name_key = self.normalize(city_name)
+        if state is None:
+            return self._by_name.get(name_key)
+        return self._by_name_state.get((name_key, self.normalize(state)))
+
+    def resolve_or_create(
+        self,
+        city_name: str,
+        state: str,
+        user_id: UUID,
+        country: str = "Deutschland"
+    ) -> Optional[UUID]:
+        """Resolve a city by name and state, creating it when it does not exist yet"""
+        city_id = self.resolve(city_name, state)
+        if city_id:
+            return city_id
+
+        try:
+            new_city = City(
+                tenant_id=self.tenant_id,
+                name=city_name,
+                state=state,
+                country=country,
+                created_by=user_id
+            )
+            self.db.add(new_city)
+            self.db.flush()  # Get the ID
+            self.register(new_city)
+            _city_index_invalidator.invalidate(self.db, self.tenant_id)
+            return new_city.id
+        except Exception as e:
+            # City might have been created by another transaction - look it up directly
+            logger.warning(f"Failed to create city {city_name}, {state}: {str(e)}. Trying lookup again.")
+            existing_city = self.db.query(City).filter(
+                City.tenant_id == self.tenant_id,
+                self.match_clause(city_name, state)
+            ).first()
+            if existing_city:
+                self.register(existing_city)
+                return existing_city.id
+
+            logger.error(f"Could not create or find city {city_name}, {state}")
+            return None
+
+class CityIndex:
+    """Read-only snapshot of a tenant's cities for lookups on hot read paths.
+
+    Maps normalized name/state (same rules as CityResolver, oldest city wins)
+    to the city ID and its key figures. Snapshots are cached per tenant and
+    dropped when a city of the tenant is created, updated or deleted (after
+    commit); CITY_INDEX_TTL_SECONDS bounds staleness for changes made by other
+    workers. Writers (syncs) keep using CityResolver, which reads the database.
+    """
+
+    def __init__(self, tenant_id: UUID, rows: List[Any]):
+        self.tenant_id = tenant_id
+        self._by_name_state: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            entry = {
+                "city_id": row.id,
+                "name": row.name,
+                "state": row.state,
+                "population": row.population,
+                "population_growth": row.population_growth,
+                "average_income": row.average_income
+            }
+            name_key = CityResolver.normalize(row.name)
+            self._by_name_state.setdefault((name_key, CityResolver.normalize(row.state)), entry)
+            self._by_name.setdefault(name_key, entry)
+
+    @classmethod
+    def load(cls, db: Session, tenant_id: UUID) -> "CityIndex":
+        rows = db.query(
+            City.id,
+            City.name,
+            City.state,
+            City.population,
+            City.population_growth,
+            City.average_income
+        ).filter(
+            City.tenant_id == tenant_id
+        ).order_by(City.created_at).all()
+        logger.debug(f"City index built for tenant {tenant_id}: {len(rows)} cities")
+        return cls(tenant_id, rows)
+
+    def lookup(self, city_name: Optional[str], state: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Index entry for name (and state, if given) or None"""
+        name_key = CityResolver.normalize(city_name)
+        if state is None:
+            return self._by_name.get(name_key)
+        return self._by_name_state.get((name_key, CityResolver.normalize(state)))
+
+    def __len__(self) -> int:
+        return len(self._by_name_state)
+
 
 class CityService:
     """Service for managing city data"""
     
+    @staticmethod
+    def get_city_index(db: Session, tenant_id: UUID) -> CityIndex:
+        """Cached name/state index of the tenant's cities (one query when cold)"""
+        key = f"city_index:{tenant_id}"
+        index = _city_index_cache.get(key)
+        if index is None:
+            index = CityIndex.load(db, tenant_id)
+            _city_index_cache.set(key, index)
+        return index
+    
+    @staticmethod
+    def get_city_for_location(
+        db: Session,
+        tenant_id: UUID,
+        city_name: str,
+        state: Optional[str] = None
+    ) -> Optional[City]:
+        """City (with images) for a property location, resolved through the city index"""
+        entry = CityService.get_city_index(db, tenant_id).lookup(city_name, state)
+        if not entry:
+            return None
+        return db.query(City).options(
+            joinedload(City.images)
+        ).filter(
+            City.id == entry["city_id"],
+            City.tenant_id == tenant_id
+        ).first()
+    
     @staticmethod
     def create_city(
         db: Session,
@@ -66,6 +260,7 @@ class CityService:
             
             db.add(city)
             db.flush()
+            _city_index_invalidator.invalidate(db, city.tenant_id)
             
             # Log activity
             audit_logger.log_business_event(
@@ -127,25 +322,34 @@ class CityService:
         db: Session,
         city_name: str,
         state: str,
-        current_user: User
+        current_user: User,
+        resolver: Optional[CityResolver] = None
     ) -> Optional[City]:
-        """Get a city by name and state"""
+        """Get a city by name and state
+
+        Matching follows CityResolver (case-insensitive, trimmed). When a
+        preloaded resolver is passed, the ID is taken from its index and only
+        the city itself is loaded.
+        """
         try:
             query = db.query(City).options(
                 joinedload(City.images)
             )
-            
+
             # Apply tenant filter if not super admin
             if not current_user.is_super_admin:
                 query = query.filter(City.tenant_id == current_user.tenant_id)
-            
+
+            if resolver is not None:
+                city_id = resolver.resolve(city_name, state)
+                if not city_id:
+                    return None
+                return query.filter(City.id == city_id).first()
+
             city = query.filter(
-                and_(
-                    City.name == city_name,
-                    City.state == state
-                )
+                CityResolver.match_clause(city_name, state)
             ).first()
-            
+
             return city
             
         except Exception as e:
@@ -221,6 +425,7 @@ class CityService:
             city.updated_at = datetime.now(timezone.utc)
             
             db.flush()
+            _city_index_invalidator.invalidate(db, city.tenant_id)
             
             # Log activity
             audit_logger.log_business_event(
@@ -293,6 +498,7 @@ class CityService:
             
             db.delete(city)
             db.flush()
+            _city_index_invalidator.invalidate(db, city.tenant_id)
             
         except AppException:
             raise
@@ -450,10 +656,11 @@ class CityService:
                 Property.state
             ).all()
             
-            # Get city details for each unique city
+            # City details from the tenant's city index instead of one query per group
+            city_index = CityService.get_city_index(db, effective_tenant_id)
             result = []
             for city_name, state, property_count in city_property_counts:
-                city = CityService.get_city_by_name(db, city_name, state, current_user)
+                city = city_index.lookup(city_name, state)
                 
                 city_data = {
                     "city_name": city_name,
@@ -463,10 +670,10 @@ class CityService:
                 
                 if city:
                     city_data.update({
-                        "city_id": str(city.id),
-                        "population": city.population,
-                        "population_growth": city.population_growth,
-                        "average_income": city.average_income,
+                        "city_id": str(city["city_id"]),
+                        "population": city["population"],
+                        "population_growth": city["population_growth"],
+                        "average_income": city["average_income"],
                         "has_details": True
                     })
                 else:
@@ -8,6 +8,8 @@ from colorthief import ColorThief
 import requests
 from PIL import Image
 
+from app.core.metrics import track_outbound
+
 logger = logging.getLogger(__name__)
 
 
@@ -44,7 +46,9 @@ class ColorExtractionService:
         """
         try:
             # Download the image
-            response = requests.get(image_url, timeout=10)
+            with track_outbound("color_extraction") as outbound:
+                response = requests.get(image_url, timeout=10)
+                outbound["status"] = response.status_code
             response.raise_for_status()
             
             # Open image with PIL
@@ -122,7 +126,9 @@ class ColorExtractionService:
         try:
             import re
             
-            response = requests.get(svg_url, timeout=10)
+            with track_outbound("color_extraction") as outbound:
+                response = requests.get(svg_url, timeout=10)
+                outbound["status"] = response.status_code
             response.raise_for_status()
             
             svg_content = response.text
@@ -0,0 +1,156 @@
+# ================================
+# COVER IMAGE SERVICE (services/cover_image_service.py)
+# ================================
+
+from sqlalchemy.orm import Session
+from sqlalchemy import event, func, inspect, or_, select
+from typing import Iterable, Set
+from itertools import chain
+from uuid import UUID
+import logging
+
+from app.models.business import Property, PropertyImage, Project, ProjectImage
+
+logger = logging.getLogger(__name__)
+
+_COVER_REFRESH_KEY = "cover_image_refresh"
+
+# Spalten, die bestimmen, welches Bild das Cover ist
+_IMAGE_COVER_COLUMNS = ("image_url", "display_order", "created_at")
+
+_properties = Property.__table__
+_property_images = PropertyImage.__table__
+_projects = Project.__table__
+_project_images = ProjectImage.__table__
+
+
+def _changed_parent_ids(session, obj, parent_column: str) -> Set[UUID]:
+    """Parent IDs whose cover may change with this image row (old and new parent on a move)"""
+    if obj in session.new or obj in session.deleted:
+        return {getattr(obj, parent_column)}
+    state = inspect(obj)
+    parent_history = state.attrs[parent_column].history
+    if parent_history.has_changes():
+        return set(chain(parent_history.deleted or (), parent_history.added or ()))
+    if any(state.attrs[column].history.has_changes() for column in _IMAGE_COVER_COLUMNS):
+        return {getattr(obj, parent_column)}
+    return set()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_cover_image_refresh(session, flush_context):
+    # new/dirty/deleted zeigen in after_flush noch den Stand vor dem Flush
+    property_ids, project_ids = set(), set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, PropertyImage):
+            property_ids |= _changed_parent_ids(session, obj, "property_id")
+        elif isinstance(obj, ProjectImage):
+            project_ids |= _changed_parent_ids(session, obj, "project_id")
+        elif isinstance(obj, Property) and obj not in session.deleted:
+            # Neue oder umgehängte Properties übernehmen das Cover ihres Projekts
+            if obj in session.new or inspect(obj).attrs.project_id.history.has_changes():
+                property_ids.add(obj.id)
+    
+    property_ids.discard(None)
+    project_ids.discard(None)
+    session.info[_COVER_REFRESH_KEY] = (property_ids, project_ids)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _apply_cover_image_refresh(session, flush_context):
+    property_ids, project_ids = session.info.pop(_COVER_REFRESH_KEY, (set(), set()))
+    if property_ids or project_ids:
+        CoverImageService.refresh(session, property_ids=property_ids, project_ids=project_ids)
+
+
+class CoverImageService:
+    """
+    Denormalized cover fields for list pages.
+    
+    Project.cover_image_url and Property.cover_image_url hold the first image by
+    display_order; Property.cover_thumbnail_url is the property's own cover, else the
+    project's. They are refreshed after every flush that adds, moves, reorders or
+    deletes an image, or adds or moves a property, so list queries read plain columns
+    instead of loading image collections. Project.property_count is kept by
+    ProjectService.recompute_project_rollups.
+    """
+    
+    @staticmethod
+    def refresh(
+        db: Session,
+        property_ids: Iterable[UUID] = (),
+        project_ids: Iterable[UUID] = ()
+    ) -> None:
+        """
+        Recompute cover fields of the given projects (and their properties) and properties.
+        
+        Two set-based UPDATEs on the tables, not the mapped classes: the cover columns
+        don't feed the property stats or filter range caches, so their bulk-statement
+        invalidation must not fire. Does not commit.
+        """
+        property_ids = list(set(property_ids))
+        project_ids = list(set(project_ids))
+        
+        changed_project_ids = []
+        if project_ids:
+            project_cover = select(_project_images.c.image_url).where(
+                _project_images.c.project_id == _projects.c.id
+            ).order_by(
+                _project_images.c.display_order, _project_images.c.created_at, _project_images.c.id
+            ).limit(1).scalar_subquery()
+            
+            changed_project_ids = db.execute(
+                _projects.update()
+                .where(_projects.c.id.in_(project_ids))
+                .where(_projects.c.cover_image_url.is_distinct_from(project_cover))
+                .values(cover_image_url=project_cover, updated_at=_projects.c.updated_at)
+                .returning(_projects.c.id)
+            ).scalars().all()
+        
+        changed_property_ids = []
+        if property_ids or changed_project_ids:
+            own_cover = select(_property_images.c.image_url).where(
+                _property_images.c.property_id == _properties.c.id
+            ).order_by(
+                _property_images.c.display_order, _property_images.c.created_at, _property_images.c.id
+            ).limit(1).scalar_subquery()
+            project_cover = select(_projects.c.cover_image_url).where(
+                _projects.c.id == _properties.c.project_id
+            ).scalar_subquery()
+            thumbnail = func.coalesce(own_cover, project_cover)
+            
+            # Ändert sich das Projekt-Cover, erben alle Properties ohne eigenes Bild das neue
+            targets = []
+            if property_ids:
+                targets.append(_properties.c.id.in_(property_ids))
+            if changed_project_ids:
+                targets.append(_properties.c.project_id.in_(changed_project_ids))
+            
+            changed_property_ids = db.execute(
+                _properties.update()
+                .where(or_(*targets))
+                .where(or_(
+                    _properties.c.cover_image_url.is_distinct_from(own_cover),
+                    _properties.c.cover_thumbnail_url.is_distinct_from(thumbnail)
+                ))
+                .values(
+                    cover_image_url=own_cover,
+                    cover_thumbnail_url=thumbnail,
+                    updated_at=_properties.c.updated_at  # Abgeleitete Felder, keine inhaltliche Änderung
+                )
+                .returning(_properties.c.id)
+            ).scalars().all()
+        
+        # Bereits geladene Objekte dürfen nicht die alten Werte liefern
+        changed = {Project: set(changed_project_ids), Property: set(changed_property_ids)}
+        for obj in list(db.identity_map.values()):
+            if isinstance(obj, Project) and obj.id in changed[Project]:
+                db.expire(obj, ["cover_image_url"])
+            elif isinstance(obj, Property) and obj.id in changed[Property]:
+                db.expire(obj, ["cover_image_url", "cover_thumbnail_url"])
+        
+        if changed_project_ids or changed_property_ids:
+            logger.debug(
+                f"Cover images refreshed for {len(changed_project_ids)} projects, "
+                f"{len(changed_property_ids)} properties"
+            )
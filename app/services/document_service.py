@@ -9,9 +9,11 @@ import io
 
 from app.models.business import ProjectDocument, PropertyDocument, DocumentType, Project, Property
 from app.services.s3_service import S3Service
+from app.services.media_service import MediaRegistry
 from app.utils.audit import AuditLogger
 from app.utils.pdf_optimizer import PDFOptimizer
 from app.core.exceptions import AppException
+from app.core.database import released_connection
 
 audit_logger = AuditLogger()
 
@@ -76,12 +78,13 @@ class DocumentService:
         folder = f"documents/projects/{project_id}/{document_type.value}"
         
         try:
-            s3_result = await s3_service.upload_file(
-                file=file,
-                folder=folder,
-                tenant_id=str(tenant_id),
-                allowed_types=['application/pdf', 'image/png', 'image/jpeg', 'image/jpg']
-            )
+            async with released_connection(db):
+                s3_result = await s3_service.upload_file(
+                    file=file,
+                    folder=folder,
+                    tenant_id=str(tenant_id),
+                    allowed_types=['application/pdf', 'image/png', 'image/jpeg', 'image/jpg']
+                )
         except Exception as e:
             raise AppException(f"Failed to upload file: {str(e)}", status_code=400)
 
@@ -181,12 +184,13 @@ class DocumentService:
         folder = f"documents/properties/{property_id}/{document_type.value}"
         
         try:
-            s3_result = await s3_service.upload_file(
-                file=file,
-                folder=folder,
-                tenant_id=str(tenant_id),
-                allowed_types=['application/pdf', 'image/png', 'image/jpeg', 'image/jpg']
-            )
+            async with released_connection(db):
+                s3_result = await s3_service.upload_file(
+                    file=file,
+                    folder=folder,
+                    tenant_id=str(tenant_id),
+                    allowed_types=['application/pdf', 'image/png', 'image/jpeg', 'image/jpg']
+                )
         except Exception as e:
             raise AppException(f"Failed to upload file: {str(e)}", status_code=400)
 
@@ -324,10 +328,11 @@ class DocumentService:
         if not document:
             raise AppException(f"Document {document_id} not found", status_code=404)
 
-        # Delete from S3
+        # Delete from S3 (imported media may share its stored object with other rows)
         s3_service = S3Service()
         try:
-            await s3_service.delete_file(document.s3_key)
+            if MediaRegistry.release(db, document):
+                await s3_service.delete_file(document.s3_key)
         except Exception as e:
             # Log error but continue with database deletion
             print(f"Failed to delete file from S3: {str(e)}")
@@ -371,10 +376,11 @@ class DocumentService:
         if not document:
             raise AppException(f"Document {document_id} not found", status_code=404)
 
-        # Delete from S3
+        # Delete from S3 (imported media may share its stored object with other rows)
         s3_service = S3Service()
         try:
-            await s3_service.delete_file(document.s3_key)
+            if MediaRegistry.release(db, document):
+                await s3_service.delete_file(document.s3_key)
         except Exception as e:
             # Log error but continue with database deletion
             print(f"Failed to delete file from S3: {str(e)}")
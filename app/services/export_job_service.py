@@ -0,0 +1,77 @@
+# ================================
+# EXPORT JOB SERVICE (services/export_job_service.py)
+# ================================
+
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, Iterable, Iterator, Tuple, BinaryIO
+from datetime import datetime, timedelta, timezone
+import tempfile
+import threading
+import zlib
+
+from app.config import settings
+from app.core.exceptions import AppException
+
+GZIP_MEDIA_TYPE = "application/gzip"
+
+FLUSH_BYTES = 64 * 1024  # Zeilen sammeln, bevor ein Chunk an den Client geht
+JOB_RETENTION = timedelta(hours=24)
+
+
+def gzip_compressor():
+    """Incremental gzip encoder for export streams"""
+    return zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip-Container
+
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = gzip_compressor()
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+@contextmanager
+def spooled(chunks: Iterable[bytes]) -> Iterator[Tuple[BinaryIO, int]]:
+    """
+    Write an encoded export to a temp file (in memory up to EXPORT_SPOOL_MB, then on disk)
+    and hand it over rewound, with its size, for an upload.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_MB * 1024 * 1024) as spool:
+        for chunk in chunks:
+            spool.write(chunk)
+        size = spool.tell()
+        spool.seek(0)
+        yield spool, size
+
+
+class ExportJobRegistry:
+    """
+    Export jobs of this worker, keyed by job ID.
+    
+    Holds progress only; the results live in S3, so other workers derive a job's state
+    from the objects there. Finished jobs are forgotten after JOB_RETENTION.
+    """
+    
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def add(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            running = self._jobs.get(job["job_id"])
+            if running and running["status"] in ("pending", "running"):
+                raise AppException("Export job is already running", 409, "EXPORT_JOB_RUNNING")
+            
+            # Abgeschlossene Jobs nach der Aufbewahrungszeit vergessen
+            for stale_id, stale in list(self._jobs.items()):
+                if stale["completed_at"] and now - stale["completed_at"] > JOB_RETENTION:
+                    del self._jobs[stale_id]
+            
+            self._jobs[job["job_id"]] = job
+        return job
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
@@ -406,6 +406,7 @@ class ExposeService:
                 joinedload(ExposeLink.property).joinedload(Property.images),
                 joinedload(ExposeLink.property).joinedload(Property.project).joinedload(Project.city_ref),
                 joinedload(ExposeLink.property).joinedload(Property.project).joinedload(Project.images),
+                joinedload(ExposeLink.property).joinedload(Property.project).undefer(Project.micro_location_v2),
                 joinedload(ExposeLink.template)
             ).filter(
                 ExposeLink.link_id == link_id
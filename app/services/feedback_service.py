@@ -5,6 +5,7 @@ from app.models.user import User
 from app.schemas.feedback import FeedbackRequest, FeedbackResponse
 from app.core.exceptions import AppException
 from app.config import settings
+from app.core.metrics import http_client
 
 
 class FeedbackService:
@@ -29,7 +30,7 @@ class FeedbackService:
             body = self._format_issue_body(feedback, current_user)
 
             # Create GitHub issue using httpx
-            async with httpx.AsyncClient() as client:
+            async with http_client("github") as client:
                 response = await client.post(
                     f"https://api.github.com/repos/{self.github_owner}/{self.github_repo}/issues",
                     headers={
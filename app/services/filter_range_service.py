@@ -0,0 +1,179 @@
+# ================================
+# FILTER RANGE SERVICE (services/filter_range_service.py)
+# ================================
+
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func, case, event, inspect, select
+from typing import Optional, Dict, Any, Tuple
+from itertools import chain
+from uuid import UUID
+import logging
+
+from app.config import settings
+from app.core.cache_invalidation import CommitScopedInvalidator
+from app.models.business import Property, Project
+from app.utils import SimpleCache
+
+logger = logging.getLogger(__name__)
+
+# Min/Max der Filter-Slider pro Tenant, beide Sichtbarkeitsklassen in einem Eintrag
+_filter_range_cache = SimpleCache(default_ttl=settings.FILTER_RANGES_TTL_SECONDS)
+# Property-Sichtbarkeit bestimmt auch die Projekt-Ranges der Sales-Klasse
+_filter_range_invalidator = CommitScopedInvalidator(
+    _filter_range_cache,
+    lambda tenant_id: (f"filter_ranges:properties:{tenant_id}", f"filter_ranges:projects:{tenant_id}")
+)
+# insert()/update()/delete() ohne Flush (Syncs, Projekt-Aggregate)
+_filter_range_invalidator.track_bulk_statements(Property, Project)
+
+# Spalten, deren Änderung die Ranges verschieben kann
+_PROPERTY_RANGE_COLUMNS = (
+    "purchase_price", "purchase_price_parking", "purchase_price_furniture",
+    "monthly_rent", "rent_parking_month", "size_sqm", "rooms",
+    "visibility", "project_id", "tenant_id"
+)
+_PROJECT_RANGE_COLUMNS = (
+    "min_price", "max_price", "min_rental_yield", "max_rental_yield",
+    "construction_year", "tenant_id"
+)
+
+# Sichtbarkeitsklassen: "admin" sieht alles, "sales" nur sichtbare Properties (visibility == 1)
+VISIBILITY_CLASSES = ("admin", "sales")
+
+
+def _affects_ranges(session, obj, columns) -> bool:
+    if obj in session.new or obj in session.deleted:
+        return True
+    state = inspect(obj)
+    return any(state.attrs[column].history.has_changes() for column in columns)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_filter_range_invalidations(session, flush_context):
+    # new/dirty/deleted zeigen in after_flush noch den Stand vor dem Flush
+    tenant_ids = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Property) and _affects_ranges(session, obj, _PROPERTY_RANGE_COLUMNS):
+            tenant_ids.add(obj.tenant_id)
+        elif isinstance(obj, Project) and _affects_ranges(session, obj, _PROJECT_RANGE_COLUMNS):
+            tenant_ids.add(obj.tenant_id)
+    if tenant_ids:
+        _filter_range_invalidator.invalidate(session, *tenant_ids)
+
+
+class FilterRangeService:
+    """
+    Precomputed min/max ranges for the property and project list filters.
+    
+    Ranges are computed per tenant for both visibility classes in one statement and
+    kept until a committed write touches a column they depend on (prices, rents,
+    size, rooms, visibility) or FILTER_RANGES_TTL_SECONDS pass. Min/max can't be
+    shrunk without a rescan, so a relevant write drops the tenant's entry and the
+    next read recomputes it.
+    """
+    
+    @staticmethod
+    def visibility_class(db: Session, current_user) -> str:
+        """Visibility class of the user: admins and property managers see all properties"""
+        if current_user.is_super_admin:
+            return "admin"
+        from app.dependencies import check_user_permission
+        if check_user_permission(db, current_user.id, current_user.tenant_id, "properties", "update"):
+            return "admin"
+        return "sales"
+    
+    @staticmethod
+    def get_property_ranges(db: Session, tenant_id: UUID, visibility_class: str) -> Dict[str, Optional[float]]:
+        """min_/max_ price, size, rooms and rental yield of the tenant's properties"""
+        key = f"filter_ranges:properties:{tenant_id}"
+        ranges = _filter_range_cache.get(key)
+        if ranges is None:
+            ranges = FilterRangeService._compute_property_ranges(db, tenant_id)
+            _filter_range_cache.set(key, ranges)
+        return ranges[visibility_class]
+    
+    @staticmethod
+    def get_project_ranges(db: Session, tenant_id: UUID, visibility_class: str) -> Dict[str, Optional[float]]:
+        """min_/max_ price, rental yield and construction year of the tenant's projects"""
+        key = f"filter_ranges:projects:{tenant_id}"
+        ranges = _filter_range_cache.get(key)
+        if ranges is None:
+            ranges = FilterRangeService._compute_project_ranges(db, tenant_id)
+            _filter_range_cache.set(key, ranges)
+        return ranges[visibility_class]
+    
+    @staticmethod
+    def _range_columns(columns: Dict[str, Tuple[Any, Any]], sales_condition) -> list:
+        """min/max per column and visibility class, labeled <class>_<min|max>_<name>"""
+        aggregates = []
+        for visibility_class in VISIBILITY_CLASSES:
+            for name, (min_source, max_source) in columns.items():
+                for bound, expression in (("min", func.min(min_source)), ("max", func.max(max_source))):
+                    if visibility_class == "sales":
+                        expression = expression.filter(sales_condition)
+                    aggregates.append(expression.label(f"{visibility_class}_{bound}_{name}"))
+        return aggregates
+    
+    @staticmethod
+    def _to_ranges(row, columns: Dict[str, Tuple[Any, Any]]) -> Dict[str, Dict[str, Optional[float]]]:
+        ranges = {}
+        for visibility_class in VISIBILITY_CLASSES:
+            ranges[visibility_class] = {}
+            for name in columns:
+                for bound in ("min", "max"):
+                    value = getattr(row, f"{visibility_class}_{bound}_{name}")
+                    ranges[visibility_class][f"{bound}_{name}"] = float(value) if value is not None else None
+        return ranges
+    
+    @staticmethod
+    def _compute_property_ranges(db: Session, tenant_id: UUID) -> Dict[str, Dict[str, Optional[float]]]:
+        rental_yield = case(
+            (
+                and_(Property.purchase_price > 0, Property.monthly_rent > 0),
+                ((Property.monthly_rent + func.coalesce(Property.rent_parking_month, 0)) * 12 * 100.0) /
+                (Property.purchase_price + func.coalesce(Property.purchase_price_parking, 0) + func.coalesce(Property.purchase_price_furniture, 0))
+            ),
+            else_=None
+        )
+        columns = {
+            "price": (Property.purchase_price, Property.purchase_price),
+            "size": (Property.size_sqm, Property.size_sqm),
+            "rooms": (Property.rooms, Property.rooms),
+            "yield": (rental_yield, rental_yield)
+        }
+        
+        row = db.query(
+            *FilterRangeService._range_columns(columns, Property.visibility == 1)
+        ).select_from(Property).filter(
+            Property.tenant_id == tenant_id
+        ).one()
+        
+        logger.debug(f"Property filter ranges computed for tenant {tenant_id}")
+        return FilterRangeService._to_ranges(row, columns)
+    
+    @staticmethod
+    def _compute_project_ranges(db: Session, tenant_id: UUID) -> Dict[str, Dict[str, Optional[float]]]:
+        # Projekte mit mindestens einer sichtbaren Property (Sales-Klasse)
+        visible_projects = select(Property.project_id).where(
+            Property.tenant_id == tenant_id,
+            Property.visibility == 1
+        ).distinct().subquery()
+        
+        # Projekt-Preise und -Renditen stehen schon als min/max-Spalten auf dem Projekt
+        columns = {
+            "price": (Project.min_price, Project.max_price),
+            "rental_yield": (Project.min_rental_yield, Project.max_rental_yield),
+            "construction_year": (Project.construction_year, Project.construction_year)
+        }
+        aggregates = FilterRangeService._range_columns(
+            columns, visible_projects.c.project_id.isnot(None)
+        )
+        
+        row = db.query(*aggregates).select_from(Project).outerjoin(
+            visible_projects, visible_projects.c.project_id == Project.id
+        ).filter(
+            Project.tenant_id == tenant_id
+        ).one()
+        
+        logger.debug(f"Project filter ranges computed for tenant {tenant_id}")
+        return FilterRangeService._to_ranges(row, columns)
@@ -20,6 +20,8 @@ from app.models.google_maps_cache import (
     GoogleDistanceCache
 )
 from app.core.exceptions import AppException
+from app.core.metrics import http_client
+from app.core.database import released_connection
 
 logger = logging.getLogger(__name__)
 
@@ -124,8 +126,9 @@ class GoogleMapsService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, params=params)
+            async with http_client("google_maps") as client:
+                async with released_connection(db):
+                    response = await client.get(url, params=params)
                 response.raise_for_status()
                 data = response.json()
                 
@@ -276,12 +279,13 @@ class GoogleMapsService:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.places_v1_url,
-                    json=request_body,
-                    headers=headers
-                )
+            async with http_client("google_maps") as client:
+                async with released_connection(db):
+                    response = await client.post(
+                        self.places_v1_url,
+                        json=request_body,
+                        headers=headers
+                    )
                 response.raise_for_status()
                 data = response.json()
                 
@@ -444,12 +448,13 @@ class GoogleMapsService:
             }
             
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        self.routes_v2_url,
-                        json=request_body,
-                        headers=headers
-                    )
+                async with http_client("google_maps") as client:
+                    async with released_connection(db):
+                        response = await client.post(
+                            self.routes_v2_url,
+                            json=request_body,
+                            headers=headers
+                        )
                     response.raise_for_status()
                     data = response.json()
                     
@@ -557,6 +562,18 @@ class GoogleMapsService:
         if not geocode_result:
             return None
         
+        return await self.build_micro_location_data(db, geocode_result, force_refresh)
+    
+    async def build_micro_location_data(
+        self,
+        db: Session,
+        geocode_result: Dict,
+        force_refresh: bool = False
+    ) -> Dict:
+        """
+        Build micro location data around an already geocoded location
+        (nearby places per category, distances and street view position)
+        """
         lat = geocode_result["lat"]
         lng = geocode_result["lng"]
         
@@ -638,4 +655,31 @@ class GoogleMapsService:
                     "heading": int(heading)
                 }
         
-        return micro_location_data
\ No newline at end of file
+        return micro_location_data
+    
+    @staticmethod
+    def summarize_micro_location(micro_location_data: Optional[Dict]) -> Optional[Dict]:
+        """
+        Lean summary of micro location data for list views: location, street view and
+        per category the number of places and the shortest walking distance
+        """
+        if not micro_location_data:
+            return None
+        
+        categories = {}
+        for category, places in (micro_location_data.get("categories") or {}).items():
+            walking = [
+                place["distances"]["walking"]["distance_meters"]
+                for place in places
+                if (place.get("distances") or {}).get("walking", {}).get("distance_meters") is not None
+            ]
+            categories[category] = {
+                "count": len(places),
+                "nearest_walking_meters": min(walking) if walking else None
+            }
+        
+        return {
+            "location": micro_location_data.get("location"),
+            "street_view": micro_location_data.get("street_view"),
+            "categories": categories
+        }
@@ -6,7 +6,7 @@ import httpx
 import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 from sqlalchemy import and_, or_
 from uuid import UUID
 import logging
@@ -14,21 +14,41 @@ from decimal import Decimal
 from io import BytesIO
 import io
 import mimetypes
+import json
+import hashlib
 
 from app.config import settings
 from app.core.exceptions import AppException
-from app.models.business import Property, InvestagonSync, PropertyImage, Project, ProjectImage, ProjectDocument, PropertyDocument, DocumentType
+from app.core.metrics import http_client
+from app.core.database import released_connection
+from app.models.business import Property, InvestagonSync, PropertyImage, Project, ProjectImage, ProjectDocument, PropertyDocument, DocumentType, MediaAsset
 from app.models.user import User
 from app.utils.audit import AuditLogger
 from app.utils.location_utils import normalize_state_name
 from app.services.rbac_service import RBACService
+from app.services.city_service import CityResolver
 from app.services.s3_service import get_s3_service
 from app.services.google_maps_service import GoogleMapsService
+from app.services.media_service import MediaRegistry
 from app.utils.pdf_optimizer import PDFOptimizer
 
 logger = logging.getLogger(__name__)
 audit_logger = AuditLogger()
 
+class SyncIdentity:
+    """Compact identity record of an already synced row (no ORM state, no JSON columns)"""
+    __slots__ = ("id", "content_hash", "project_id")
+
+    def __init__(self, id: UUID, content_hash: Optional[str] = None, project_id: Optional[UUID] = None):
+        self.id = id
+        self.content_hash = content_hash
+        self.project_id = project_id
+
+def investagon_content_hash(investagon_data: Dict[str, Any]) -> str:
+    """Stable SHA-256 of an Investagon payload, used to skip unchanged properties"""
+    payload = json.dumps(investagon_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
 class InvestagonAPIClient:
     """Client for interacting with Investagon API"""
     
@@ -52,7 +72,7 @@ class InvestagonAPIClient:
         
     async def get_projects(self) -> List[Dict[str, Any]]:
         """Get all projects from Investagon API"""
-        async with httpx.AsyncClient() as client:
+        async with http_client("investagon") as client:
             try:
                 params = self._get_auth_params()
                 response = await client.get(
@@ -85,7 +105,7 @@ class InvestagonAPIClient:
     
     async def get_project_by_id(self, project_id: str) -> Dict[str, Any]:
         """Get a single project details from Investagon API"""
-        async with httpx.AsyncClient() as client:
+        async with http_client("investagon") as client:
             try:
                 params = self._get_auth_params()
                 response = await client.get(
@@ -123,7 +143,7 @@ class InvestagonAPIClient:
     
     async def get_project_with_photos(self, project_id: str) -> Dict[str, Any]:
         """Get project details including photos from Investagon API"""
-        async with httpx.AsyncClient() as client:
+        async with http_client("investagon") as client:
             try:
                 params = self._get_auth_params()
                 response = await client.get(
@@ -161,7 +181,7 @@ class InvestagonAPIClient:
     
     async def get_property(self, investagon_id: str) -> Dict[str, Any]:
         """Get a single property from Investagon API"""
-        async with httpx.AsyncClient() as client:
+        async with http_client("investagon") as client:
             try:
                 params = self._get_auth_params()
                 response = await client.get(
@@ -200,6 +220,9 @@ class InvestagonAPIClient:
 class InvestagonSyncService:
     """Service for syncing property data from Investagon API"""
     
+    # Number of properties fetched and written per batch during a full sync
+    SYNC_BATCH_SIZE = 50
+    
     def __init__(self, api_client: Optional[InvestagonAPIClient] = None):
         self.api_client = api_client
     
@@ -221,7 +244,7 @@ class InvestagonSyncService:
         )
     
     @staticmethod
-    def _map_investagon_to_project(investagon_data: Dict[str, Any], db: Session = None, tenant_id: UUID = None, user_id: UUID = None, property_address: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _map_investagon_to_project(investagon_data: Dict[str, Any], db: Session = None, tenant_id: UUID = None, user_id: UUID = None, property_address: Dict[str, Any] = None, city_resolver: Optional[CityResolver] = None) -> Dict[str, Any]:
         """Map Investagon API project data to our Project model fields
         
         Args:
@@ -230,9 +253,8 @@ class InvestagonSyncService:
             tenant_id: Tenant ID
             user_id: User ID
             property_address: Optional dict with address info from a property (street, house_number, city, state, zip_code)
+            city_resolver: Optional sync-scoped city index (created on demand if omitted)
         """
-        from app.models.business import City
-        
         # Get project name
         project_name = investagon_data.get("name", "")
         
@@ -279,35 +301,26 @@ class InvestagonSyncService:
         city_id = None
         
         if db and tenant_id and user_id and city_name != "Unknown":
+            if city_resolver is None:
+                city_resolver = CityResolver(db, tenant_id)
+            
             # Look for existing city
-            existing_city = db.query(City).filter(
-                City.tenant_id == tenant_id,
-                City.name.ilike(city_name)
-            ).first()
+            existing_city_id = city_resolver.resolve(city_name)
             
-            if existing_city:
-                city_id = existing_city.id
+            if existing_city_id:
+                city_id = existing_city_id
                 # Update state if we have better info from property
                 if property_address and property_address.get("state"):
                     state_name = normalize_state_name(property_address.get("state")) or property_address.get("state")
             else:
-                # Create new city
-                try:
-                    # Ensure state_name has a valid value
-                    final_state = normalize_state_name(state_name) if state_name else "Unknown"
-                    new_city = City(
-                        tenant_id=tenant_id,
-                        name=city_name,
-                        state=final_state,
-                        country="Deutschland",
-                        created_by=user_id
-                    )
-                    db.add(new_city)
-                    db.flush()
-                    city_id = new_city.id
-                except Exception as e:
-                    logger.warning(f"Failed to create city {city_name}: {str(e)}")
-                    city_id = None
+                # Create new city - ensure state_name has a valid value
+                final_state = normalize_state_name(state_name) if state_name else "Unknown"
+                city_id = city_resolver.resolve_or_create(
+                    city_name,
+                    final_state,
+                    user_id,
+                    country="Deutschland"
+                )
         
         # If we have address info, update the project name to be more descriptive
         if street and house_number:
@@ -341,10 +354,8 @@ class InvestagonSyncService:
         return result
     
     @staticmethod  
-    def _map_investagon_to_property(investagon_data: Dict[str, Any], db: Session = None, tenant_id: UUID = None, user_id: UUID = None, project_id: UUID = None) -> Dict[str, Any]:
+    def _map_investagon_to_property(investagon_data: Dict[str, Any], db: Session = None, tenant_id: UUID = None, user_id: UUID = None, project_id: UUID = None, city_resolver: Optional[CityResolver] = None) -> Dict[str, Any]:
         """Map Investagon API data to our Property model fields"""
-        from app.models.business import City
-        
         # Handle city creation/lookup
         city_id = None
         city_name = investagon_data.get("object_city") or "Unknown"
@@ -360,41 +371,16 @@ class InvestagonSyncService:
             city_name = city_name.strip()
             state_name = state_name.strip()
             
-            # Look for existing city (case-insensitive match)
-            existing_city = db.query(City).filter(
-                City.tenant_id == tenant_id,
-                City.name.ilike(city_name),
-                City.state.ilike(state_name)
-            ).first()
+            if city_resolver is None:
+                city_resolver = CityResolver(db, tenant_id)
             
-            if existing_city:
-                city_id = existing_city.id
-            else:
-                # Create new city with proper error handling
-                try:
-                    new_city = City(
-                        tenant_id=tenant_id,
-                        name=city_name,
-                        state=state_name,
-                        country=investagon_data.get("object_country", "Deutschland"),
-                        created_by=user_id
-                    )
-                    db.add(new_city)
-                    db.flush()  # Get the ID
-                    city_id = new_city.id
-                except Exception as e:
-                    # If city creation fails, try to find it again (might have been created by another transaction)
-                    logger.warning(f"Failed to create city {city_name}, {state_name}: {str(e)}. Trying lookup again.")
-                    existing_city = db.query(City).filter(
-                        City.tenant_id == tenant_id,
-                        City.name.ilike(city_name),
-                        City.state.ilike(state_name)
-                    ).first()
-                    if existing_city:
-                        city_id = existing_city.id
-                    else:
-                        logger.error(f"Could not create or find city {city_name}, {state_name}")
-                        city_id = None
+            # Case-insensitive lookup in the tenant's city index, creating the city if missing
+            city_id = city_resolver.resolve_or_create(
+                city_name,
+                state_name,
+                user_id,
+                country=investagon_data.get("object_country", "Deutschland")
+            )
         
         # Extract numeric values safely
         def safe_decimal(value, default=0):
@@ -507,6 +493,7 @@ class InvestagonSyncService:
             # Investagon Integration
             "investagon_id": str(investagon_data.get("id", "")),
             "investagon_data": investagon_data,  # Store full data for reference
+            "investagon_data_hash": investagon_content_hash(investagon_data),
             "last_sync": datetime.now(timezone.utc)
         }
     
@@ -538,15 +525,23 @@ class InvestagonSyncService:
                         detail="Investagon API credentials not configured for this tenant"
                     )
             
-            # Get property data from Investagon
-            investagon_data = await self.api_client.get_property(investagon_id)
+            # Sync-scoped city index (shared by project and property mapping)
+            city_resolver = CityResolver(db, current_user.tenant_id)
+            
+            # One media registry per sync so shared photos/documents are fetched and stored once
+            media_registry = MediaRegistry(db, current_user.tenant_id)
+            
+            # Get property data from Investagon (no DB connection held while waiting)
+            async with released_connection(db):
+                investagon_data = await self.api_client.get_property(investagon_id)
             
             # Extract the actual investagon_id from the API response
             actual_investagon_id = str(investagon_data.get("id", ""))
             
             # First, we need to find out which project this property belongs to
             # Get all projects to find the one containing this property
-            projects = await self.api_client.get_projects()
+            async with released_connection(db):
+                projects = await self.api_client.get_projects()
             project_obj = None
             
             for project in projects:
@@ -555,7 +550,8 @@ class InvestagonSyncService:
                     continue
                 
                 # Get project details to check if it contains our property
-                project_details = await self.api_client.get_project_by_id(project_id)
+                async with released_connection(db):
+                    project_details = await self.api_client.get_project_by_id(project_id)
                 property_urls = project_details.get("properties") or []
                 
                 # Check if this property is in this project
@@ -581,7 +577,8 @@ class InvestagonSyncService:
                             db, 
                             current_user.tenant_id, 
                             current_user.id, 
-                            property_address=property_address
+                            property_address=property_address,
+                            city_resolver=city_resolver
                         )
                         
                         # Check if project exists
@@ -615,7 +612,7 @@ class InvestagonSyncService:
                         project_photos = project_details.get('photos', [])
                         if project_photos and project_obj:
                             try:
-                                await self.import_project_images(db, project_obj, project_photos, current_user)
+                                await self.import_project_images(db, project_obj, project_photos, current_user, media_registry=media_registry)
                             except Exception as img_error:
                                 logger.error(f"Failed to import project images: {str(img_error)}")
                         
@@ -655,7 +652,7 @@ class InvestagonSyncService:
                         
                         if project_documents and project_obj:
                             try:
-                                await self.import_project_documents(db, project_obj, project_documents, current_user)
+                                await self.import_project_documents(db, project_obj, project_documents, current_user, media_registry=media_registry)
                             except Exception as doc_error:
                                 logger.error(f"Failed to import project documents: {str(doc_error)}")
                         
@@ -684,7 +681,8 @@ class InvestagonSyncService:
                 db, 
                 current_user.tenant_id, 
                 current_user.id,
-                project_id=project_obj.id
+                project_id=project_obj.id,
+                city_resolver=city_resolver
             )
             
             if existing_property:
@@ -727,7 +725,8 @@ class InvestagonSyncService:
             if photos:
                 logger.info(f"Found {len(photos)} photos to import for property {property_obj.id}")
                 imported_images = await self.import_property_images(
-                    db, property_obj, photos, current_user
+                    db, property_obj, photos, current_user,
+                    media_registry=media_registry
                 )
                 logger.info(f"Imported {len(imported_images)} images for property {property_obj.id}")
             
@@ -774,24 +773,18 @@ class InvestagonSyncService:
             if property_documents:
                 try:
                     imported_docs = await self.import_property_documents(
-                        db, property_obj, property_documents, current_user
+                        db, property_obj, property_documents, current_user,
+                        media_registry=media_registry
                     )
                 except Exception as doc_error:
                     logger.error(f"Failed to import property documents: {str(doc_error)}")
             
-            # Update project status based on properties
+            # Update project status and aggregates after syncing property
             from app.services.project_service import ProjectService
-            ProjectService.update_project_status_from_properties(
-                db=db,
-                project_id=property_obj.project_id,
-                tenant_id=current_user.tenant_id
-            )
-            
-            # Update project aggregates after syncing property
-            ProjectService.update_project_aggregates(
+            ProjectService.recompute_project_rollups(
                 db=db,
-                project_id=property_obj.project_id,
-                tenant_id=current_user.tenant_id
+                tenant_id=current_user.tenant_id,
+                project_ids=[property_obj.project_id]
             )
             
             # Refresh micro location for the project
@@ -867,6 +860,12 @@ class InvestagonSyncService:
             total_updated = 0
             errors = []
             
+            # Preload the tenant's cities once for the whole project sync
+            city_resolver = CityResolver(db, current_user.tenant_id).load()
+            
+            # One media registry per sync so shared photos/documents are fetched and stored once
+            media_registry = MediaRegistry(db, current_user.tenant_id)
+            
             # Get existing property mapping for this project
             existing_properties = {}
             properties_query = db.query(Property).filter(
@@ -925,7 +924,8 @@ class InvestagonSyncService:
                                 db,
                                 current_user.tenant_id,
                                 current_user.id,
-                                property_address=property_address
+                                property_address=property_address,
+                                city_resolver=city_resolver
                             )
                             # Update address fields
                             local_project.name = updated_project_data["name"]
@@ -1027,7 +1027,8 @@ class InvestagonSyncService:
                     if local_project:
                         try:
                             imported_images = await self.import_project_images(
-                                db, local_project, project_photos, current_user
+                                db, local_project, project_photos, current_user,
+                                media_registry=media_registry
                             )
                             logger.info(f"Imported {len(imported_images)} project images")
                         except Exception as img_error:
@@ -1073,7 +1074,8 @@ class InvestagonSyncService:
                     if project_documents:
                         try:
                             imported_docs = await self.import_project_documents(
-                                db, local_project, project_documents, current_user
+                                db, local_project, project_documents, current_user,
+                                media_registry=media_registry
                             )
                         except Exception as doc_error:
                             logger.error(f"Failed to import project documents: {str(doc_error)}")
@@ -1103,7 +1105,8 @@ class InvestagonSyncService:
                             db, 
                             current_user.tenant_id, 
                             current_user.id,
-                            project_id=local_project_id
+                            project_id=local_project_id,
+                            city_resolver=city_resolver
                         )
                         
                         # Use the investagon_id from the API response
@@ -1137,7 +1140,8 @@ class InvestagonSyncService:
                         if property_photos:
                             try:
                                 imported_images = await self.import_property_images(
-                                    db, prop, property_photos, current_user
+                                    db, prop, property_photos, current_user,
+                                    media_registry=media_registry
                                 )
                                 logger.info(f"Imported {len(imported_images)} images for property {prop.id}")
                             except Exception as img_error:
@@ -1172,7 +1176,8 @@ class InvestagonSyncService:
                         if property_documents:
                             try:
                                 imported_docs = await self.import_property_documents(
-                                    db, prop, property_documents, current_user
+                                    db, prop, property_documents, current_user,
+                                    media_registry=media_registry
                                 )
                             except Exception as doc_error:
                                 logger.error(f"Failed to import documents for property {prop.id}: {str(doc_error)}")
@@ -1196,14 +1201,15 @@ class InvestagonSyncService:
                     detail=f"Failed to fetch project from Investagon: {str(e)}"
                 )
             
-            # Update project status based on its properties
+            # Update project status and aggregates based on its properties
             from app.services.project_service import ProjectService
             try:
-                ProjectService.update_project_status_from_properties(
-                    db=db,
-                    project_id=local_project_id,
-                    tenant_id=current_user.tenant_id
-                )
+                with db.begin_nested():
+                    ProjectService.recompute_project_rollups(
+                        db=db,
+                        tenant_id=current_user.tenant_id,
+                        project_ids=[local_project_id]
+                    )
                 logger.info(f"Updated project status for project {local_project_id}")
             except Exception as e:
                 logger.warning(f"Failed to update project status for {local_project_id}: {str(e)}")
@@ -1280,38 +1286,48 @@ class InvestagonSyncService:
             total_created = 0
             total_updated = 0
             total_errors = 0
+            total_unchanged = 0
             projects_created = 0
             projects_updated = 0
             errors = []
             
-            # Get existing project mapping
-            existing_projects = {}
-            projects_query = db.query(Project).filter(
-                Project.tenant_id == current_user.tenant_id
-            )
-            for proj in projects_query.all():
-                if proj.investagon_id:
-                    existing_projects[proj.investagon_id] = proj
+            # Preload the tenant's cities once instead of querying per property
+            city_resolver = CityResolver(db, current_user.tenant_id).load()
             
-            # Get existing property mapping
-            existing_properties = {}
+            # One media registry per sync so shared photos/documents are fetched and stored once
+            media_registry = MediaRegistry(db, current_user.tenant_id)
+            
+            # Micro locations are collected during the sync and refreshed once at the end
+            from app.services.project_service import MicroLocationRefreshPlanner
+            micro_location_planner = MicroLocationRefreshPlanner(db, current_user.tenant_id)
+            
+            # Get existing project mapping (investagon_id -> id only, full rows load on demand)
+            existing_projects: Dict[str, SyncIdentity] = {}
+            project_rows = db.query(Project.investagon_id, Project.id).filter(
+                Project.tenant_id == current_user.tenant_id,
+                Project.investagon_id.is_not(None)
+            ).all()
+            for investagon_id, project_pk in project_rows:
+                existing_projects[investagon_id] = SyncIdentity(project_pk)
+            del project_rows
+            
+            # Get existing property mapping (investagon_id -> id, content hash, project)
+            existing_properties: Dict[str, SyncIdentity] = {}
             try:
-                logger.info("Building query for existing properties...")
-                properties_query = db.query(Property).filter(
-                    Property.tenant_id == current_user.tenant_id
-                )
-                if modified_since:
-                    properties_query = properties_query.filter(
-                        Property.investagon_id.is_not(None)
-                    )
-                
-                logger.info("Executing query for existing properties...")
-                all_properties = properties_query.all()
-                logger.info(f"Found {len(all_properties)} existing properties")
-                
-                for prop in all_properties:
-                    if prop.investagon_id:
-                        existing_properties[prop.investagon_id] = prop
+                logger.info("Loading identity map of existing properties...")
+                property_rows = db.query(
+                    Property.investagon_id,
+                    Property.id,
+                    Property.investagon_data_hash,
+                    Property.project_id
+                ).filter(
+                    Property.tenant_id == current_user.tenant_id,
+                    Property.investagon_id.is_not(None)
+                ).all()
+                
+                for investagon_id, property_pk, content_hash, property_project_id in property_rows:
+                    existing_properties[investagon_id] = SyncIdentity(property_pk, content_hash, property_project_id)
+                del property_rows
                 logger.info(f"Mapped {len(existing_properties)} properties with investagon_id")
             except Exception as e:
                 logger.error(f"Error querying existing properties: {str(e)}")
@@ -1369,14 +1385,20 @@ class InvestagonSyncService:
                             db, 
                             current_user.tenant_id, 
                             current_user.id,
-                            property_address=property_address
+                            property_address=property_address,
+                            city_resolver=city_resolver
                         )
                         
                         # Check if project exists
                         project_obj = None
                         if project_id in existing_projects:
-                            # Update existing project
-                            project_obj = existing_projects[project_id]
+                            # Update existing project - load the full row only now, without the large JSON columns
+                            project_obj = db.query(Project).options(
+                                defer(Project.investagon_data),
+                                defer(Project.micro_location_v2)
+                            ).filter(Project.id == existing_projects[project_id].id).first()
+                        
+                        if project_obj:
                             for key, value in project_data.items():
                                 if key not in ["investagon_data", "created_at", "created_by"]:
                                     setattr(project_obj, key, value)
@@ -1405,7 +1427,7 @@ class InvestagonSyncService:
                         
                         # Add to existing_projects for tracking
                         if project_obj and project_id not in existing_projects:
-                            existing_projects[project_id] = project_obj
+                            existing_projects[project_id] = SyncIdentity(project_obj.id)
                         
                         # Try to geocode the project address to get district
                         if project_obj and not project_obj.district and project_obj.street and project_obj.house_number:
@@ -1444,7 +1466,8 @@ class InvestagonSyncService:
                         if project_photos and project_obj:
                             try:
                                 imported_images = await self.import_project_images(
-                                    db, project_obj, project_photos, current_user
+                                    db, project_obj, project_photos, current_user,
+                                    media_registry=media_registry
                                 )
                                 logger.info(f"Imported {len(imported_images)} images for project {project_obj.id}")
                             except Exception as img_error:
@@ -1489,34 +1512,25 @@ class InvestagonSyncService:
                             if project_documents:
                                 try:
                                     imported_docs = await self.import_project_documents(
-                                        db, project_obj, project_documents, current_user
+                                        db, project_obj, project_documents, current_user,
+                                        media_registry=media_registry
                                     )
                                 except Exception as doc_error:
                                     logger.error(f"Failed to import documents for project {project_obj.id}: {str(doc_error)}")
                         
-                        # Refresh micro location for newly created/updated project
+                        # Plan micro location refresh for newly created/updated project (runs after all writes)
                         if project_obj:
-                            try:
-                                from app.services.project_service import ProjectService
-                                await ProjectService.refresh_project_micro_location(
-                                    db=db,
-                                    project_id=project_obj.id,
-                                    tenant_id=current_user.tenant_id,
-                                    user_id=current_user.id
-                                )
-                                logger.info(f"Refreshed micro location for project {project_obj.id}")
-                            except Exception as e:
-                                logger.warning(f"Failed to refresh micro location for project {project_obj.id}: {str(e)}")
+                            micro_location_planner.add(project_obj.id)
                         
                         # Now process properties for this project
                         property_urls = project_details.get("properties", [])
                         logger.info(f"Project {project_id} has {len(property_urls)} properties")
                         
-                        # Process each property URL
-                        for property_url in property_urls:
-                            # Create a savepoint for each property to allow partial rollback
-                            savepoint = db.begin_nested()
-                            try:
+                        # Process property URLs in small batches: fetch payloads, skip unchanged
+                        # properties by content hash and load full rows only for the ones to update
+                        for batch_start in range(0, len(property_urls), self.SYNC_BATCH_SIZE):
+                            fetched = []
+                            for property_url in property_urls[batch_start:batch_start + self.SYNC_BATCH_SIZE]:
                                 # Extract property ID from URL (format: /api/api_properties/{id})
                                 if not property_url:
                                     logger.warning("Received None property URL")
@@ -1528,116 +1542,173 @@ class InvestagonSyncService:
                                     continue
                                 
                                 # Get property details
-                                # Get property details
-                                investagon_data = await self.api_client.get_property(property_id)
-                                
-                                # Map property data with project reference
-                                property_data = self._map_investagon_to_property(
-                                    investagon_data, 
-                                    db, 
-                                    current_user.tenant_id, 
-                                    current_user.id,
-                                    project_id=project_obj.id
-                                )
-                                
+                                try:
+                                    fetched.append((property_id, await self.api_client.get_property(property_id)))
+                                except Exception as e:
+                                    total_errors += 1
+                                    errors.append({
+                                        "property_id": property_id,
+                                        "investagon_id": None,
+                                        "project_id": project_id,
+                                        "error": str(e)
+                                    })
+                                    logger.error(f"Error syncing property {property_id}: {str(e)}")
+                            
+                            # Work out which properties actually changed since the last sync
+                            pending = []
+                            for property_id, investagon_data in fetched:
                                 # Use the investagon_id from the API response, not the URL property_id
                                 investagon_id = str(investagon_data.get("id", ""))
+                                identity = existing_properties.get(investagon_id)
+                                content_hash = investagon_content_hash(investagon_data)
                                 
-                                # Check if property already exists
-                                if investagon_id in existing_properties:
-                                    # Update existing
-                                    prop = existing_properties[investagon_id]
-                                    for key, value in property_data.items():
-                                        if key != "investagon_data":  # Skip JSON field for now
-                                            setattr(prop, key, value)
-                                    prop.updated_by = current_user.id
-                                    prop.updated_at = datetime.now(timezone.utc)
-                                    total_updated += 1
-                                else:
-                                    # Create new
-                                    prop = Property(
-                                        **property_data,
-                                        tenant_id=current_user.tenant_id,
-                                        created_by=current_user.id
-                                    )
-                                    db.add(prop)
-                                    total_created += 1
-                                
-                                # Flush the property to get its ID
-                                db.flush()
-                                
-                                # Import images if available and property is new or we're doing a full sync
-                                photos = investagon_data.get('photos', [])
-                                if photos and (investagon_id not in existing_properties or modified_since is None):
-                                    try:
-                                        imported_images = await self.import_property_images(
-                                            db, prop, photos, current_user
-                                        )
-                                        logger.info(f"Imported {len(imported_images)} images for property {prop.id}")
-                                    except Exception as img_error:
-                                        logger.error(f"Failed to import images for property {prop.id}: {str(img_error)}")
-                                
-                                # Import documents if available and property is new or we're doing a full sync
-                                property_documents = {}
+                                unchanged = bool(
+                                    identity and identity.content_hash == content_hash
+                                    and identity.project_id == project_obj.id
+                                )
+                                if unchanged:
+                                    total_unchanged += 1
+                                    if modified_since is not None:
+                                        total_synced += 1
+                                        continue
+                                    # Full sync: fields stay as they are, images and documents are imported again
                                 
-                                # Check for 'files' field which contains a Hydra collection
-                                if 'files' in investagon_data and isinstance(investagon_data['files'], dict):
-                                    # Handle Hydra collection format
-                                    if 'hydra:member' in investagon_data['files'] and isinstance(investagon_data['files']['hydra:member'], list):
-                                        for doc in investagon_data['files']['hydra:member']:
-                                            if isinstance(doc, dict):
-                                                # Extract document info from Hydra member
-                                                doc_id = str(doc.get('id', ''))
-                                                doc_url = doc.get('filename', '')  # URL is in 'filename' field
-                                                doc_title = doc.get('title', f"Document_{doc_id}")
-                                                doc_category = doc.get('category', 'other')
-                                                doc_filename = doc.get('original_filename', doc_title)
-                                                
-                                                if doc_url and doc_url.startswith('http'):
-                                                    property_documents[f"{doc_category}_{doc_id}"] = {
-                                                        'url': doc_url,
-                                                        'title': doc_title,
-                                                        'category': doc_category,
-                                                        'filename': doc_filename,
-                                                        'id': doc_id
-                                                    }
-                                                    logger.info(f"Found document: {doc_title} ({doc_category}) - {doc_url[:100]}...")
+                                pending.append((property_id, investagon_data, investagon_id, identity, unchanged))
+                            
+                            # Load full rows for changed existing properties with one query per batch
+                            update_ids = [identity.id for _, _, _, identity, _ in pending if identity]
+                            rows = {}
+                            if update_ids:
+                                rows = {
+                                    row.id: row for row in db.query(Property).options(
+                                        defer(Property.investagon_data)
+                                    ).filter(Property.id.in_(update_ids)).all()
+                                }
+                            
+                            for property_id, investagon_data, investagon_id, identity, unchanged in pending:
+                                # Create a savepoint for each property to allow partial rollback
+                                savepoint = db.begin_nested()
+                                try:
+                                    if unchanged:
+                                        # Full sync of an unchanged property: only the media import below
+                                        prop = rows[identity.id]
                                     else:
-                                        # Fallback to old logic if not Hydra format
-                                        for doc_key, doc_value in investagon_data['files'].items():
-                                            if isinstance(doc_value, str) and doc_value.startswith('http'):
-                                                property_documents[doc_key] = {'url': doc_value}
-                                            elif isinstance(doc_value, dict) and 'url' in doc_value:
-                                                property_documents[doc_key] = doc_value
-                                
-                                if property_documents and (investagon_id not in existing_properties or modified_since is None):
-                                    try:
-                                        imported_docs = await self.import_property_documents(
-                                            db, prop, property_documents, current_user
+                                        # Map property data with project reference
+                                        property_data = self._map_investagon_to_property(
+                                            investagon_data, 
+                                            db, 
+                                            current_user.tenant_id, 
+                                            current_user.id,
+                                            project_id=project_obj.id,
+                                            city_resolver=city_resolver
                                         )
-                                    except Exception as doc_error:
-                                        logger.error(f"Failed to import documents for property {prop.id}: {str(doc_error)}")
-                                
-                                # Commit the savepoint
-                                savepoint.commit()
-                                total_synced += 1
-                                
-                                # Flush every 50 properties to avoid memory issues
-                                if total_synced % 50 == 0:
+                                        
+                                        # Check if property already exists
+                                        prop = rows.get(identity.id) if identity else None
+                                        if prop is not None:
+                                            # Update existing
+                                            for key, value in property_data.items():
+                                                if key != "investagon_data":  # Skip JSON field for now
+                                                    setattr(prop, key, value)
+                                            prop.updated_by = current_user.id
+                                            prop.updated_at = datetime.now(timezone.utc)
+                                            total_updated += 1
+                                        else:
+                                            # Create new
+                                            prop = Property(
+                                                **property_data,
+                                                tenant_id=current_user.tenant_id,
+                                                created_by=current_user.id
+                                            )
+                                            db.add(prop)
+                                            total_created += 1
+                                    
+                                    # Flush the property to get its ID
                                     db.flush()
-                                    logger.info(f"Synced {total_synced} properties so far...")
+                                    
+                                    # Import images if available and property is new or we're doing a full sync
+                                    photos = investagon_data.get('photos', [])
+                                    if photos and (identity is None or modified_since is None):
+                                        try:
+                                            imported_images = await self.import_property_images(
+                                                db, prop, photos, current_user,
+                                                media_registry=media_registry
+                                            )
+                                            logger.info(f"Imported {len(imported_images)} images for property {prop.id}")
+                                        except Exception as img_error:
+                                            logger.error(f"Failed to import images for property {prop.id}: {str(img_error)}")
+                                            # Kein Hash -> der nächste Sync überspringt die Property nicht und importiert erneut
+                                            prop.investagon_data_hash = None
+                                    
+                                    # Import documents if available and property is new or we're doing a full sync
+                                    property_documents = {}
                                 
-                            except Exception as e:
-                                # Rollback only this property's savepoint, not the entire transaction
-                                savepoint.rollback()
-                                total_errors += 1
-                                errors.append({
-                                    "property_id": property_id,
-                                    "investagon_id": investagon_data.get("id") if 'investagon_data' in locals() else None,
-                                    "project_id": project_id,
-                                    "error": str(e)
-                                })
-                                logger.error(f"Error syncing property {property_id}: {str(e)}")
+                                    # Check for 'files' field which contains a Hydra collection
+                                    if 'files' in investagon_data and isinstance(investagon_data['files'], dict):
+                                        # Handle Hydra collection format
+                                        if 'hydra:member' in investagon_data['files'] and isinstance(investagon_data['files']['hydra:member'], list):
+                                            for doc in investagon_data['files']['hydra:member']:
+                                                if isinstance(doc, dict):
+                                                    # Extract document info from Hydra member
+                                                    doc_id = str(doc.get('id', ''))
+                                                    doc_url = doc.get('filename', '')  # URL is in 'filename' field
+                                                    doc_title = doc.get('title', f"Document_{doc_id}")
+                                                    doc_category = doc.get('category', 'other')
+                                                    doc_filename = doc.get('original_filename', doc_title)
+                                                
+                                                    if doc_url and doc_url.startswith('http'):
+                                                        property_documents[f"{doc_category}_{doc_id}"] = {
+                                                            'url': doc_url,
+                                                            'title': doc_title,
+                                                            'category': doc_category,
+                                                            'filename': doc_filename,
+                                                            'id': doc_id
+                                                        }
+                                                        logger.info(f"Found document: {doc_title} ({doc_category}) - {doc_url[:100]}...")
+                                        else:
+                                            # Fallback to old logic if not Hydra format
+                                            for doc_key, doc_value in investagon_data['files'].items():
+                                                if isinstance(doc_value, str) and doc_value.startswith('http'):
+                                                    property_documents[doc_key] = {'url': doc_value}
+                                                elif isinstance(doc_value, dict) and 'url' in doc_value:
+                                                    property_documents[doc_key] = doc_value
+                                
+                                    if property_documents and (identity is None or modified_since is None):
+                                        try:
+                                            imported_docs = await self.import_property_documents(
+                                                db, prop, property_documents, current_user,
+                                                media_registry=media_registry
+                                            )
+                                        except Exception as doc_error:
+                                            logger.error(f"Failed to import documents for property {prop.id}: {str(doc_error)}")
+                                            prop.investagon_data_hash = None
+                                    
+                                    # Commit the savepoint
+                                    savepoint.commit()
+                                    total_synced += 1
+                                    existing_properties[investagon_id] = SyncIdentity(
+                                        prop.id, prop.investagon_data_hash, prop.project_id
+                                    )
+                                    
+                                except Exception as e:
+                                    # Rollback only this property's savepoint, not the entire transaction
+                                    savepoint.rollback()
+                                    # Cities and media created inside the savepoint are gone again - rebuild the indexes
+                                    city_resolver.load()
+                                    media_registry.reset()
+                                    total_errors += 1
+                                    errors.append({
+                                        "property_id": property_id,
+                                        "investagon_id": investagon_id,
+                                        "project_id": project_id,
+                                        "error": str(e)
+                                    })
+                                    logger.error(f"Error syncing property {property_id}: {str(e)}")
+                            
+                            # Drop this batch's payloads and rows before fetching the next one
+                            del fetched, pending, rows
+                            db.flush()
+                            logger.info(f"Synced {total_synced} properties so far ({total_unchanged} unchanged)...")
                         
                     except Exception as e:
                         logger.error(f"Error processing project {project_id}: {str(e)}")
@@ -1684,37 +1755,25 @@ class InvestagonSyncService:
             for investagon_id, project in existing_projects.items():
                 affected_project_ids.add(project.id)
             
-            # Update status for each affected project
-            for project_id in affected_project_ids:
-                try:
-                    ProjectService.update_project_status_from_properties(
-                        db=db,
-                        project_id=project_id,
-                        tenant_id=current_user.tenant_id
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to update project status for {project_id}: {str(e)}")
-                
-                # Update project aggregates
-                try:
-                    ProjectService.update_project_aggregates(
-                        db=db,
-                        project_id=project_id,
-                        tenant_id=current_user.tenant_id
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to update project aggregates for {project_id}: {str(e)}")
-                
-                # Refresh micro location for the project
-                try:
-                    await ProjectService.refresh_project_micro_location(
+            # Update status and aggregates for all affected projects in one statement
+            try:
+                with db.begin_nested():
+                    ProjectService.recompute_project_rollups(
                         db=db,
-                        project_id=project_id,
                         tenant_id=current_user.tenant_id,
-                        user_id=current_user.id
+                        project_ids=list(affected_project_ids)
                     )
-                except Exception as e:
-                    logger.warning(f"Failed to refresh micro location for {project_id}: {str(e)}")
+            except Exception as e:
+                logger.warning(f"Failed to update project status and aggregates: {str(e)}")
+            
+            # Refresh micro locations as a separate stage, once per unique location
+            for project_id in affected_project_ids:
+                micro_location_planner.add(project_id)
+            try:
+                micro_location_stats = await micro_location_planner.run()
+            except Exception as e:
+                micro_location_stats = None
+                logger.warning(f"Failed to refresh micro locations: {str(e)}")
             
             # Log activity
             audit_logger.log_business_event(
@@ -1730,8 +1789,10 @@ class InvestagonSyncService:
                     "created": total_created,
                     "updated": total_updated,
                     "errors": total_errors,
+                    "unchanged": total_unchanged,
                     "projects_created": projects_created,
-                    "projects_updated": projects_updated
+                    "projects_updated": projects_updated,
+                    "micro_locations": micro_location_stats
                 }
             )
             
@@ -1893,12 +1954,68 @@ class InvestagonSyncService:
                 "reason": "Error checking sync status"
             }
     
+    @staticmethod
+    def _existing_media(db: Session, model, parent_column, parent_id: UUID):
+        """
+        Media already attached to a project/property: linked registry asset IDs, their content
+        hashes, and descriptions of rows imported before the media registry existed
+        """
+        rows = db.query(
+            model.media_asset_id,
+            model.description,
+            MediaAsset.content_hash
+        ).outerjoin(
+            MediaAsset, MediaAsset.id == model.media_asset_id
+        ).filter(parent_column == parent_id).all()
+        
+        asset_ids = {row.media_asset_id for row in rows if row.media_asset_id}
+        content_hashes = {row.content_hash for row in rows if row.content_hash}
+        legacy_descriptions = [row.description for row in rows if not row.media_asset_id and row.description]
+        return asset_ids, content_hashes, legacy_descriptions
+    
+    @staticmethod
+    def _legacy_photo_ids(descriptions: List[str]) -> set:
+        """Investagon photo IDs from descriptions like "Imported from Investagon (ID: 12345)" """
+        photo_ids = set()
+        for description in descriptions:
+            if "Investagon (ID:" in description:
+                try:
+                    photo_ids.add(description.split("ID: ")[1].split(")")[0])
+                except IndexError:
+                    pass
+        return photo_ids
+    
+    @staticmethod
+    def _image_uploader(s3_service, folder: str, tenant_id: UUID, filename_stem: str):
+        """Upload callback for MediaRegistry.ingest storing a resized image"""
+        async def upload(image_content: bytes, content_type: Optional[str]) -> Dict[str, Any]:
+            # Determine content type
+            content_type = content_type or 'image/jpeg'
+            if not content_type.startswith('image/'):
+                content_type = 'image/jpeg'
+            
+            # Generate filename with proper extension
+            file_extension = mimetypes.guess_extension(content_type) or '.jpg'
+            
+            upload_result = await s3_service.upload_image_from_bytes(
+                file_data=image_content,
+                filename=f"{filename_stem}{file_extension}",
+                content_type=content_type,
+                folder=folder,
+                tenant_id=str(tenant_id),
+                resize_options={'width': 1920, 'quality': 85}
+            )
+            upload_result.setdefault('s3_bucket', s3_service.bucket_name)
+            return upload_result
+        return upload
+    
     async def import_property_images(
         self,
         db: Session,
         property_obj: Property,
         photos: List[Dict[str, Any]],
-        current_user: User
+        current_user: User,
+        media_registry: Optional[MediaRegistry] = None
     ) -> List[PropertyImage]:
         """Import images from Investagon URLs to S3 and create PropertyImage records"""
         imported_images = []
@@ -1908,28 +2025,22 @@ class InvestagonSyncService:
             logger.warning("S3 service not configured. Skipping image import.")
             return imported_images
         
-        # Get existing property images to check for duplicates
-        existing_images = db.query(PropertyImage).filter(
-            PropertyImage.property_id == property_obj.id
-        ).all()
+        if media_registry is None:
+            media_registry = MediaRegistry(db, property_obj.tenant_id)
         
-        # Create a set of Investagon IDs we already have
-        existing_investagon_ids = set()
-        for img in existing_images:
-            if img.description and "Investagon (ID:" in img.description:
-                # Extract ID from description like "Imported from Investagon (ID: 12345)"
-                try:
-                    investagon_id = img.description.split("ID: ")[1].split(")")[0]
-                    existing_investagon_ids.add(investagon_id)
-                except:
-                    pass
+        # Media already attached to this property
+        existing_asset_ids, existing_hashes, legacy_descriptions = self._existing_media(
+            db, PropertyImage, PropertyImage.property_id, property_obj.id
+        )
+        existing_investagon_ids = self._legacy_photo_ids(legacy_descriptions)
         
-        logger.info(f"Property {property_obj.id} has {len(existing_images)} existing images, "
-                   f"{len(existing_investagon_ids)} from Investagon")
+        logger.info(f"Property {property_obj.id} has {len(existing_asset_ids) + len(legacy_descriptions)} existing images, "
+                   f"{len(existing_asset_ids) + len(existing_investagon_ids)} from Investagon")
         
         # Sort photos by position to maintain order
         sorted_photos = sorted(photos, key=lambda x: x.get('position', 0))
         skipped_count = 0
+        reused_count = 0
         
         for idx, photo in enumerate(sorted_photos):
             try:
@@ -1944,61 +2055,52 @@ class InvestagonSyncService:
                     logger.warning(f"Invalid photo URL: {filename}")
                     continue
                 
-                # Download image from Investagon
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        filename,
-                        timeout=30.0,
-                        follow_redirects=True
-                    )
-                    response.raise_for_status()
-                    image_content = response.content
-                
-                # Determine content type
-                content_type = response.headers.get('content-type', 'image/jpeg')
-                if not content_type.startswith('image/'):
-                    content_type = 'image/jpeg'
-                
-                # Generate filename with proper extension
-                file_extension = mimetypes.guess_extension(content_type) or '.jpg'
-                temp_filename = f"investagon_{photo.get('id', idx)}{file_extension}"
+                known_asset = media_registry.lookup(filename, 'image')
+                if known_asset is not None and known_asset.id in existing_asset_ids:
+                    skipped_count += 1
+                    continue
                 
-                # Create a file-like object for S3 upload
-                file_obj = BytesIO(image_content)
-                file_obj.name = temp_filename
+                # Download (conditionally) and store, reusing identical objects
+                asset, reused = await media_registry.ingest(
+                    filename,
+                    'image',
+                    self._image_uploader(
+                        s3_service, 'properties', property_obj.tenant_id,
+                        f"investagon_{photo.get('id', idx)}"
+                    ),
+                    source_id=photo_id or None
+                )
+                if asset.id in existing_asset_ids or asset.content_hash in existing_hashes:
+                    skipped_count += 1
+                    continue
+                if reused:
+                    reused_count += 1
                 
                 # Determine image type based on position or default to exterior
                 # First images are typically exterior shots
                 image_type = 'exterior' if idx < 4 else 'interior'
                 
-                # Upload to S3
-                upload_result = await s3_service.upload_image_from_bytes(
-                    file_data=image_content,
-                    filename=temp_filename,
-                    content_type=content_type,
-                    folder='properties',
-                    tenant_id=str(property_obj.tenant_id),
-                    resize_options={'width': 1920, 'quality': 85}
-                )
-                
                 # Create PropertyImage record
                 property_image = PropertyImage(
                     property_id=property_obj.id,
                     tenant_id=property_obj.tenant_id,
-                    image_url=upload_result['url'],
+                    image_url=asset.url,
                     image_type=image_type,
                     title=f"Property Image {idx + 1}",
                     description=f"Imported from Investagon (ID: {photo.get('id')})",
                     display_order=photo.get('position', idx),
-                    file_size=upload_result.get('file_size'),
-                    mime_type=upload_result.get('mime_type'),
-                    width=upload_result.get('width'),
-                    height=upload_result.get('height'),
+                    file_size=asset.file_size,
+                    mime_type=asset.mime_type,
+                    width=asset.width,
+                    height=asset.height,
+                    media_asset_id=asset.id,
                     created_by=current_user.id
                 )
                 
                 db.add(property_image)
                 imported_images.append(property_image)
+                existing_asset_ids.add(asset.id)
+                existing_hashes.add(asset.content_hash)
                 
                 logger.info(f"Successfully imported image {photo.get('id')} for property {property_obj.id}")
                 
@@ -2009,7 +2111,8 @@ class InvestagonSyncService:
         if skipped_count > 0:
             logger.info(f"Skipped {skipped_count} already imported images for property {property_obj.id}")
         if imported_images:
-            logger.info(f"Successfully imported {len(imported_images)} new images for property {property_obj.id}")
+            logger.info(f"Successfully imported {len(imported_images)} new images for property {property_obj.id} "
+                       f"({reused_count} reused stored objects)")
         
         return imported_images
 
@@ -2018,7 +2121,8 @@ class InvestagonSyncService:
         db: Session,
         project_obj: Project,
         photos: List[Dict[str, Any]],
-        current_user: User
+        current_user: User,
+        media_registry: Optional[MediaRegistry] = None
     ) -> List[ProjectImage]:
         """Import images from Investagon URLs to S3 and create ProjectImage records"""
         imported_images = []
@@ -2028,28 +2132,22 @@ class InvestagonSyncService:
             logger.warning("S3 service not configured. Skipping image import.")
             return imported_images
         
-        # Get existing project images to check for duplicates
-        existing_images = db.query(ProjectImage).filter(
-            ProjectImage.project_id == project_obj.id
-        ).all()
+        if media_registry is None:
+            media_registry = MediaRegistry(db, project_obj.tenant_id)
         
-        # Create a set of Investagon IDs we already have
-        existing_investagon_ids = set()
-        for img in existing_images:
-            if img.description and "Investagon (ID:" in img.description:
-                # Extract ID from description like "Imported from Investagon (ID: 12345)"
-                try:
-                    investagon_id = img.description.split("ID: ")[1].split(")")[0]
-                    existing_investagon_ids.add(investagon_id)
-                except:
-                    pass
+        # Media already attached to this project
+        existing_asset_ids, existing_hashes, legacy_descriptions = self._existing_media(
+            db, ProjectImage, ProjectImage.project_id, project_obj.id
+        )
+        existing_investagon_ids = self._legacy_photo_ids(legacy_descriptions)
         
-        logger.info(f"Project {project_obj.id} has {len(existing_images)} existing images, "
-                   f"{len(existing_investagon_ids)} from Investagon")
+        logger.info(f"Project {project_obj.id} has {len(existing_asset_ids) + len(legacy_descriptions)} existing images, "
+                   f"{len(existing_asset_ids) + len(existing_investagon_ids)} from Investagon")
         
         # Sort photos by position to maintain order
         sorted_photos = sorted(photos, key=lambda x: x.get('position', 0))
         skipped_count = 0
+        reused_count = 0
         
         for idx, photo in enumerate(sorted_photos):
             try:
@@ -2064,24 +2162,26 @@ class InvestagonSyncService:
                     logger.warning(f"Invalid photo URL: {filename}")
                     continue
                 
-                # Download image from Investagon
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        filename,
-                        timeout=30.0,
-                        follow_redirects=True
-                    )
-                    response.raise_for_status()
-                    image_content = response.content
-                
-                # Determine content type
-                content_type = response.headers.get('content-type', 'image/jpeg')
-                if not content_type.startswith('image/'):
-                    content_type = 'image/jpeg'
+                known_asset = media_registry.lookup(filename, 'image')
+                if known_asset is not None and known_asset.id in existing_asset_ids:
+                    skipped_count += 1
+                    continue
                 
-                # Generate filename with proper extension
-                file_extension = mimetypes.guess_extension(content_type) or '.jpg'
-                temp_filename = f"investagon_project_{photo.get('id', idx)}{file_extension}"
+                # Download (conditionally) and store, reusing identical objects
+                asset, reused = await media_registry.ingest(
+                    filename,
+                    'image',
+                    self._image_uploader(
+                        s3_service, 'projects', project_obj.tenant_id,
+                        f"investagon_project_{photo.get('id', idx)}"
+                    ),
+                    source_id=photo_id or None
+                )
+                if asset.id in existing_asset_ids or asset.content_hash in existing_hashes:
+                    skipped_count += 1
+                    continue
+                if reused:
+                    reused_count += 1
                 
                 # Determine image type based on position
                 # First images are typically exterior shots
@@ -2092,34 +2192,27 @@ class InvestagonSyncService:
                 else:
                     image_type = 'amenity'
                 
-                # Upload to S3
-                upload_result = await s3_service.upload_image_from_bytes(
-                    file_data=image_content,
-                    filename=temp_filename,
-                    content_type=content_type,
-                    folder='projects',
-                    tenant_id=str(project_obj.tenant_id),
-                    resize_options={'width': 1920, 'quality': 85}
-                )
-                
                 # Create ProjectImage record
                 project_image = ProjectImage(
                     project_id=project_obj.id,
                     tenant_id=project_obj.tenant_id,
-                    image_url=upload_result['url'],
+                    image_url=asset.url,
                     image_type=image_type,
                     title=f"Project Image {idx + 1}",
                     description=f"Imported from Investagon (ID: {photo.get('id')})",
                     display_order=photo.get('position', idx),
-                    file_size=upload_result.get('file_size'),
-                    mime_type=upload_result.get('mime_type'),
-                    width=upload_result.get('width'),
-                    height=upload_result.get('height'),
+                    file_size=asset.file_size,
+                    mime_type=asset.mime_type,
+                    width=asset.width,
+                    height=asset.height,
+                    media_asset_id=asset.id,
                     created_by=current_user.id
                 )
                 
                 db.add(project_image)
                 imported_images.append(project_image)
+                existing_asset_ids.add(asset.id)
+                existing_hashes.add(asset.content_hash)
                 
                 logger.info(f"Successfully imported image {photo.get('id')} for project {project_obj.id}")
                 
@@ -2130,16 +2223,82 @@ class InvestagonSyncService:
         if skipped_count > 0:
             logger.info(f"Skipped {skipped_count} already imported images for project {project_obj.id}")
         if imported_images:
-            logger.info(f"Successfully imported {len(imported_images)} new images for project {project_obj.id}")
+            logger.info(f"Successfully imported {len(imported_images)} new images for project {project_obj.id} "
+                       f"({reused_count} reused stored objects)")
         
         return imported_images
 
+    @staticmethod
+    def _document_uploader(s3_service, folder: str, tenant_id: UUID, doc_key: str, document_url: str):
+        """Upload callback for MediaRegistry.ingest storing an (optimized) document"""
+        async def upload(document_content: bytes, content_type: Optional[str]) -> Dict[str, Any]:
+            # Determine content type
+            content_type = content_type or 'application/pdf'
+            if 'pdf' in document_url.lower() or 'pdf' in content_type.lower():
+                content_type = 'application/pdf'
+            
+            file_extension = mimetypes.guess_extension(content_type) or '.pdf'
+            
+            # Optimize if PDF
+            file_size = len(document_content)
+            if content_type == 'application/pdf':
+                try:
+                    file_buffer = io.BytesIO(document_content)
+                    optimized_file, new_size, was_optimized = await PDFOptimizer.optimize_pdf(
+                        file_buffer,
+                        file_size
+                    )
+                    if was_optimized:
+                        optimized_file.seek(0)
+                        document_content = optimized_file.read()
+                        logger.info(f"Optimized document {doc_key}: {file_size/1024/1024:.2f}MB -> {new_size/1024/1024:.2f}MB")
+                        file_size = new_size
+                except Exception as e:
+                    logger.warning(f"Failed to optimize PDF {doc_key}: {str(e)}")
+            
+            temp_filename = f"investagon_{doc_key}_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}{file_extension}"
+            
+            # Create a simple mock UploadFile class that works with our S3Service
+            class SimpleUploadFile:
+                def __init__(self, file, filename, content_type, size):
+                    self.file = file
+                    self.filename = filename
+                    self.content_type = content_type
+                    self.size = size
+                
+                async def read(self):
+                    self.file.seek(0)
+                    return self.file.read()
+                
+                async def seek(self, offset):
+                    self.file.seek(offset)
+            
+            upload_file = SimpleUploadFile(
+                file=BytesIO(document_content),
+                filename=temp_filename,
+                content_type=content_type,
+                size=len(document_content)
+            )
+            
+            upload_result = await s3_service.upload_file(
+                file=upload_file,
+                folder=folder,
+                tenant_id=str(tenant_id),
+                allowed_types=['application/pdf', 'image/png', 'image/jpeg', 'image/jpg']
+            )
+            upload_result['file_size'] = file_size
+            upload_result['mime_type'] = content_type
+            upload_result.setdefault('s3_bucket', s3_service.bucket_name)
+            return upload_result
+        return upload
+    
     async def import_project_documents(
         self,
         db: Session,
         project_obj: Project,
         documents: Dict[str, Any],
-        current_user: User
+        current_user: User,
+        media_registry: Optional[MediaRegistry] = None
     ) -> List[ProjectDocument]:
         """Import documents from Investagon URLs to S3 and create ProjectDocument records"""
         imported_documents = []
@@ -2149,19 +2308,16 @@ class InvestagonSyncService:
             logger.warning("S3 service not configured. Skipping document import.")
             return imported_documents
         
-        # Get existing project documents to check for duplicates
-        existing_documents = db.query(ProjectDocument).filter(
-            ProjectDocument.project_id == project_obj.id
-        ).all()
+        if media_registry is None:
+            media_registry = MediaRegistry(db, project_obj.tenant_id)
         
-        # Create a set of document identifiers we already have
-        existing_doc_identifiers = set()
-        for doc in existing_documents:
-            if doc.description and "Investagon:" in doc.description:
-                # Extract identifier from description
-                existing_doc_identifiers.add(doc.description)
+        # Media already attached to this project
+        existing_asset_ids, existing_hashes, legacy_descriptions = self._existing_media(
+            db, ProjectDocument, ProjectDocument.project_id, project_obj.id
+        )
+        existing_doc_identifiers = {d for d in legacy_descriptions if "Investagon:" in d}
         
-        logger.info(f"Project {project_obj.id} has {len(existing_documents)} existing documents")
+        logger.info(f"Project {project_obj.id} has {len(existing_asset_ids) + len(legacy_descriptions)} existing documents")
         
         # Document type mapping from Investagon categories to our system
         document_type_mapping = {
@@ -2233,79 +2389,31 @@ class InvestagonSyncService:
                             document_type = doc_type
                             break
                 
-                # Download document from Investagon
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        document_url,
-                        timeout=60.0,  # Longer timeout for documents
-                        follow_redirects=True
-                    )
-                    response.raise_for_status()
-                    document_content = response.content
+                known_asset = media_registry.lookup(document_url, 'document')
+                if known_asset is not None and known_asset.id in existing_asset_ids:
+                    continue
                 
-                # Determine content type
-                content_type = response.headers.get('content-type', 'application/pdf')
-                if 'pdf' in document_url.lower() or 'pdf' in content_type.lower():
-                    content_type = 'application/pdf'
+                # Download (conditionally), optimize and store, reusing identical objects
+                asset, reused = await media_registry.ingest(
+                    document_url,
+                    'document',
+                    self._document_uploader(
+                        s3_service,
+                        f"documents/projects/{project_obj.id}/{document_type.value}",
+                        project_obj.tenant_id,
+                        doc_key,
+                        document_url
+                    ),
+                    source_id=str(doc_id) if doc_id else None,
+                    timeout=60.0  # Longer timeout for documents
+                )
+                if asset.id in existing_asset_ids or asset.content_hash in existing_hashes:
+                    continue
                 
                 # Generate filename
-                file_extension = mimetypes.guess_extension(content_type) or '.pdf'
+                file_extension = mimetypes.guess_extension(asset.mime_type or 'application/pdf') or '.pdf'
                 original_filename = doc_info.get('filename', f"{doc_key}{file_extension}")
                 
-                # Optimize if PDF
-                file_size = len(document_content)
-                if content_type == 'application/pdf':
-                    try:
-                        file_buffer = io.BytesIO(document_content)
-                        optimized_file, new_size, was_optimized = await PDFOptimizer.optimize_pdf(
-                            file_buffer,
-                            file_size
-                        )
-                        if was_optimized:
-                            optimized_file.seek(0)
-                            document_content = optimized_file.read()
-                            file_size = new_size
-                            logger.info(f"Optimized document {doc_key}: {len(document_content)/1024/1024:.2f}MB -> {file_size/1024/1024:.2f}MB")
-                    except Exception as e:
-                        logger.warning(f"Failed to optimize PDF {doc_key}: {str(e)}")
-                
-                # Upload to S3
-                folder = f"documents/projects/{project_obj.id}/{document_type.value}"
-                temp_filename = f"investagon_{doc_key}_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}{file_extension}"
-                
-                # Create a file-like object from bytes
-                from io import BytesIO
-                
-                # Create a simple mock UploadFile class that works with our S3Service
-                class SimpleUploadFile:
-                    def __init__(self, file, filename, content_type, size):
-                        self.file = file
-                        self.filename = filename
-                        self.content_type = content_type
-                        self.size = size
-                    
-                    async def read(self):
-                        self.file.seek(0)
-                        return self.file.read()
-                    
-                    async def seek(self, offset):
-                        self.file.seek(offset)
-                
-                file_obj = BytesIO(document_content)
-                upload_file = SimpleUploadFile(
-                    file=file_obj,
-                    filename=temp_filename,
-                    content_type=content_type,
-                    size=len(document_content)
-                )
-                
-                upload_result = await s3_service.upload_file(
-                    file=upload_file,
-                    folder=folder,
-                    tenant_id=str(project_obj.tenant_id),
-                    allowed_types=['application/pdf', 'image/png', 'image/jpeg', 'image/jpg']
-                )
-                
                 # Create ProjectDocument record
                 # Use title from doc_info if available, otherwise generate from key
                 document_title = doc_info.get('title')
@@ -2320,11 +2428,12 @@ class InvestagonSyncService:
                     description=doc_identifier,
                     display_order=doc_info.get('position', 0),
                     file_name=original_filename,
-                    file_path=upload_result['url'],
-                    file_size=file_size,
-                    mime_type=content_type,
-                    s3_key=upload_result.get('s3_key'),
-                    s3_bucket=upload_result.get('s3_bucket'),
+                    file_path=asset.url,
+                    file_size=asset.file_size,
+                    mime_type=asset.mime_type,
+                    s3_key=asset.s3_key,
+                    s3_bucket=asset.s3_bucket,
+                    media_asset_id=asset.id,
                     uploaded_by=current_user.id,
                     uploaded_at=datetime.now(timezone.utc)
                 )
@@ -2332,6 +2441,8 @@ class InvestagonSyncService:
                 db.add(project_document)
                 db.commit()  # Commit immediately after successful upload
                 imported_documents.append(project_document)
+                existing_asset_ids.add(asset.id)
+                existing_hashes.add(asset.content_hash)
                 
                 
             except Exception as e:
@@ -2348,7 +2459,8 @@ class InvestagonSyncService:
         db: Session,
         property_obj: Property,
         documents: Dict[str, Any],
-        current_user: User
+        current_user: User,
+        media_registry: Optional[MediaRegistry] = None
     ) -> List[PropertyDocument]:
         """Import documents from Investagon URLs to S3 and create PropertyDocument records"""
         imported_documents = []
@@ -2358,19 +2470,16 @@ class InvestagonSyncService:
             logger.warning("S3 service not configured. Skipping document import.")
             return imported_documents
         
-        # Get existing property documents to check for duplicates
-        existing_documents = db.query(PropertyDocument).filter(
-            PropertyDocument.property_id == property_obj.id
-        ).all()
+        if media_registry is None:
+            media_registry = MediaRegistry(db, property_obj.tenant_id)
         
-        # Create a set of document identifiers we already have
-        existing_doc_identifiers = set()
-        for doc in existing_documents:
-            if doc.description and "Investagon:" in doc.description:
-                # Extract identifier from description
-                existing_doc_identifiers.add(doc.description)
+        # Media already attached to this property
+        existing_asset_ids, existing_hashes, legacy_descriptions = self._existing_media(
+            db, PropertyDocument, PropertyDocument.property_id, property_obj.id
+        )
+        existing_doc_identifiers = {d for d in legacy_descriptions if "Investagon:" in d}
         
-        logger.info(f"Property {property_obj.id} has {len(existing_documents)} existing documents")
+        logger.info(f"Property {property_obj.id} has {len(existing_asset_ids) + len(legacy_descriptions)} existing documents")
         
         # Document type mapping from Investagon categories to our system (same as project mapping)
         document_type_mapping = {
@@ -2442,79 +2551,31 @@ class InvestagonSyncService:
                             document_type = doc_type
                             break
                 
-                # Download document from Investagon
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        document_url,
-                        timeout=60.0,  # Longer timeout for documents
-                        follow_redirects=True
-                    )
-                    response.raise_for_status()
-                    document_content = response.content
+                known_asset = media_registry.lookup(document_url, 'document')
+                if known_asset is not None and known_asset.id in existing_asset_ids:
+                    continue
                 
-                # Determine content type
-                content_type = response.headers.get('content-type', 'application/pdf')
-                if 'pdf' in document_url.lower() or 'pdf' in content_type.lower():
-                    content_type = 'application/pdf'
+                # Download (conditionally), optimize and store, reusing identical objects
+                asset, reused = await media_registry.ingest(
+                    document_url,
+                    'document',
+                    self._document_uploader(
+                        s3_service,
+                        f"documents/properties/{property_obj.id}/{document_type.value}",
+                        property_obj.tenant_id,
+                        doc_key,
+                        document_url
+                    ),
+                    source_id=str(doc_id) if doc_id else None,
+                    timeout=60.0  # Longer timeout for documents
+                )
+                if asset.id in existing_asset_ids or asset.content_hash in existing_hashes:
+                    continue
                 
                 # Generate filename
-                file_extension = mimetypes.guess_extension(content_type) or '.pdf'
+                file_extension = mimetypes.guess_extension(asset.mime_type or 'application/pdf') or '.pdf'
                 original_filename = doc_info.get('filename', f"{doc_key}{file_extension}")
                 
-                # Optimize if PDF
-                file_size = len(document_content)
-                if content_type == 'application/pdf':
-                    try:
-                        file_buffer = io.BytesIO(document_content)
-                        optimized_file, new_size, was_optimized = await PDFOptimizer.optimize_pdf(
-                            file_buffer,
-                            file_size
-                        )
-                        if was_optimized:
-                            optimized_file.seek(0)
-                            document_content = optimized_file.read()
-                            file_size = new_size
-                            logger.info(f"Optimized document {doc_key}: {len(document_content)/1024/1024:.2f}MB -> {file_size/1024/1024:.2f}MB")
-                    except Exception as e:
-                        logger.warning(f"Failed to optimize PDF {doc_key}: {str(e)}")
-                
-                # Upload to S3
-                folder = f"documents/properties/{property_obj.id}/{document_type.value}"
-                temp_filename = f"investagon_{doc_key}_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}{file_extension}"
-                
-                # Create a file-like object from bytes
-                from io import BytesIO
-                
-                # Create a simple mock UploadFile class that works with our S3Service
-                class SimpleUploadFile:
-                    def __init__(self, file, filename, content_type, size):
-                        self.file = file
-                        self.filename = filename
-                        self.content_type = content_type
-                        self.size = size
-                    
-                    async def read(self):
-                        self.file.seek(0)
-                        return self.file.read()
-                    
-                    async def seek(self, offset):
-                        self.file.seek(offset)
-                
-                file_obj = BytesIO(document_content)
-                upload_file = SimpleUploadFile(
-                    file=file_obj,
-                    filename=temp_filename,
-                    content_type=content_type,
-                    size=len(document_content)
-                )
-                
-                upload_result = await s3_service.upload_file(
-                    file=upload_file,
-                    folder=folder,
-                    tenant_id=str(property_obj.tenant_id),
-                    allowed_types=['application/pdf', 'image/png', 'image/jpeg', 'image/jpg']
-                )
-                
                 # Create PropertyDocument record
                 document_title = doc_info.get('title', doc_key.replace('_', ' ').title())
                 property_document = PropertyDocument(
@@ -2525,11 +2586,12 @@ class InvestagonSyncService:
                     description=doc_identifier,
                     display_order=doc_info.get('position', 0),
                     file_name=original_filename,
-                    file_path=upload_result['url'],
-                    file_size=file_size,
-                    mime_type=content_type,
-                    s3_key=upload_result.get('s3_key'),
-                    s3_bucket=upload_result.get('s3_bucket'),
+                    file_path=asset.url,
+                    file_size=asset.file_size,
+                    mime_type=asset.mime_type,
+                    s3_key=asset.s3_key,
+                    s3_bucket=asset.s3_bucket,
+                    media_asset_id=asset.id,
                     uploaded_by=current_user.id,
                     uploaded_at=datetime.now(timezone.utc)
                 )
@@ -2537,6 +2599,8 @@ class InvestagonSyncService:
                 db.add(property_document)
                 db.commit()  # Commit immediately after successful upload
                 imported_documents.append(property_document)
+                existing_asset_ids.add(asset.id)
+                existing_hashes.add(asset.content_hash)
                 
                 
             except Exception as e:
@@ -0,0 +1,209 @@
+# ================================
+# MEDIA SERVICE (services/media_service.py)
+# ================================
+
+from typing import Optional, Dict, Any, Tuple, Callable, Awaitable
+from datetime import datetime, timezone
+from uuid import UUID
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, func
+import hashlib
+import logging
+
+from app.models.business import MediaAsset, PropertyImage, ProjectImage, PropertyDocument, ProjectDocument
+from app.core.metrics import http_client
+
+logger = logging.getLogger(__name__)
+
+# Upload callback: receives the downloaded bytes and the response content type and returns
+# the stored object (url, s3_key, optional s3_bucket, file_size, mime_type, width, height)
+MediaUploader = Callable[[bytes, Optional[str]], Awaitable[Dict[str, Any]]]
+
+
+class MediaRegistry:
+    """
+    Registry of imported media, keyed by source URL and SHA-256 content hash.
+
+    - A source URL that is already registered is re-validated with a conditional GET
+      (If-None-Match / If-Modified-Since); a 304 reuses the stored object without a download.
+    - Downloaded bytes whose hash matches an already stored object of the tenant reuse
+      that S3 object instead of uploading a copy (e.g. photos shared by several properties).
+    - Each URL is validated at most once per registry instance, so one instance should
+      live for a whole sync.
+    """
+
+    def __init__(self, db: Session, tenant_id: UUID, source: str = "investagon"):
+        self.db = db
+        self.tenant_id = tenant_id
+        self.source = source
+        self._by_url: Dict[Tuple[str, str], Optional[MediaAsset]] = {}
+        self._verified = set()
+
+    def reset(self) -> None:
+        """Forget cached lookups (e.g. after a savepoint rollback)"""
+        self._by_url.clear()
+        self._verified.clear()
+
+    @staticmethod
+    def hash_bytes(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def hash_url(url: str) -> str:
+        return hashlib.sha256(url.strip().encode("utf-8")).hexdigest()
+
+    def lookup(self, url: str, kind: str) -> Optional[MediaAsset]:
+        """Return the registered asset for a source URL, if any"""
+        key = (kind, self.hash_url(url))
+        if key not in self._by_url:
+            self._by_url[key] = self.db.query(MediaAsset).filter(
+                and_(
+                    MediaAsset.tenant_id == self.tenant_id,
+                    MediaAsset.kind == kind,
+                    MediaAsset.source_url_hash == key[1]
+                )
+            ).first()
+        return self._by_url[key]
+
+    def _lookup_content(self, kind: str, content_hash: str, exclude_id: Optional[UUID]) -> Optional[MediaAsset]:
+        query = self.db.query(MediaAsset).filter(
+            and_(
+                MediaAsset.tenant_id == self.tenant_id,
+                MediaAsset.kind == kind,
+                MediaAsset.content_hash == content_hash,
+                MediaAsset.s3_key.isnot(None)
+            )
+        )
+        if exclude_id is not None:
+            query = query.filter(MediaAsset.id != exclude_id)
+        return query.first()
+
+    @staticmethod
+    def _copy_object(target: MediaAsset, source: MediaAsset) -> None:
+        for field in ("url", "s3_key", "s3_bucket", "mime_type", "file_size", "width", "height"):
+            setattr(target, field, getattr(source, field))
+
+    async def ingest(
+        self,
+        url: str,
+        kind: str,
+        upload: MediaUploader,
+        source_id: Optional[str] = None,
+        timeout: float = 30.0
+    ) -> Tuple[MediaAsset, bool]:
+        """
+        Make sure the media behind url is stored and return (asset, reused).
+
+        reused is True when no new object had to be uploaded.
+        """
+        url_hash = self.hash_url(url)
+        asset = self.lookup(url, kind)
+
+        if asset is not None and asset.s3_key and asset.id in self._verified:
+            return asset, True
+
+        headers = {}
+        if asset is not None and asset.s3_key:
+            if asset.etag:
+                headers["If-None-Match"] = asset.etag
+            if asset.last_modified:
+                headers["If-Modified-Since"] = asset.last_modified
+
+        async with http_client("media_download") as client:
+            response = await client.get(
+                url,
+                headers=headers,
+                timeout=timeout,
+                follow_redirects=True
+            )
+
+        now = datetime.now(timezone.utc)
+        if response.status_code == 304 and headers:
+            asset.last_checked_at = now
+            self._verified.add(asset.id)
+            logger.debug(f"Media not modified, reusing stored object: {url[:100]}")
+            return asset, True
+
+        response.raise_for_status()
+        content = response.content
+        content_hash = self.hash_bytes(content)
+
+        if asset is None:
+            asset = MediaAsset(
+                tenant_id=self.tenant_id,
+                source=self.source,
+                source_url=url,
+                source_url_hash=url_hash,
+                kind=kind
+            )
+            self.db.add(asset)
+
+        if source_id:
+            asset.source_id = source_id
+        asset.etag = response.headers.get("etag")
+        asset.last_modified = response.headers.get("last-modified")
+        asset.last_checked_at = now
+
+        reused = True
+        if not (asset.s3_key and asset.content_hash == content_hash):
+            twin = self._lookup_content(kind, content_hash, asset.id)
+            if twin is not None:
+                self._copy_object(asset, twin)
+                logger.info(f"Reusing stored object {twin.s3_key} for identical media {url[:100]}")
+            else:
+                result = await upload(content, response.headers.get("content-type"))
+                asset.url = result["url"]
+                asset.s3_key = result.get("s3_key")
+                asset.s3_bucket = result.get("s3_bucket")
+                asset.mime_type = result.get("mime_type")
+                asset.file_size = result.get("file_size")
+                asset.width = result.get("width")
+                asset.height = result.get("height")
+                reused = False
+
+        asset.content_hash = content_hash
+        self.db.flush()
+
+        self._by_url[(kind, url_hash)] = asset
+        self._verified.add(asset.id)
+        return asset, reused
+
+    @staticmethod
+    def release(db: Session, row: Any) -> bool:
+        """
+        Called before an image/document row is deleted. Returns True if its stored object
+        is no longer referenced by any other row and may be removed from S3, in which case
+        the registry entries pointing at it are dropped as well.
+        """
+        if getattr(row, "media_asset_id", None) is None:
+            return True
+
+        object_url = getattr(row, "image_url", None) or getattr(row, "file_path", None)
+        references = 0
+        for model, url_column in (
+            (PropertyImage, PropertyImage.image_url),
+            (ProjectImage, ProjectImage.image_url),
+            (PropertyDocument, PropertyDocument.file_path),
+            (ProjectDocument, ProjectDocument.file_path)
+        ):
+            query = db.query(func.count(model.id)).filter(
+                and_(
+                    model.tenant_id == row.tenant_id,
+                    url_column == object_url
+                )
+            )
+            if isinstance(row, model):
+                query = query.filter(model.id != row.id)
+            references += query.scalar() or 0
+
+        if references:
+            logger.info(f"Stored object {object_url} still referenced {references} time(s), keeping it")
+            return False
+
+        db.query(MediaAsset).filter(
+            and_(
+                MediaAsset.tenant_id == row.tenant_id,
+                MediaAsset.url == object_url
+            )
+        ).delete(synchronize_session=False)
+        return True
@@ -4,8 +4,8 @@
 
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from sqlalchemy.orm import Session, selectinload, joinedload
-from sqlalchemy import and_, or_, func, select, desc
+from sqlalchemy.orm import Session, selectinload, joinedload, aliased, undefer
+from sqlalchemy import and_, or_, func, select, desc, update, case, cast, String, event, inspect
 from sqlalchemy.exc import IntegrityError
 import logging
 
@@ -18,15 +18,160 @@ from app.schemas.business import (
     ProjectAggregateStats, RangeStats
 )
 from app.core.exceptions import AppException
-from app.mappers.project_mapper import map_project_to_overview, map_project_to_response
+from app.mappers.project_mapper import (
+    map_project_to_overview, map_project_to_response, visibility_status_from_counts
+)
 from app.services.s3_service import get_s3_service
 from app.services.google_maps_service import GoogleMapsService
 from app.services.city_service import CityService
+from app.services.filter_range_service import FilterRangeService
+from app.services import cover_image_service  # noqa: F401 (Session-Hooks für die Cover-Felder)
+from app.services.media_service import MediaRegistry
 from app.utils.audit import AuditLogger
 
 audit_logger = AuditLogger()
 logger = logging.getLogger(__name__)
 
+
+@event.listens_for(Project, "before_insert")
+@event.listens_for(Project, "before_update")
+def _sync_micro_location_summary(mapper, connection, target):
+    # Zusammenfassung für Listen folgt jeder ORM-Zuweisung der vollen Mikrolage
+    if inspect(target).attrs.micro_location_v2.history.has_changes():
+        target.micro_location_summary = GoogleMapsService.summarize_micro_location(target.micro_location_v2)
+
+class MicroLocationRefreshPlanner:
+    """
+    Collects projects whose micro location should be refreshed and computes each
+    unique location only once.
+    
+    Projects are deduplicated by ID, geocoded through the geocoding cache and then
+    grouped by rounded coordinates, so projects in the same building or on the same
+    street corner share one Google Maps places/distances run. Intended to run as a
+    separate stage after all property writes of a sync. Does not commit.
+    """
+    
+    # 4 decimal places ~ 11 m, i.e. the same building
+    COORDINATE_PRECISION = 4
+    
+    def __init__(self, db: Session, tenant_id: UUID, force_refresh: bool = False):
+        self.db = db
+        self.tenant_id = tenant_id
+        self.force_refresh = force_refresh
+        self._project_ids: List[UUID] = []
+        self._seen = set()
+    
+    def add(self, project_id: Optional[UUID]) -> None:
+        """Schedule a project for refresh (duplicates are ignored)"""
+        if project_id is None or project_id in self._seen:
+            return
+        self._seen.add(project_id)
+        self._project_ids.append(project_id)
+    
+    def __len__(self) -> int:
+        return len(self._project_ids)
+    
+    async def run(self) -> Dict[str, int]:
+        """Refresh all planned projects and return counters"""
+        stats = {"planned": len(self._project_ids), "refreshed": 0, "skipped": 0, "failed": 0, "locations": 0}
+        if not self._project_ids:
+            return stats
+        
+        # Load only the address columns; existence is checked on the small summary column
+        rows = self.db.query(
+            Project.id,
+            Project.street,
+            Project.house_number,
+            Project.zip_code,
+            Project.city,
+            Project.state,
+            func.coalesce(cast(Project.micro_location_summary, String), 'null').notin_(
+                ['null', '{}']
+            ).label('has_micro_location')
+        ).filter(
+            and_(
+                Project.tenant_id == self.tenant_id,
+                Project.id.in_(self._project_ids)
+            )
+        ).all()
+        
+        google_maps_service = GoogleMapsService()
+        
+        # Geocode once per distinct address, then group by rounded coordinates
+        geocoded: Dict[str, Optional[Dict]] = {}
+        groups: Dict[tuple, List[tuple]] = {}
+        for row in rows:
+            if row.has_micro_location and not self.force_refresh:
+                stats["skipped"] += 1
+                continue
+            if not all([row.street, row.house_number, row.city, row.state]):
+                logger.warning(f"Project {row.id} missing required address data for micro location")
+                stats["skipped"] += 1
+                continue
+            
+            address = f"{row.street} {row.house_number}, {row.zip_code} {row.city}, {row.state}"
+            if address not in geocoded:
+                try:
+                    geocoded[address] = await google_maps_service.geocode_address(
+                        self.db, address, force_refresh=self.force_refresh
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to geocode {address} for micro location: {str(e)}")
+                    geocoded[address] = None
+            
+            geocode_result = geocoded[address]
+            if not geocode_result:
+                stats["failed"] += 1
+                continue
+            
+            key = (
+                round(geocode_result["lat"], self.COORDINATE_PRECISION),
+                round(geocode_result["lng"], self.COORDINATE_PRECISION)
+            )
+            groups.setdefault(key, []).append((row.id, geocode_result))
+        
+        stats["locations"] = len(groups)
+        
+        for members in groups.values():
+            try:
+                micro_location_data = await google_maps_service.build_micro_location_data(
+                    self.db, members[0][1], force_refresh=self.force_refresh
+                )
+            except Exception as e:
+                logger.error(f"Failed to build micro location for {len(members)} project(s): {str(e)}")
+                stats["failed"] += len(members)
+                continue
+            
+            # Fan the shared neighbourhood out, keeping each project's own geocoded position
+            for project_id, geocode_result in members:
+                project_data = dict(micro_location_data)
+                project_data["location"] = {
+                    "lat": geocode_result["lat"],
+                    "lng": geocode_result["lng"],
+                    "formatted_address": geocode_result["formatted_address"]
+                }
+                self.db.query(Project).filter(
+                    and_(
+                        Project.id == project_id,
+                        Project.tenant_id == self.tenant_id
+                    )
+                ).update({
+                    Project.micro_location_v2: project_data,
+                    Project.micro_location_summary: GoogleMapsService.summarize_micro_location(project_data)
+                }, synchronize_session=False)
+                stats["refreshed"] += 1
+        
+        # Projects already loaded into this session must not keep serving the old value
+        for obj in list(self.db.identity_map.values()):
+            if isinstance(obj, Project) and obj.id in self._seen:
+                self.db.expire(obj, ['micro_location_v2', 'micro_location_summary'])
+        
+        logger.info(
+            f"Micro location refresh: {stats['planned']} planned, {stats['locations']} unique locations, "
+            f"{stats['refreshed']} refreshed, {stats['skipped']} skipped, {stats['failed']} failed"
+        )
+        return stats
+
 class ProjectService:
     """Service für Project-Management"""
     
@@ -206,6 +351,7 @@ class ProjectService:
             # Explicitly load images and city_ref for the response
             from sqlalchemy.orm import selectinload
             project = db.query(Project).options(
+                undefer(Project.micro_location_v2),
                 selectinload(Project.images),
                 selectinload(Project.city_ref),
                 selectinload(Project.properties)
@@ -221,13 +367,22 @@ class ProjectService:
             )
     
     @staticmethod
-    def get_project(db: Session, project_id: UUID, tenant_id: UUID) -> Project:
-        """Get project by ID with all relationships"""
-        project = db.query(Project).options(
+    def get_project(
+        db: Session,
+        project_id: UUID,
+        tenant_id: UUID,
+        with_micro_location: bool = False
+    ) -> Project:
+        """Get project by ID with all relationships (and the full micro location for detail responses)"""
+        query = db.query(Project).options(
             selectinload(Project.images),
             selectinload(Project.properties).selectinload(Property.images),
             selectinload(Project.city_ref)
-        ).filter(
+        )
+        if with_micro_location:
+            query = query.options(undefer(Project.micro_location_v2))
+        
+        project = query.filter(
             and_(
                 Project.id == project_id,
                 Project.tenant_id == tenant_id
@@ -344,16 +499,14 @@ class ProjectService:
         # Apply pagination
         query = query.offset((filters.page - 1) * filters.page_size).limit(filters.page_size)
         
-        # Load relationships for property count and images
-        projects = query.options(
-            selectinload(Project.properties),
-            selectinload(Project.images)
-        ).all()
+        # Cover image and property count are maintained columns, no relationship loads
+        projects = query.all()
+        visibility = ProjectService._visibility_status_by_project(db, [project.id for project in projects])
         
         # Convert to overview schema using mapper
         items = []
         for project in projects:
-            overview_data = map_project_to_overview(project)
+            overview_data = map_project_to_overview(project, visibility.get(project.id))
             overview = ProjectOverview(**overview_data)
             items.append(overview)
         
@@ -365,6 +518,26 @@ class ProjectService:
             pages=(total + filters.page_size - 1) // filters.page_size
         )
     
+    @staticmethod
+    def _visibility_status_by_project(db: Session, project_ids: List[UUID]) -> Dict[UUID, Optional[str]]:
+        """Visibility status per project from one grouped count over its properties"""
+        if not project_ids:
+            return {}
+        
+        rows = db.query(
+            Property.project_id,
+            func.count(Property.visibility).label('total'),
+            func.count(Property.id).filter(Property.visibility == 1).label('active'),
+            func.count(Property.id).filter(Property.visibility.in_([-1, 0])).label('inactive')
+        ).filter(
+            Property.project_id.in_(project_ids)
+        ).group_by(Property.project_id).all()
+        
+        return {
+            row.project_id: visibility_status_from_counts(row.total, row.active, row.inactive)
+            for row in rows
+        }
+    
     @staticmethod
     def update_project(
         db: Session,
@@ -488,7 +661,7 @@ class ProjectService:
             )
             
             # Reload with relationships for response
-            return ProjectService.get_project(db, project_id, tenant_id)
+            return ProjectService.get_project(db, project_id, tenant_id, with_micro_location=True)
             
         except IntegrityError as e:
             db.rollback()
@@ -515,16 +688,28 @@ class ProjectService:
                        "Delete all properties first."
             )
         
-        # Delete all project images from S3
+        images = list(project.images)
+        
+        # Delete project (images cascade)
+        db.delete(project)
+        db.flush()
+        
+        # Imported media may share its stored object with other rows. Released only after
+        # the flush, so sibling images of this project no longer count as references.
+        orphaned_keys = []
         s3_service = get_s3_service()
         if s3_service and s3_service.is_configured():
-            for image in project.images:
-                s3_service.delete_image(image.s3_key if hasattr(image, 's3_key') else image.image_url)
+            for image in images:
+                key = image.s3_key if hasattr(image, 's3_key') else image.image_url
+                if key not in orphaned_keys and MediaRegistry.release(db, image):
+                    orphaned_keys.append(key)
         
-        # Delete project
-        db.delete(project)
         db.commit()
         
+        # Delete S3 objects only once the rows are gone for good
+        for key in orphaned_keys:
+            s3_service.delete_image(key)
+        
         # Log activity
         audit_logger.log_business_event(
             db=db,
@@ -626,7 +811,7 @@ class ProjectService:
         
         # Delete from S3
         s3_service = get_s3_service()
-        if s3_service and s3_service.is_configured():
+        if s3_service and s3_service.is_configured() and MediaRegistry.release(db, image):
             s3_service.delete_image(image.s3_key if hasattr(image, 's3_key') else image.image_url)
         
         # Delete from database
@@ -680,6 +865,24 @@ class ProjectService:
             "occupancy_rate": (reserved_units + sold_units) / total_properties * 100 if total_properties > 0 else 0
         }
     
+    @staticmethod
+    def get_micro_location(db: Session, project_id: UUID, tenant_id: UUID) -> Optional[Dict[str, Any]]:
+        """Full micro location data of a project (lists only carry the summary)"""
+        row = db.query(Project.micro_location_v2).filter(
+            and_(
+                Project.id == project_id,
+                Project.tenant_id == tenant_id
+            )
+        ).first()
+        
+        if not row:
+            raise AppException(
+                status_code=404,
+                detail=f"Project with ID {project_id} not found"
+            )
+        
+        return row.micro_location_v2
+    
     @staticmethod
     async def refresh_project_micro_location(
         db: Session,
@@ -701,226 +904,154 @@ class ProjectService:
             bool: True if refreshed, False otherwise
         """
         try:
-            # Get the project
-            project = db.query(Project).filter(
-                and_(
-                    Project.id == project_id,
-                    Project.tenant_id == tenant_id
-                )
-            ).first()
-            
-            if not project:
-                logger.warning(f"Project {project_id} not found for tenant {tenant_id}")
-                return False
+            planner = MicroLocationRefreshPlanner(db, tenant_id, force_refresh=force_refresh)
+            planner.add(project_id)
+            stats = await planner.run()
             
-            # Check if micro location already exists (unless force refresh)
-            if project.micro_location_v2 and not force_refresh:
-                logger.info(f"Project {project_id} already has micro location data, skipping refresh")
-                return False
-            
-            # Only refresh if project has required address data
-            if not all([project.street, project.house_number, project.city, project.state]):
-                logger.warning(f"Project {project_id} missing required address data for micro location")
-                return False
-            
-            # Try to generate micro location data
-            try:
-                google_maps_service = GoogleMapsService()
-                address = f"{project.street} {project.house_number}, {project.zip_code} {project.city}, {project.state}"
-                
-                # Now we can call async function directly since this method is async
-                micro_location_data = await google_maps_service.get_micro_location_data(db, address, force_refresh=force_refresh)
-                
-                # Update project with micro location data
-                if micro_location_data:
-                    project.micro_location_v2 = micro_location_data
-                    db.commit()
-                    logger.info(f"Successfully refreshed micro location data for project {project_id}")
-                    return True
-                else:
-                    logger.warning(f"No micro location data returned for project {project_id}")
-                    return False
-                
-            except Exception as e:
-                logger.error(f"Failed to refresh micro location for project {project_id}: {str(e)}")
-                return False
+            if stats["refreshed"]:
+                db.commit()
+                logger.info(f"Successfully refreshed micro location data for project {project_id}")
+                return True
+            return False
                 
         except Exception as e:
             logger.error(f"Error in refresh_project_micro_location: {str(e)}")
             return False
     
     @staticmethod
-    def update_project_status_from_properties(
+    def recompute_project_rollups(
         db: Session,
-        project_id: UUID,
-        tenant_id: UUID
-    ) -> None:
-        """Update project status based on its properties' statuses"""
-        # Get the project with its properties
-        project = db.query(Project).filter(
-            and_(
-                Project.id == project_id,
-                Project.tenant_id == tenant_id
-            )
-        ).first()
+        tenant_id: UUID,
+        project_ids: Optional[List[UUID]] = None
+    ) -> int:
+        """
+        Recompute status, property count and price/yield/maintenance ranges for projects from their properties.
         
-        if not project:
-            return
+        Runs as a single set-based UPDATE ... FROM (SELECT ... GROUP BY project) for the given
+        project IDs, or for every project of the tenant when project_ids is None. Does not commit;
+        the caller owns the transaction. Returns the number of projects whose values changed.
+        """
+        if project_ids is not None:
+            project_ids = list({pid for pid in project_ids if pid is not None})
+            if not project_ids:
+                return 0
         
-        # Count properties by active status
-        from app.models.business import Property
-        property_active_statuses = db.query(
-            Property.active,
-            func.count(Property.id)
-        ).filter(
-            Property.project_id == project_id
-        ).group_by(Property.active).all()
+        total_price = (
+            Property.purchase_price +
+            func.coalesce(Property.purchase_price_parking, 0) +
+            func.coalesce(Property.purchase_price_furniture, 0)
+        )
+        rental_yield = case(
+            (Property.purchase_price > 0,
+             ((Property.monthly_rent + func.coalesce(Property.rent_parking_month, 0)) * 12 * 100.0) / total_price),
+            else_=None
+        )
         
-        active_counts = {active: count for active, count in property_active_statuses}
-        total_properties = sum(active_counts.values())
+        # Active values: 0=Verkauft, 1=Frei, 5=Angefragt, 6=Reserviert, 7=Notartermin, 9=Notarvorbereitung
+        rollup = select(
+            Project.id.label('project_id'),
+            func.count(Property.id).label('total'),
+            func.count(Property.id).filter(Property.active == 1).label('available'),
+            func.count(Property.id).filter(Property.active.in_([5, 6])).label('reserved'),
+            func.count(Property.id).filter(Property.active.in_([0, 7, 9])).label('sold'),
+            func.min(total_price).filter(Property.purchase_price.isnot(None)).label('min_price'),
+            func.max(total_price).filter(Property.purchase_price.isnot(None)).label('max_price'),
+            func.min(rental_yield).label('min_rental_yield'),
+            func.max(rental_yield).label('max_rental_yield'),
+            func.min(Property.initial_maintenance_expenses).filter(
+                Property.initial_maintenance_expenses > 0
+            ).label('min_initial_maintenance_expenses'),
+            func.max(Property.initial_maintenance_expenses).filter(
+                Property.initial_maintenance_expenses > 0
+            ).label('max_initial_maintenance_expenses')
+        ).select_from(Project).outerjoin(
+            Property,
+            and_(
+                Property.project_id == Project.id,
+                Property.tenant_id == Project.tenant_id
+            )
+        ).where(Project.tenant_id == tenant_id)
+        if project_ids is not None:
+            rollup = rollup.where(Project.id.in_(project_ids))
+        rollup = rollup.group_by(Project.id).subquery('rollup')
         
-        if total_properties == 0:
-            # No properties, keep current project status
-            return
+        # Projects without properties keep their current status
+        new_status = case(
+            (rollup.c.total == 0, Project.status),
+            (rollup.c.available > 0, 'available'),
+            (rollup.c.sold == rollup.c.total, 'sold'),
+            (rollup.c.reserved == rollup.c.total, 'reserved'),
+            (rollup.c.reserved > 0, 'reserved'),
+            else_='sold'
+        )
+        new_values = {
+            'status': new_status,
+            'property_count': rollup.c.total,
+            'min_price': rollup.c.min_price,
+            'max_price': rollup.c.max_price,
+            'min_rental_yield': rollup.c.min_rental_yield,
+            'max_rental_yield': rollup.c.max_rental_yield,
+            'min_initial_maintenance_expenses': rollup.c.min_initial_maintenance_expenses,
+            'max_initial_maintenance_expenses': rollup.c.max_initial_maintenance_expenses,
+        }
         
-        # Determine new project status based on property active values
-        # Active values: 0=Verkauft, 1=Frei, 5=Angefragt, 6=Reserviert, 7=Notartermin, 9=Notarvorbereitung
-        available_count = active_counts.get(1, 0)  # Frei
-        reserved_count = active_counts.get(5, 0) + active_counts.get(6, 0)  # Angefragt + Reserviert
-        sold_count = active_counts.get(0, 0) + active_counts.get(7, 0) + active_counts.get(9, 0)  # Verkauft + Notartermin + Notarvorbereitung
-        
-        new_status = None
-        
-        if available_count > 0:
-            # If any property is available (Frei), project is available
-            new_status = 'available'
-        elif sold_count == total_properties:
-            # If all properties are sold/in sale process, project is sold
-            new_status = 'sold'
-        elif reserved_count == total_properties:
-            # If all properties are reserved/inquired, project is reserved
-            new_status = 'reserved'
-        else:
-            # Mixed status, default to reserved if there are any reserved properties
-            new_status = 'reserved' if reserved_count > 0 else 'sold'
+        # Joining a second alias of projects exposes the pre-update row to RETURNING
+        previous = aliased(Project, name='previous')
+        stmt = (
+            update(Project)
+            .where(Project.tenant_id == tenant_id)
+            .where(Project.id == rollup.c.project_id)
+            .where(previous.id == Project.id)
+            .where(or_(*[
+                getattr(Project, column).is_distinct_from(value)
+                for column, value in new_values.items()
+            ]))
+            .values(**new_values)
+            .returning(
+                Project.id,
+                Project.status,
+                previous.status.label('old_status'),
+                func.coalesce(Project.updated_by, Project.created_by).label('actor_id'),
+                rollup.c.available,
+                rollup.c.reserved,
+                rollup.c.sold,
+                rollup.c.total
+            )
+            .execution_options(synchronize_session=False)
+        )
+        changed = db.execute(stmt).all()
         
-        # Update project status if changed
-        if project.status != new_status:
-            old_status = project.status
-            project.status = new_status
-            db.commit()
-            
-            # Log the status change
+        # Projects already loaded into this session must not keep serving the old values
+        changed_ids = {row.id for row in changed}
+        for obj in list(db.identity_map.values()):
+            if isinstance(obj, Project) and obj.id in changed_ids:
+                db.expire(obj, list(new_values.keys()))
+        
+        for row in changed:
+            if row.status == row.old_status:
+                continue
             audit_logger.log_business_event(
                 db=db,
-                user_id=project.updated_by or project.created_by,
+                user_id=row.actor_id,
                 tenant_id=tenant_id,
                 action="AUTO_STATUS_UPDATE",
                 resource_type="project",
-                resource_id=project.id,
-                old_values={"status": old_status},
-                new_values={"status": new_status},
-                additional_context={"property_active_counts": active_counts}
+                resource_id=row.id,
+                old_values={"status": row.old_status},
+                new_values={"status": row.status},
+                additional_context={
+                    "available": row.available,
+                    "reserved": row.reserved,
+                    "sold": row.sold,
+                    "total": row.total
+                }
             )
-    
-    @staticmethod
-    def update_project_aggregates(
-        db: Session,
-        project_id: UUID,
-        tenant_id: UUID
-    ) -> None:
-        """Update project price and rental yield aggregates based on its properties"""
-        try:
-            # Get the project
-            project = db.query(Project).filter(
-                and_(
-                    Project.id == project_id,
-                    Project.tenant_id == tenant_id
-                )
-            ).first()
-            
-            if not project:
-                logger.warning(f"Project {project_id} not found for tenant {tenant_id}")
-                return
-            
-            # Calculate aggregates from properties
-            from sqlalchemy import case
-            
-            # Price aggregates query
-            price_aggregates = db.query(
-                func.min(
-                    Property.purchase_price + 
-                    func.coalesce(Property.purchase_price_parking, 0) + 
-                    func.coalesce(Property.purchase_price_furniture, 0)
-                ).label('min_price'),
-                func.max(
-                    Property.purchase_price + 
-                    func.coalesce(Property.purchase_price_parking, 0) + 
-                    func.coalesce(Property.purchase_price_furniture, 0)
-                ).label('max_price')
-            ).filter(
-                and_(
-                    Property.project_id == project_id,
-                    Property.tenant_id == tenant_id,
-                    Property.purchase_price.isnot(None)
-                )
-            ).first()
-            
-            # Rental yield aggregates query
-            yield_aggregates = db.query(
-                func.min(
-                    case(
-                        (Property.purchase_price > 0,
-                         ((Property.monthly_rent + func.coalesce(Property.rent_parking_month, 0)) * 12 * 100.0) / 
-                         (Property.purchase_price + func.coalesce(Property.purchase_price_parking, 0) + func.coalesce(Property.purchase_price_furniture, 0))
-                        ),
-                        else_=None
-                    )
-                ).label('min_rental_yield'),
-                func.max(
-                    case(
-                        (Property.purchase_price > 0,
-                         ((Property.monthly_rent + func.coalesce(Property.rent_parking_month, 0)) * 12 * 100.0) / 
-                         (Property.purchase_price + func.coalesce(Property.purchase_price_parking, 0) + func.coalesce(Property.purchase_price_furniture, 0))
-                        ),
-                        else_=None
-                    )
-                ).label('max_rental_yield')
-            ).filter(
-                and_(
-                    Property.project_id == project_id,
-                    Property.tenant_id == tenant_id
-                )
-            ).first()
-            
-            # Initial maintenance expenses aggregates query
-            maintenance_aggregates = db.query(
-                func.min(Property.initial_maintenance_expenses).label('min_initial_maintenance_expenses'),
-                func.max(Property.initial_maintenance_expenses).label('max_initial_maintenance_expenses')
-            ).filter(
-                and_(
-                    Property.project_id == project_id,
-                    Property.tenant_id == tenant_id,
-                    Property.initial_maintenance_expenses.isnot(None),
-                    Property.initial_maintenance_expenses > 0
-                )
-            ).first()
-            
-            # Update project with new aggregates
-            project.min_price = price_aggregates.min_price if price_aggregates else None
-            project.max_price = price_aggregates.max_price if price_aggregates else None
-            project.min_rental_yield = yield_aggregates.min_rental_yield if yield_aggregates else None
-            project.max_rental_yield = yield_aggregates.max_rental_yield if yield_aggregates else None
-            project.min_initial_maintenance_expenses = maintenance_aggregates.min_initial_maintenance_expenses if maintenance_aggregates else None
-            project.max_initial_maintenance_expenses = maintenance_aggregates.max_initial_maintenance_expenses if maintenance_aggregates else None
-            
-            db.commit()
-            
-            logger.info(f"Updated aggregates for project {project_id}: price range={project.min_price}-{project.max_price}, yield range={project.min_rental_yield}-{project.max_rental_yield}, maintenance range={project.min_initial_maintenance_expenses}-{project.max_initial_maintenance_expenses}")
-            
-        except Exception as e:
-            logger.error(f"Error updating project aggregates: {str(e)}")
-            db.rollback()
+        
+        logger.info(
+            f"Recomputed project rollups for tenant {tenant_id}: "
+            f"{len(project_ids) if project_ids is not None else 'all'} requested, {len(changed)} changed"
+        )
+        return len(changed)
     
     @staticmethod
     def get_aggregate_stats(
@@ -928,60 +1059,26 @@ class ProjectService:
         tenant_id: UUID,
         current_user: User
     ) -> ProjectAggregateStats:
-        """Get aggregate statistics for all projects in the tenant"""
+        """Get aggregate statistics for all projects in the tenant (precomputed ranges)"""
         try:
-            # Base query for projects
-            query = db.query(Project).filter(Project.tenant_id == tenant_id)
-            
-            # Check user permissions for visibility filtering
-            is_admin_or_manager = current_user.is_super_admin
-            if not is_admin_or_manager:
-                from app.services.rbac_service import RBACService
-                permissions = RBACService.get_user_permissions(
-                    db, current_user.id, current_user.tenant_id
-                )
-                permission_names = [p["name"] for p in permissions.get("permissions", [])]
-                is_admin_or_manager = "properties:update" in permission_names
-            
-            # For non-admin users, filter projects to only those with visible properties
-            if not is_admin_or_manager:
-                from app.models.business import Property
-                # Use a subquery to get project IDs that have visible properties
-                visible_project_ids = db.query(Project.id).join(Project.properties).filter(
-                    and_(
-                        Project.tenant_id == tenant_id,
-                        Property.visibility == 1
-                    )
-                ).distinct().subquery()
-                
-                # Filter main query by these IDs
-                query = query.filter(Project.id.in_(select(visible_project_ids.c.id)))
-            
-            # Get aggregate statistics
-            stats = db.query(
-                func.min(Project.min_price).label('min_price'),
-                func.max(Project.max_price).label('max_price'),
-                func.min(Project.min_rental_yield).label('min_rental_yield'),
-                func.max(Project.max_rental_yield).label('max_rental_yield'),
-                func.min(Project.construction_year).label('min_construction_year'),
-                func.max(Project.construction_year).label('max_construction_year')
-            ).filter(
-                Project.id.in_(query.with_entities(Project.id))
-            ).first()
+            # Non-admin users only see projects with visible properties
+            ranges = FilterRangeService.get_project_ranges(
+                db, tenant_id, FilterRangeService.visibility_class(db, current_user)
+            )
             
             # Convert to response format
             return ProjectAggregateStats(
                 price_range=RangeStats(
-                    min=float(stats.min_price) if stats.min_price else 0,
-                    max=float(stats.max_price) if stats.max_price else 1000000
+                    min=ranges["min_price"] or 0,
+                    max=ranges["max_price"] or 1000000
                 ),
                 rental_yield_range=RangeStats(
-                    min=float(stats.min_rental_yield) if stats.min_rental_yield else 0,
-                    max=float(stats.max_rental_yield) if stats.max_rental_yield else 10
+                    min=ranges["min_rental_yield"] or 0,
+                    max=ranges["max_rental_yield"] or 10
                 ),
                 construction_year_range=RangeStats(
-                    min=float(stats.min_construction_year) if stats.min_construction_year else 1900,
-                    max=float(stats.max_construction_year) if stats.max_construction_year else 2024
+                    min=ranges["min_construction_year"] or 1900,
+                    max=ranges["max_construction_year"] or 2024
                 )
             )
             
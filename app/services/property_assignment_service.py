@@ -6,7 +6,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timezone
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select, delete, func, literal, Text, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert, UUID as PG_UUID
 
 from app.models.business import PropertyAssignment, Property
 from app.models.user import User
@@ -14,7 +15,8 @@ from app.schemas.business import (
     PropertyAssignmentCreate, 
     PropertyAssignmentUpdate,
     PropertyAssignmentResponse,
-    PropertyAssignmentBulkCreate
+    PropertyAssignmentBulkCreate,
+    PropertyAssignmentBulkDelete
 )
 from app.core.exceptions import AppException
 from app.utils.audit import AuditLogger
@@ -94,6 +96,15 @@ class PropertyAssignmentService:
         
         return assignment
     
+    @staticmethod
+    def _valid_ids(db: Session, model, ids: List[UUID], tenant_id: UUID) -> set:
+        """IDs from ids that exist in the tenant (one id-only query)"""
+        if not ids:
+            return set()
+        return set(db.scalars(
+            select(model.id).where(model.id.in_(ids), model.tenant_id == tenant_id)
+        ))
+    
     @staticmethod
     def bulk_assign_properties(
         db: Session,
@@ -101,84 +112,71 @@ class PropertyAssignmentService:
         assigned_by: UUID,
         tenant_id: UUID
     ) -> Dict[str, Any]:
-        """Bulk assign properties to users"""
+        """
+        Bulk assign properties to users.
         
-        created_assignments = []
+        All (property, user) pairs are written with a single INSERT ... SELECT ... ON CONFLICT
+        DO NOTHING RETURNING; pairs missing from the returned rows already existed.
+        """
         failed_assignments = []
-        
-        # Verify all properties exist and belong to tenant
-        properties = db.query(Property).filter(
-            Property.id.in_(bulk_data.property_ids),
-            Property.tenant_id == tenant_id
-        ).all()
-        
-        property_ids = {str(p.id) for p in properties}
-        invalid_properties = [str(pid) for pid in bulk_data.property_ids if str(pid) not in property_ids]
-        
-        if invalid_properties:
-            failed_assignments.extend([
-                {"property_id": pid, "reason": "Property not found"} 
-                for pid in invalid_properties
-            ])
-        
-        # Verify all users exist and belong to tenant
-        users = db.query(User).filter(
-            User.id.in_(bulk_data.user_ids),
-            User.tenant_id == tenant_id
-        ).all()
-        
-        user_ids = {str(u.id) for u in users}
-        invalid_users = [str(uid) for uid in bulk_data.user_ids if str(uid) not in user_ids]
-        
-        if invalid_users:
-            failed_assignments.extend([
-                {"user_id": uid, "reason": "User not found"} 
-                for uid in invalid_users
-            ])
-        
-        # Create assignments for valid combinations
-        for property_id in bulk_data.property_ids:
-            if str(property_id) not in property_ids:
+        requested_property_ids = list(dict.fromkeys(bulk_data.property_ids))
+        requested_user_ids = list(dict.fromkeys(bulk_data.user_ids))
+        
+        # Verify all properties and users exist and belong to tenant
+        property_ids = PropertyAssignmentService._valid_ids(db, Property, requested_property_ids, tenant_id)
+        failed_assignments.extend([
+            {"property_id": str(pid), "reason": "Property not found"}
+            for pid in requested_property_ids if pid not in property_ids
+        ])
+        
+        user_ids = PropertyAssignmentService._valid_ids(db, User, requested_user_ids, tenant_id)
+        failed_assignments.extend([
+            {"user_id": str(uid), "reason": "User not found"}
+            for uid in requested_user_ids if uid not in user_ids
+        ])
+        
+        created_pairs = set()
+        if property_ids and user_ids:
+            now = datetime.now(timezone.utc)
+            pairs = select(
+                func.gen_random_uuid(),
+                Property.id,
+                User.id,
+                literal(assigned_by, PG_UUID(as_uuid=True)),
+                literal(tenant_id, PG_UUID(as_uuid=True)),
+                literal(bulk_data.notes, Text),
+                literal(now, DateTime(timezone=True)),
+                literal(assigned_by, PG_UUID(as_uuid=True)),
+                literal(assigned_by, PG_UUID(as_uuid=True))
+            ).where(
+                Property.id.in_(property_ids),
+                Property.tenant_id == tenant_id,
+                User.id.in_(user_ids),
+                User.tenant_id == tenant_id
+            )
+            table = PropertyAssignment.__table__
+            stmt = pg_insert(table).from_select(
+                ["id", "property_id", "user_id", "assigned_by", "tenant_id", "notes", "assigned_at", "created_by", "updated_by"],
+                pairs
+            ).on_conflict_do_nothing(
+                index_elements=["property_id", "user_id", "tenant_id"]
+            ).returning(table.c.property_id, table.c.user_id)
+            created_pairs = {(row.property_id, row.user_id) for row in db.execute(stmt)}
+        
+        # Valid pairs that were not inserted hit the unique index
+        for property_id in requested_property_ids:
+            if property_id not in property_ids:
                 continue
-                
-            for user_id in bulk_data.user_ids:
-                if str(user_id) not in user_ids:
-                    continue
-                
-                # Check if assignment already exists
-                existing = db.query(PropertyAssignment).filter(
-                    PropertyAssignment.property_id == property_id,
-                    PropertyAssignment.user_id == user_id,
-                    PropertyAssignment.tenant_id == tenant_id
-                ).first()
-                
-                if existing:
+            for user_id in requested_user_ids:
+                if user_id in user_ids and (property_id, user_id) not in created_pairs:
                     failed_assignments.append({
                         "property_id": str(property_id),
                         "user_id": str(user_id),
                         "reason": "Assignment already exists"
                     })
-                    continue
-                
-                # Create assignment
-                assignment = PropertyAssignment(
-                    property_id=property_id,
-                    user_id=user_id,
-                    assigned_by=assigned_by,
-                    tenant_id=tenant_id,
-                    notes=bulk_data.notes,
-                    assigned_at=datetime.now(timezone.utc),
-                    created_by=assigned_by,
-                    updated_by=assigned_by
-                )
-                
-                db.add(assignment)
-                created_assignments.append(assignment)
-        
-        db.flush()
         
         # Audit log for bulk operation
-        if created_assignments:
+        if created_pairs:
             audit_logger.log_business_event(
                 db=db,
                 action="PROPERTY_BULK_ASSIGNMENT_CREATED",
@@ -187,18 +185,67 @@ class PropertyAssignmentService:
                 resource_type="property_assignment",
                 resource_id=None,
                 new_values={
-                    "total_created": len(created_assignments),
+                    "total_created": len(created_pairs),
                     "property_ids": [str(pid) for pid in bulk_data.property_ids],
                     "user_ids": [str(uid) for uid in bulk_data.user_ids]
                 }
             )
         
         return {
-            "created": len(created_assignments),
+            "created": len(created_pairs),
             "failed": len(failed_assignments),
             "failed_details": failed_assignments
         }
     
+    @staticmethod
+    def bulk_unassign_properties(
+        db: Session,
+        bulk_data: PropertyAssignmentBulkDelete,
+        current_user_id: UUID,
+        tenant_id: UUID
+    ) -> Dict[str, Any]:
+        """Remove all assignments between the given properties and users with one DELETE ... RETURNING"""
+        property_ids = list(dict.fromkeys(bulk_data.property_ids))
+        user_ids = list(dict.fromkeys(bulk_data.user_ids))
+        
+        deleted_pairs = set()
+        if property_ids and user_ids:
+            table = PropertyAssignment.__table__
+            stmt = delete(table).where(
+                table.c.property_id.in_(property_ids),
+                table.c.user_id.in_(user_ids),
+                table.c.tenant_id == tenant_id
+            ).returning(table.c.property_id, table.c.user_id)
+            deleted_pairs = {(row.property_id, row.user_id) for row in db.execute(stmt)}
+        
+        not_assigned = [
+            {"property_id": str(property_id), "user_id": str(user_id), "reason": "Assignment not found"}
+            for property_id in property_ids
+            for user_id in user_ids
+            if (property_id, user_id) not in deleted_pairs
+        ]
+        
+        if deleted_pairs:
+            audit_logger.log_business_event(
+                db=db,
+                action="PROPERTY_BULK_ASSIGNMENT_DELETED",
+                user_id=current_user_id,
+                tenant_id=tenant_id,
+                resource_type="property_assignment",
+                resource_id=None,
+                old_values={
+                    "total_deleted": len(deleted_pairs),
+                    "property_ids": [str(pid) for pid in property_ids],
+                    "user_ids": [str(uid) for uid in user_ids]
+                }
+            )
+        
+        return {
+            "deleted": len(deleted_pairs),
+            "failed": len(not_assigned),
+            "failed_details": not_assigned
+        }
+    
     @staticmethod
     def delete_assignment(
         db: Session,
@@ -2,9 +2,10 @@
 # PROPERTY SERVICE (services/property_service.py)
 # ================================
 
-from sqlalchemy.orm import Session, joinedload, subqueryload
-from sqlalchemy import and_, or_, func
-from typing import List, Optional, Dict, Any
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import and_, or_, func, event, tuple_, case
+from typing import List, Optional, Dict, Any, Iterable, Set
+from itertools import chain
 from uuid import UUID
 from datetime import datetime, timezone
 
@@ -15,16 +16,45 @@ from app.schemas.business import (
     PropertyImageCreate, PropertyImageUpdate,
     PropertyAggregateStats, RangeStats
 )
+from app.config import settings
+from app.core.cache_invalidation import CommitScopedInvalidator
 from app.core.exceptions import AppException
+from app.utils import SimpleCache
 from app.utils.audit import AuditLogger
 from app.services.rbac_service import RBACService
+from app.services.filter_range_service import FilterRangeService
+from app.services import cover_image_service  # noqa: F401 (Session-Hooks für die Cover-Felder)
 from decimal import Decimal
-from app.mappers.property_mapper import map_property_to_overview
+from app.mappers.property_mapper import map_property_row_to_overview
 import logging
 
 logger = logging.getLogger(__name__)
 audit_logger = AuditLogger()
 
+# Statistik-Snapshots pro Tenant ("all" = Super Admin) dieses Workers
+_property_stats_cache = SimpleCache(default_ttl=settings.PROPERTY_STATS_TTL_SECONDS)
+_property_stats_invalidator = CommitScopedInvalidator(
+    _property_stats_cache,
+    lambda tenant_id: (f"property_stats:{tenant_id}", "property_stats:all")
+)
+# insert()/update()/delete() auf Property ohne Flush (Syncs, Bulk-Aktionen)
+_property_stats_invalidator.track_bulk_statements(Property)
+
+# Teile des Detail-Bundles, die per include= gewählt werden können (Images sind immer dabei)
+PROPERTY_DETAIL_INCLUDES = ("project", "city", "documents")
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_property_stats_invalidations(session, flush_context):
+    # new/dirty/deleted zeigen in after_flush noch den Stand vor dem Flush
+    tenant_ids = {
+        obj.tenant_id for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, Property)
+    }
+    if tenant_ids:
+        _property_stats_invalidator.invalidate(session, *tenant_ids)
+
+
 class PropertyService:
     """Service for managing properties"""
     
@@ -100,19 +130,12 @@ class PropertyService:
                 }
             )
             
-            # Update project status based on properties
+            # Update project status and aggregates (price and rental yield ranges)
             from app.services.project_service import ProjectService
-            ProjectService.update_project_status_from_properties(
-                db=db,
-                project_id=property.project_id,
-                tenant_id=current_user.tenant_id
-            )
-            
-            # Update project aggregates (price and rental yield ranges)
-            ProjectService.update_project_aggregates(
+            ProjectService.recompute_project_rollups(
                 db=db,
-                project_id=property.project_id,
-                tenant_id=current_user.tenant_id
+                tenant_id=current_user.tenant_id,
+                project_ids=[property.project_id]
             )
             
             # Commit and refresh with relationships
@@ -120,12 +143,8 @@ class PropertyService:
             db.refresh(property)
             
             # Load relationships for proper response
-            from sqlalchemy.orm import joinedload
             property = db.query(Property).options(
-                joinedload(Property.images),
-                joinedload(Property.city_ref).joinedload(City.images),
-                joinedload(Property.project).joinedload(Project.images),
-                joinedload(Property.project).joinedload(Project.city_ref)
+                *PropertyService._detail_options(with_micro_location=True)
             ).filter(Property.id == property.id).first()
             
             return property
@@ -142,15 +161,17 @@ class PropertyService:
     def get_property(
         db: Session,
         property_id: UUID,
-        current_user: User
+        current_user: User,
+        with_micro_location: bool = False,
+        include: Iterable[str] = ("project", "city")
     ) -> Property:
-        """Get a single property by ID"""
+        """
+        Get a single property by ID with the detail bundle parts in include (see
+        _detail_options); with_micro_location loads the project's full micro location.
+        """
         try:
             query = db.query(Property).options(
-                joinedload(Property.images),
-                joinedload(Property.city_ref).joinedload(City.images),
-                joinedload(Property.project).joinedload(Project.images),
-                joinedload(Property.project).joinedload(Project.city_ref)
+                *PropertyService._detail_options(include, with_micro_location)
             )
             
             # Apply tenant filter
@@ -175,6 +196,61 @@ class PropertyService:
                 detail=f"Failed to retrieve property: {str(e)}"
             )
     
+    @staticmethod
+    def parse_detail_include(include: Optional[str]) -> Set[str]:
+        """Comma-separated include= value of the detail endpoint; None = the whole bundle"""
+        if include is None:
+            return set(PROPERTY_DETAIL_INCLUDES)
+        parts = {part.strip() for part in include.split(",") if part.strip()}
+        unknown = parts - set(PROPERTY_DETAIL_INCLUDES)
+        if unknown:
+            raise AppException(
+                status_code=400,
+                detail=f"Invalid include: {', '.join(sorted(unknown))} (allowed: {', '.join(PROPERTY_DETAIL_INCLUDES)})"
+            )
+        return parts
+    
+    @staticmethod
+    def _detail_options(include: Iterable[str] = ("project", "city"), with_micro_location: bool = False) -> list:
+        """
+        Loader options for the property detail bundle.
+        
+        Many-to-one relations (project, cities) are joined into the property row; every
+        collection gets one selectinload statement. Joining the image collections
+        multiplied property × project × city images into one row each; now the bundle
+        is at most six statements however many images and documents there are. An
+        excluded project or city raises on access instead of lazy loading behind the
+        caller's back; documents not in include stay lazy (delete cascades need them).
+        """
+        include = set(include)
+        options = [selectinload(Property.images)]
+        
+        if "city" in include:
+            options.append(joinedload(Property.city_ref).selectinload(City.images))
+        else:
+            options.append(raiseload(Property.city_ref))
+        
+        if "project" in include or "documents" in include:
+            # Für Dokumente wird das Projekt nur wegen der geerbten Projekt-Dokumente geladen
+            project = joinedload(Property.project)
+            if "project" in include:
+                options.append(project.selectinload(Project.images))
+                if "city" in include:
+                    options.append(project.joinedload(Project.city_ref))
+                else:
+                    options.append(project.raiseload(Project.city_ref))
+                if with_micro_location:
+                    options.append(project.undefer(Project.micro_location_v2))
+            if "documents" in include:
+                options.append(project.selectinload(Project.documents))
+        else:
+            options.append(raiseload(Property.project))
+        
+        if "documents" in include:
+            options.append(selectinload(Property.documents))
+        
+        return options
+    
     @staticmethod
     def list_properties(
         db: Session,
@@ -184,12 +260,8 @@ class PropertyService:
     ) -> Dict[str, Any]:
         """List properties with filtering and pagination"""
         try:
-            # Query with images and project eagerly loaded for thumbnail and name
-            # Using subqueryload to avoid pagination issues with joins
-            query = db.query(Property).options(
-                subqueryload(Property.images),
-                subqueryload(Property.project).subqueryload(Project.images)
-            )
+            # Project is joined for search and the denormalized project fields (project_id is NOT NULL)
+            query = db.query(Property).join(Property.project)
             
             # Apply tenant filter
             # Use the tenant_id from request context (handles impersonation)
@@ -236,8 +308,6 @@ class PropertyService:
             # Apply search filter
             if filter_params.search:
                 search_term = f"%{filter_params.search}%"
-                # Join with Project to search in project name
-                query = query.join(Property.project)
                 query = query.filter(
                     or_(
                         Property.unit_number.ilike(search_term),
@@ -293,10 +363,14 @@ class PropertyService:
             if filter_params.draft is not None:
                 query = query.filter(Property.draft == filter_params.draft)
             
-            # Apply rental yield filters if specified
-            # Note: We'll need to filter after fetching since yield is calculated
-            # This is not optimal for large datasets but necessary for computed fields
-            needs_yield_filter = filter_params.min_rental_yield is not None or filter_params.max_rental_yield is not None
+            # Apply rental yield filters in SQL (same formula as the mapper; units
+            # without a computable yield are kept, as before)
+            if filter_params.min_rental_yield is not None or filter_params.max_rental_yield is not None:
+                rental_yield = PropertyService._gross_rental_yield_expression()
+                if filter_params.min_rental_yield is not None:
+                    query = query.filter(or_(rental_yield.is_(None), rental_yield >= filter_params.min_rental_yield))
+                if filter_params.max_rental_yield is not None:
+                    query = query.filter(or_(rental_yield.is_(None), rental_yield <= filter_params.max_rental_yield))
             
             # Get total count
             total = query.count()
@@ -310,32 +384,11 @@ class PropertyService:
             
             # Apply pagination
             offset = (filter_params.page - 1) * filter_params.page_size
-            properties = query.offset(offset).limit(filter_params.page_size).all()
+            rows = PropertyService._overview_projection(query).offset(offset).limit(filter_params.page_size).all()
             
-            # Convert to PropertyOverview format with computed fields
+            # Rows map straight to PropertyOverview, no ORM objects or relationship loads
             from app.schemas.business import PropertyOverview
-            items = []
-            for prop in properties:
-                # Use mapper to convert property to overview format
-                overview_data = map_property_to_overview(prop)
-                
-                # Apply rental yield filter if needed
-                if needs_yield_filter:
-                    gross_rental_yield = overview_data.get("gross_rental_yield")
-                    if filter_params.min_rental_yield is not None and gross_rental_yield is not None:
-                        if gross_rental_yield < filter_params.min_rental_yield:
-                            continue
-                    if filter_params.max_rental_yield is not None and gross_rental_yield is not None:
-                        if gross_rental_yield > filter_params.max_rental_yield:
-                            continue
-                
-                items.append(PropertyOverview(**overview_data))
-            
-            # If we filtered by yield, we need to adjust total count
-            if needs_yield_filter:
-                # This is not ideal but necessary for computed fields
-                # In production, consider adding a database column for rental yield
-                total = len(items)
+            items = [PropertyOverview(**map_property_row_to_overview(row)) for row in rows]
             
             return {
                 "items": items,
@@ -351,6 +404,55 @@ class PropertyService:
                 detail=f"Failed to list properties: {str(e)}"
             )
     
+    @staticmethod
+    def _gross_rental_yield_expression():
+        """Gross rental yield in percent (total rent incl. parking / total price), NULL if not computable"""
+        # Gleiche Rechnung wie _overview_figures in app/mappers/property_mapper.py
+        total_price = (
+            func.coalesce(Property.purchase_price, 0)
+            + func.coalesce(Property.purchase_price_parking, 0)
+            + func.coalesce(Property.purchase_price_furniture, 0)
+        )
+        total_rent = func.coalesce(Property.monthly_rent, 0) + func.coalesce(Property.rent_parking_month, 0)
+        return case(
+            (and_(total_price > 0, total_rent > 0), total_rent * 12 * 100.0 / total_price),
+            else_=None
+        )
+    
+    @staticmethod
+    def _overview_projection(query):
+        """
+        Restrict a filtered Property query (joined with Project) to the PropertyOverview
+        columns. The thumbnail is the maintained cover_thumbnail_url (first property
+        image, else the project cover), so no image rows are read.
+        """
+        return query.with_entities(
+            Property.id,
+            Property.project_id,
+            Property.unit_number,
+            Property.city,
+            Property.state,
+            Property.property_type,
+            Property.purchase_price,
+            Property.purchase_price_parking,
+            Property.purchase_price_furniture,
+            Property.monthly_rent,
+            Property.rent_parking_month,
+            Property.size_sqm,
+            Property.rooms,
+            Property.floor,
+            Property.investagon_id,
+            Property.active,
+            Property.pre_sale,
+            Property.draft,
+            Property.visibility,
+            Property.initial_maintenance_expenses,
+            Project.name.label("project_name"),
+            Project.street.label("project_street"),
+            Project.house_number.label("project_house_number"),
+            Property.cover_thumbnail_url.label("thumbnail_url")
+        )
+    
     @staticmethod
     def update_property(
         db: Session,
@@ -385,6 +487,10 @@ class PropertyService:
             for field, value in update_data.items():
                 setattr(property, field, value)
             
+            # Manual edits diverge from the last Investagon payload - force the next sync to re-apply it
+            if update_data:
+                property.investagon_data_hash = None
+            
             property.updated_by = current_user.id
             property.updated_at = datetime.now(timezone.utc)
             
@@ -402,36 +508,23 @@ class PropertyService:
                 new_values=update_data
             )
             
-            # If status was updated, update project status
-            if 'status' in update_data:
+            # If status, price, rent or maintenance fields were updated, update project status and aggregates
+            rollup_fields = {'active', 'purchase_price', 'purchase_price_parking', 'purchase_price_furniture',
+                             'monthly_rent', 'rent_parking_month', 'initial_maintenance_expenses', 'project_id'}
+            if any(field in update_data for field in rollup_fields):
                 from app.services.project_service import ProjectService
-                ProjectService.update_project_status_from_properties(
+                ProjectService.recompute_project_rollups(
                     db=db,
-                    project_id=property.project_id,
-                    tenant_id=current_user.tenant_id
-                )
-            
-            # If price or rent fields were updated, update project aggregates
-            price_fields = {'purchase_price', 'purchase_price_parking', 'purchase_price_furniture', 
-                           'monthly_rent', 'rent_parking_month'}
-            if any(field in update_data for field in price_fields):
-                from app.services.project_service import ProjectService
-                ProjectService.update_project_aggregates(
-                    db=db,
-                    project_id=property.project_id,
-                    tenant_id=current_user.tenant_id
+                    tenant_id=current_user.tenant_id,
+                    project_ids=[property.project_id, old_values.get('project_id')]
                 )
             
             # Commit and reload with relationships
             db.commit()
             
             # Load relationships for proper response
-            from sqlalchemy.orm import joinedload
             property = db.query(Property).options(
-                joinedload(Property.images),
-                joinedload(Property.city_ref).joinedload(City.images),
-                joinedload(Property.project).joinedload(Project.images),
-                joinedload(Property.project).joinedload(Project.city_ref)
+                *PropertyService._detail_options(with_micro_location=True)
             ).filter(Property.id == property.id).first()
             
             return property
@@ -486,19 +579,12 @@ class PropertyService:
             db.delete(property)
             db.flush()
             
-            # Update project status after property deletion
+            # Update project status and aggregates after property deletion
             from app.services.project_service import ProjectService
-            ProjectService.update_project_status_from_properties(
+            ProjectService.recompute_project_rollups(
                 db=db,
-                project_id=project_id,
-                tenant_id=current_user.tenant_id
-            )
-            
-            # Update project aggregates after property deletion
-            ProjectService.update_project_aggregates(
-                db=db,
-                project_id=project_id,
-                tenant_id=current_user.tenant_id
+                tenant_id=current_user.tenant_id,
+                project_ids=[project_id]
             )
             
         except AppException:
@@ -654,44 +740,67 @@ class PropertyService:
         db: Session,
         current_user: User
     ) -> Dict[str, Any]:
-        """Get property statistics for the tenant"""
+        """Get property statistics for the tenant (cached snapshot, see _compute_property_stats)"""
+        tenant_id = None if current_user.is_super_admin else current_user.tenant_id
+        key = f"property_stats:{tenant_id or 'all'}"
+        
+        stats = _property_stats_cache.get(key)
+        if stats is None:
+            stats = PropertyService._compute_property_stats(db, tenant_id)
+            _property_stats_cache.set(key, stats)
+        return dict(stats)
+    
+    @staticmethod
+    def _compute_property_stats(db: Session, tenant_id: Optional[UUID]) -> Dict[str, Any]:
+        """
+        All figures in one scan: status counts via COUNT(*) FILTER, type and city
+        breakdowns via GROUPING SETS. tenant_id None = all tenants (super admin).
+        """
         try:
-            query = db.query(Property)
+            query = db.query(
+                Property.property_type,
+                Property.city,
+                # Bit 1: property_type aggregiert, Bit 0: city aggregiert
+                func.grouping(Property.property_type, Property.city).label("grouping"),
+                func.count().label("total"),
+                func.count().filter(Property.active == 1).label("available"),  # Frei
+                func.count().filter(Property.active.in_([5, 6])).label("reserved"),  # Angefragt + Reserviert
+                func.count().filter(Property.active.in_([0, 7, 9])).label("sold"),  # Verkauft + Notartermin + Notarvorbereitung
+                func.sum(Property.purchase_price).label("total_value"),
+                func.avg(Property.purchase_price).label("avg_price")
+            )
             
             # Apply tenant filter if not super admin
-            if not current_user.is_super_admin:
-                query = query.filter(Property.tenant_id == current_user.tenant_id)
-            
-            total_properties = query.count()
-            # Count by active status values - handle nullable active field
-            available_properties = query.filter(
-                and_(Property.active.is_not(None), Property.active == 1)
-            ).count()  # Frei
-            reserved_properties = query.filter(
-                and_(Property.active.is_not(None), Property.active.in_([5, 6]))
-            ).count()  # Angefragt + Reserviert
-            sold_properties = query.filter(
-                and_(Property.active.is_not(None), Property.active.in_([0, 7, 9]))
-            ).count()  # Verkauft + Notartermin + Notarvorbereitung
-            
-            # Get value statistics
-            total_value = db.query(func.sum(Property.purchase_price)).filter(
-                Property.tenant_id == current_user.tenant_id
-            ).scalar() or Decimal('0')
-            
-            avg_price = db.query(func.avg(Property.purchase_price)).filter(
-                Property.tenant_id == current_user.tenant_id
-            ).scalar() or Decimal('0')
+            if tenant_id:
+                query = query.filter(Property.tenant_id == tenant_id)
+            
+            rows = query.group_by(
+                func.grouping_sets(tuple_(), Property.property_type, Property.city)
+            ).all()
+            
+            totals = None
+            by_type = []
+            by_city = []
+            for row in rows:
+                if row.grouping == 3:
+                    totals = row
+                elif row.grouping == 1:
+                    by_type.append({"type": row.property_type, "count": row.total})
+                else:
+                    by_city.append({"city": row.city, "count": row.total})
+            
+            by_type.sort(key=lambda item: item["count"], reverse=True)
+            by_city.sort(key=lambda item: item["count"], reverse=True)
             
             return {
-                "total_properties": total_properties,
-                "available_properties": available_properties,
-                "reserved_properties": reserved_properties,
-                "sold_properties": sold_properties,
-                "total_portfolio_value": float(total_value),
-                "average_property_price": float(avg_price),
-                "properties_by_type": PropertyService._get_properties_by_type(db, query),
-                "properties_by_city": PropertyService._get_properties_by_city(db, query)
+                "total_properties": totals.total,
+                "available_properties": totals.available,
+                "reserved_properties": totals.reserved,
+                "sold_properties": totals.sold,
+                "total_portfolio_value": float(totals.total_value or Decimal('0')),
+                "average_property_price": float(totals.avg_price or Decimal('0')),
+                "properties_by_type": by_type,
+                "properties_by_city": by_city[:10]
             }
             
         except Exception as e:
@@ -700,97 +809,36 @@ class PropertyService:
                 detail=f"Failed to get property statistics: {str(e)}"
             )
     
-    @staticmethod
-    def _get_properties_by_type(db: Session, base_query) -> List[Dict[str, Any]]:
-        """Get property count by type"""
-        results = base_query.with_entities(
-            Property.property_type,
-            func.count(Property.id).label('count')
-        ).group_by(Property.property_type).all()
-        
-        return [{"type": r[0], "count": r[1]} for r in results]
-    
-    @staticmethod
-    def _get_properties_by_city(db: Session, base_query) -> List[Dict[str, Any]]:
-        """Get property count by city"""
-        results = base_query.with_entities(
-            Property.city,
-            func.count(Property.id).label('count')
-        ).group_by(Property.city).order_by(func.count(Property.id).desc()).limit(10).all()
-        
-        return [{"city": r[0], "count": r[1]} for r in results]
-    
     @staticmethod
     def get_aggregate_stats(
         db: Session,
         tenant_id: UUID,
         current_user: User
     ) -> PropertyAggregateStats:
-        """Get aggregate statistics for all properties in the tenant"""
+        """Get aggregate statistics for all properties in the tenant (precomputed ranges)"""
         try:
-            # Base query for properties
-            query = db.query(Property).filter(Property.tenant_id == tenant_id)
-            
-            # Check user permissions
-            is_admin_or_manager = current_user.is_super_admin
-            if not is_admin_or_manager:
-                permissions = RBACService.get_user_permissions(
-                    db, current_user.id, current_user.tenant_id
-                )
-                permission_names = [p["name"] for p in permissions.get("permissions", [])]
-                is_admin_or_manager = "properties:update" in permission_names
-            
-            # Apply visibility filter for non-admin users
-            if not is_admin_or_manager:
-                query = query.filter(Property.visibility == 1)
-            
-            # Get aggregate statistics
-            stats = db.query(
-                func.min(Property.purchase_price).label('min_price'),
-                func.max(Property.purchase_price).label('max_price'),
-                func.min(Property.size_sqm).label('min_size'),
-                func.max(Property.size_sqm).label('max_size'),
-                func.min(Property.rooms).label('min_rooms'),
-                func.max(Property.rooms).label('max_rooms')
-            ).filter(
-                Property.id.in_(query.with_entities(Property.id))
-            ).first()
-            
-            # Get rental yield range from properties with valid data
-            yield_subquery = query.filter(
-                and_(
-                    Property.purchase_price > 0,
-                    Property.monthly_rent > 0
-                )
-            ).with_entities(
-                (
-                    ((Property.monthly_rent + func.coalesce(Property.rent_parking_month, 0)) * 12 * 100.0) / 
-                    (Property.purchase_price + func.coalesce(Property.purchase_price_parking, 0) + func.coalesce(Property.purchase_price_furniture, 0))
-                ).label('rental_yield')
-            ).subquery()
-            
-            yield_stats = db.query(
-                func.min(yield_subquery.c.rental_yield).label('min_yield'),
-                func.max(yield_subquery.c.rental_yield).label('max_yield')
-            ).first()
+            # Non-admin users only see visible properties
+            ranges = FilterRangeService.get_property_ranges(
+                db, tenant_id, FilterRangeService.visibility_class(db, current_user)
+            )
             
             # Convert to response format
             return PropertyAggregateStats(
                 price_range=RangeStats(
-                    min=float(stats.min_price) if stats.min_price else 0,
-                    max=float(stats.max_price) if stats.max_price else 1000000
+                    min=ranges["min_price"] or 0,
+                    max=ranges["max_price"] or 1000000
                 ),
                 size_range=RangeStats(
-                    min=float(stats.min_size) if stats.min_size else 0,
-                    max=float(stats.max_size) if stats.max_size else 200
+                    min=ranges["min_size"] or 0,
+                    max=ranges["max_size"] or 200
                 ),
                 rooms_range=RangeStats(
-                    min=float(stats.min_rooms) if stats.min_rooms else 1,
-                    max=float(stats.max_rooms) if stats.max_rooms else 5
+                    min=ranges["min_rooms"] or 1,
+                    max=ranges["max_rooms"] or 5
                 ),
                 rental_yield_range=RangeStats(
-                    min=float(yield_stats.min_yield) if yield_stats.min_yield else 0,
-                    max=float(yield_stats.max_yield) if yield_stats.max_yield else 10
+                    min=ranges["min_yield"] or 0,
+                    max=ranges["max_yield"] or 10
                 )
             )
             
@@ -6,6 +6,8 @@ import boto3
 from botocore.exceptions import NoCredentialsError, ClientError
 from fastapi import UploadFile
 from typing import Optional, Dict, Any, Tuple, BinaryIO
+import asyncio
+import functools
 import uuid
 import mimetypes
 from datetime import datetime, timedelta, timezone
@@ -15,6 +17,7 @@ import logging
 
 from app.config import settings
 from app.core.exceptions import AppException
+from app.core.metrics import track_outbound
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +83,14 @@ class S3Service:
                 logger.error(f"Error accessing S3 bucket: {str(e)}")
                 self.s3_client = None
     
+    async def _put_object(self, **kwargs) -> Dict[str, Any]:
+        """put_object im Threadpool, damit der Upload den Event Loop nicht blockiert"""
+        loop = asyncio.get_running_loop()
+        with track_outbound("s3") as result:
+            response = await loop.run_in_executor(None, functools.partial(self.s3_client.put_object, **kwargs))
+            result["status"] = response.get("ResponseMetadata", {}).get("HTTPStatusCode", 200)
+        return response
+    
     async def upload_image(
         self,
         file: UploadFile,
@@ -165,7 +176,7 @@ class S3Service:
             s3_key = f"{tenant_id}/{folder}/{unique_filename}"
             
             # Upload to S3
-            self.s3_client.put_object(
+            await self._put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
                 Body=image_data,
@@ -409,7 +420,7 @@ class S3Service:
             s3_key = f"{tenant_id}/{folder}/{unique_filename}"
             
             # Upload to S3
-            self.s3_client.put_object(
+            await self._put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
                 Body=image_data,
@@ -550,7 +561,7 @@ class S3Service:
             s3_key = f"{tenant_id}/{folder}/{unique_filename}"
             
             # Upload to S3
-            self.s3_client.put_object(
+            await self._put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
                 Body=content,
@@ -586,6 +597,35 @@ class S3Service:
                 detail="Failed to upload file"
             )
     
+    def upload_fileobj(
+        self,
+        fileobj: BinaryIO,
+        s3_key: str,
+        content_type: str,
+        metadata: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Upload a (possibly large) file object as a private object, multipart where needed.
+        Blocking - call from a worker thread (e.g. a background job).
+        """
+        if not self.is_configured():
+            raise AppException(
+                status_code=503,
+                detail="File storage service is not available"
+            )
+        
+        with track_outbound("s3") as result:
+            self.s3_client.upload_fileobj(
+                fileobj,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs={
+                    'ContentType': content_type,
+                    'Metadata': metadata or {}
+                }
+            )
+            result["status"] = 200
+    
     def delete_file(self, s3_key: str) -> bool:
         """
         Delete a file from S3-compatible storage
@@ -0,0 +1,467 @@
+# ================================
+# TENANT EXPORT SERVICE (services/tenant_export_service.py)
+# ================================
+
+from sqlalchemy import select, desc
+from sqlalchemy.orm import Session
+from typing import List, Optional, Dict, Any, Iterator, Iterable
+from datetime import datetime, timezone
+from decimal import Decimal
+import enum
+import json
+import logging
+import uuid
+import zlib
+
+from app.config import settings
+from app.core.database import SessionLocal, set_tenant_context
+from app.core.db_routing import use_replica
+from app.core.exceptions import AppException
+from app.models.audit import AuditLog
+from app.models.business import Project, ProjectDocument
+from app.models.rbac import Role, UserRole
+from app.models.tenant import Tenant
+from app.models.user import User
+from app.services.export_job_service import (
+    GZIP_MEDIA_TYPE, FLUSH_BYTES, ExportJobRegistry, gzip_compressor, spooled
+)
+
+logger = logging.getLogger(__name__)
+
+# Reihenfolge der Sektionen im Export; resume_from setzt bei einer davon wieder auf
+EXPORT_SECTIONS = ("tenant_info", "users", "projects", "audit_logs")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+_export_jobs = ExportJobRegistry()
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _str(value) -> Optional[str]:
+    return str(value) if value else None
+
+
+def _json_default(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return str(value)
+
+
+class TenantExportService:
+    """
+    Streaming export of a tenant's data as NDJSON.
+    
+    Every line is one JSON object: ``{"section": ..., "data": {...}}`` per record, plus
+    progress events (``section_start``, ``section_end`` with the record count, and finally
+    ``export_complete`` or ``export_error``). Sections are read through server-side cursors
+    in batches of EXPORT_BATCH_SIZE and roles/documents are loaded once per batch,
+    so memory stays flat regardless of tenant size. A download that broke off is resumed
+    with ``resume_from`` set to the first section without ``section_end``.
+    """
+    
+    @staticmethod
+    def resolve_sections(
+        include_users: bool,
+        include_projects: bool,
+        include_audit_logs: bool,
+        resume_from: Optional[str] = None
+    ) -> List[str]:
+        """Sections to export, in export order, starting at resume_from"""
+        included = {
+            "tenant_info": True,
+            "users": include_users,
+            "projects": include_projects,
+            "audit_logs": include_audit_logs
+        }
+        sections = [section for section in EXPORT_SECTIONS if included[section]]
+        
+        if resume_from:
+            if resume_from not in sections:
+                raise AppException(
+                    f"Unknown or excluded export section: {resume_from}", 400, "INVALID_EXPORT_SECTION"
+                )
+            sections = sections[sections.index(resume_from):]
+        
+        return sections
+    
+    # ================================
+    # SECTION READERS
+    # ================================
+    
+    @staticmethod
+    def _stream(db: Session, statement) -> Iterator[List[Any]]:
+        """Rows of statement in batches from a server-side cursor"""
+        result = db.execute(statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        try:
+            yield from result.partitions()
+        finally:
+            result.close()
+    
+    @staticmethod
+    def _iter_tenant_info(db: Session, tenant_id: uuid.UUID) -> Iterator[Dict[str, Any]]:
+        tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
+        if not tenant:
+            raise AppException("Tenant not found", 404, "TENANT_NOT_FOUND")
+        
+        yield {
+            "id": str(tenant.id),
+            "name": tenant.name,
+            "slug": tenant.slug,
+            "domain": tenant.domain,
+            "settings": tenant.settings,
+            "subscription_plan": tenant.subscription_plan,
+            "max_users": tenant.max_users,
+            "created_at": tenant.created_at.isoformat(),
+            "export_timestamp": datetime.utcnow().isoformat()
+        }
+    
+    @staticmethod
+    def _iter_users(db: Session, tenant_id: uuid.UUID) -> Iterator[Dict[str, Any]]:
+        statement = select(
+            User.id,
+            User.email,
+            User.first_name,
+            User.last_name,
+            User.auth_method,
+            User.is_active,
+            User.is_verified,
+            User.created_at,
+            User.last_login_at
+        ).where(
+            User.tenant_id == tenant_id
+        ).order_by(User.created_at, User.id)
+        
+        for batch in TenantExportService._stream(db, statement):
+            # Rollen für den ganzen Batch in einer Query
+            roles: Dict[uuid.UUID, List[str]] = {}
+            role_rows = db.execute(
+                select(UserRole.user_id, Role.name).join(
+                    Role, Role.id == UserRole.role_id
+                ).where(
+                    UserRole.tenant_id == tenant_id,
+                    UserRole.user_id.in_([row.id for row in batch])
+                )
+            )
+            for user_id, role_name in role_rows:
+                roles.setdefault(user_id, []).append(role_name)
+            
+            for row in batch:
+                yield {
+                    "id": str(row.id),
+                    "email": row.email,
+                    "first_name": row.first_name,
+                    "last_name": row.last_name,
+                    "auth_method": row.auth_method,
+                    "is_active": row.is_active,
+                    "is_verified": row.is_verified,
+                    "created_at": _iso(row.created_at),
+                    "last_login_at": _iso(row.last_login_at),
+                    "roles": roles.get(row.id, [])
+                }
+    
+    @staticmethod
+    def _iter_projects(db: Session, tenant_id: uuid.UUID) -> Iterator[Dict[str, Any]]:
+        statement = select(
+            Project.id,
+            Project.name,
+            Project.description,
+            Project.status,
+            Project.created_at,
+            Project.created_by
+        ).where(
+            Project.tenant_id == tenant_id
+        ).order_by(Project.created_at, Project.id)
+        
+        for batch in TenantExportService._stream(db, statement):
+            # Dokumente für den ganzen Batch in einer Query
+            documents: Dict[uuid.UUID, List[Dict[str, Any]]] = {}
+            document_rows = db.execute(
+                select(
+                    ProjectDocument.project_id,
+                    ProjectDocument.id,
+                    ProjectDocument.title,
+                    ProjectDocument.file_size,
+                    ProjectDocument.mime_type,
+                    ProjectDocument.uploaded_at,
+                    ProjectDocument.uploaded_by
+                ).where(
+                    ProjectDocument.tenant_id == tenant_id,
+                    ProjectDocument.project_id.in_([row.id for row in batch])
+                ).order_by(ProjectDocument.project_id, ProjectDocument.display_order)
+            )
+            for doc in document_rows:
+                documents.setdefault(doc.project_id, []).append({
+                    "id": str(doc.id),
+                    "title": doc.title,
+                    "file_size": doc.file_size,
+                    "mime_type": doc.mime_type,
+                    "created_at": _iso(doc.uploaded_at),
+                    "created_by": _str(doc.uploaded_by)
+                })
+            
+            for row in batch:
+                yield {
+                    "id": str(row.id),
+                    "name": row.name,
+                    "description": row.description,
+                    "status": row.status,
+                    "created_at": _iso(row.created_at),
+                    "created_by": _str(row.created_by),
+                    "documents": documents.get(row.id, [])
+                }
+    
+    @staticmethod
+    def _iter_audit_logs(db: Session, tenant_id: uuid.UUID) -> Iterator[Dict[str, Any]]:
+        statement = select(
+            AuditLog.action,
+            AuditLog.resource_type,
+            AuditLog.resource_id,
+            AuditLog.user_id,
+            AuditLog.created_at,
+            AuditLog.ip_address
+        ).where(
+            AuditLog.tenant_id == tenant_id
+        ).order_by(desc(AuditLog.created_at)).limit(settings.TENANT_EXPORT_AUDIT_LOG_LIMIT)
+        
+        for batch in TenantExportService._stream(db, statement):
+            for row in batch:
+                yield {
+                    "action": row.action,
+                    "resource_type": row.resource_type,
+                    "resource_id": _str(row.resource_id),
+                    "user_id": _str(row.user_id),
+                    "created_at": _iso(row.created_at),
+                    "ip_address": _str(row.ip_address)
+                }
+    
+    # ================================
+    # NDJSON STREAM
+    # ================================
+    
+    @staticmethod
+    def iter_records(db: Session, tenant_id: uuid.UUID, sections: Iterable[str]) -> Iterator[Dict[str, Any]]:
+        """Records and progress events of the export, in section order"""
+        for section in sections:
+            reader = getattr(TenantExportService, f"_iter_{section}")
+            yield {"section": section, "event": "section_start"}
+            
+            count = 0
+            for record in reader(db, tenant_id):
+                count += 1
+                yield {"section": section, "data": record}
+            
+            yield {"section": section, "event": "section_end", "count": count}
+    
+    @staticmethod
+    def encode_ndjson(records: Iterable[Dict[str, Any]], compress: bool = False) -> Iterator[bytes]:
+        """NDJSON chunks of ~64 KB; gzip is written incrementally and flushed after each event"""
+        compressor = gzip_compressor() if compress else None
+        buffer = bytearray()
+        
+        for record in records:
+            buffer += json.dumps(record, default=_json_default, ensure_ascii=False).encode("utf-8")
+            buffer += b"\n"
+            is_event = "event" in record
+            if len(buffer) < FLUSH_BYTES and not is_event:
+                continue
+            
+            chunk = bytes(buffer)
+            buffer.clear()
+            if compressor:
+                # Sync-Flush nach Events, damit der Fortschritt auch komprimiert sofort ankommt
+                chunk = compressor.compress(chunk) + (compressor.flush(zlib.Z_SYNC_FLUSH) if is_event else b"")
+            if chunk:
+                yield chunk
+        
+        tail = bytes(buffer)
+        if compressor:
+            tail = compressor.compress(tail) + compressor.flush()
+        if tail:
+            yield tail
+    
+    @staticmethod
+    def stream_export(
+        tenant_id: uuid.UUID,
+        sections: List[str],
+        compress: bool = False,
+        user_id: Optional[uuid.UUID] = None
+    ) -> Iterator[bytes]:
+        """
+        Export as NDJSON bytes for a StreamingResponse.
+        
+        Runs on its own session: the request session is closed as soon as the response
+        starts. After the first byte the status code is fixed, so errors end the stream
+        with an ``export_error`` event naming the section to resume from.
+        """
+        db = SessionLocal()
+        try:
+            use_replica(db, user_id)
+            set_tenant_context(db, tenant_id)
+            records = TenantExportService._with_outcome(db, tenant_id, sections)
+            yield from TenantExportService.encode_ndjson(records, compress)
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _with_outcome(db: Session, tenant_id: uuid.UUID, sections: List[str]) -> Iterator[Dict[str, Any]]:
+        section = None
+        try:
+            for record in TenantExportService.iter_records(db, tenant_id, sections):
+                section = record["section"]
+                yield record
+        except Exception as e:
+            logger.error(f"Tenant export {tenant_id} failed in section {section}: {str(e)}")
+            yield {"event": "export_error", "detail": "Export aborted", "resume_from": section}
+            return
+        
+        yield {"event": "export_complete", "sections": sections}
+    
+    # ================================
+    # EXPORT JOBS (S3)
+    # ================================
+    
+    @staticmethod
+    def export_key(tenant_id: uuid.UUID, job_id: str, section: str) -> str:
+        return f"{tenant_id}/exports/{job_id}/{section}.ndjson.gz"
+    
+    @staticmethod
+    def create_job(
+        tenant_id: uuid.UUID,
+        sections: List[str],
+        user_id: uuid.UUID,
+        job_id: Optional[uuid.UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Register an export job. Passing the ID of an earlier job resumes it: sections
+        already in S3 are skipped.
+        """
+        return _export_jobs.add({
+            "job_id": str(job_id or uuid.uuid4()),
+            "tenant_id": str(tenant_id),
+            "user_id": user_id,
+            "status": "pending",
+            "sections": sections,
+            "completed_sections": [],
+            "current_section": None,
+            "records": {},
+            "error": None,
+            "created_at": datetime.now(timezone.utc),
+            "completed_at": None
+        })
+    
+    @staticmethod
+    def run_job(job_id: str) -> None:
+        """
+        Write the export to S3, one gzip NDJSON object per section (blocking, meant for a
+        background task). Each section is spooled to disk past EXPORT_SPOOL_MB and
+        uploaded once complete, so an object in S3 always holds a whole section.
+        """
+        from app.services.s3_service import get_s3_service
+        
+        job = _export_jobs.get(job_id)
+        tenant_id = uuid.UUID(job["tenant_id"])
+        s3 = get_s3_service()
+        db = SessionLocal()
+        try:
+            use_replica(db, job["user_id"])
+            set_tenant_context(db, tenant_id)
+            job["status"] = "running"
+            
+            for section in job["sections"]:
+                key = TenantExportService.export_key(tenant_id, job_id, section)
+                if s3.get_image_info(key):
+                    # Aus einem früheren Lauf dieses Jobs vorhanden
+                    job["completed_sections"].append(section)
+                    continue
+                
+                job["current_section"] = section
+                job["records"][section] = 0
+                records = TenantExportService._track_progress(
+                    job, TenantExportService.iter_records(db, tenant_id, [section])
+                )
+                
+                with spooled(TenantExportService.encode_ndjson(records, compress=True)) as (spool, _):
+                    s3.upload_fileobj(
+                        spool, key, GZIP_MEDIA_TYPE,
+                        metadata={
+                            "tenant_id": str(tenant_id),
+                            "section": section,
+                            "records": str(job["records"][section])
+                        }
+                    )
+                
+                # Lesende Transaktion zwischen den Sektionen beenden
+                db.commit()
+                job["completed_sections"].append(section)
+            
+            job["status"] = "completed"
+            job["current_section"] = None
+        
+        except Exception as e:
+            logger.error(f"Tenant export job {job_id} failed in section {job['current_section']}: {str(e)}")
+            job["status"] = "failed"
+            job["error"] = e.detail if isinstance(e, AppException) else "Export failed"
+        
+        finally:
+            job["completed_at"] = datetime.now(timezone.utc)
+            db.close()
+    
+    @staticmethod
+    def _track_progress(job: Dict[str, Any], records: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for record in records:
+            if "data" in record:
+                job["records"][record["section"]] += 1
+            yield record
+    
+    @staticmethod
+    def get_job(tenant_id: uuid.UUID, job_id: uuid.UUID) -> Dict[str, Any]:
+        """
+        Progress of an export job plus download URLs of the finished sections.
+        
+        Progress is only known to the worker running the job; elsewhere the state is
+        derived from the section objects in S3 (status "unknown").
+        """
+        from app.services.s3_service import get_s3_service
+        
+        s3 = get_s3_service()
+        job = _export_jobs.get(str(job_id))
+        if job and job["tenant_id"] != str(tenant_id):
+            job = None
+        
+        if job:
+            status = {key: value for key, value in job.items() if key != "user_id"}
+            status["completed_sections"] = list(job["completed_sections"])
+            status["records"] = dict(job["records"])
+        else:
+            completed = [
+                section for section in EXPORT_SECTIONS
+                if s3.get_image_info(TenantExportService.export_key(tenant_id, job_id, section))
+            ]
+            if not completed:
+                raise AppException("Export job not found", 404, "EXPORT_JOB_NOT_FOUND")
+            status = {
+                "job_id": str(job_id),
+                "tenant_id": str(tenant_id),
+                "status": "unknown",
+                "completed_sections": completed
+            }
+        
+        if status["status"] == "failed":
+            pending = [section for section in status["sections"] if section not in status["completed_sections"]]
+            status["resume_from"] = pending[0] if pending else None
+        
+        status["downloads"] = {
+            section: s3.generate_presigned_url(
+                TenantExportService.export_key(tenant_id, job_id, section),
+                expiration=settings.EXPORT_DOWNLOAD_URL_EXPIRY_SECONDS
+            )
+            for section in status["completed_sections"]
+        }
+        return status
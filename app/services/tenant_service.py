@@ -544,119 +544,6 @@ class TenantService:
         
         return clone_summary
     
-    @staticmethod
-    def export_tenant_data(
-        db: Session,
-        tenant_id: uuid.UUID,
-        include_users: bool,
-        include_projects: bool,
-        include_audit_logs: bool
-    ) -> Dict[str, Any]:
-        """Export tenant data for backup/migration"""
-        tenant = db.query(Tenant).filter(Tenant.id == tenant_id).first()
-        if not tenant:
-            raise AppException("Tenant not found", 404, "TENANT_NOT_FOUND")
-        
-        export_data = {
-            "tenant_info": {
-                "id": str(tenant.id),
-                "name": tenant.name,
-                "slug": tenant.slug,
-                "domain": tenant.domain,
-                "settings": tenant.settings,
-                "subscription_plan": tenant.subscription_plan,
-                "max_users": tenant.max_users,
-                "created_at": tenant.created_at.isoformat(),
-                "export_timestamp": datetime.utcnow().isoformat()
-            }
-        }
-        
-        # Export users
-        if include_users:
-            users = db.query(User).filter(User.tenant_id == tenant_id).all()
-            export_data["users"] = []
-            
-            for user in users:
-                user_data = {
-                    "id": str(user.id),
-                    "email": user.email,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name,
-                    "auth_method": user.auth_method,
-                    "is_active": user.is_active,
-                    "is_verified": user.is_verified,
-                    "created_at": user.created_at.isoformat(),
-                    "last_login_at": user.last_login_at.isoformat() if user.last_login_at else None
-                }
-                
-                # Get user roles
-                from app.models.rbac import UserRole, Role
-                user_roles = db.query(Role).join(UserRole).filter(
-                    UserRole.user_id == user.id,
-                    UserRole.tenant_id == tenant_id
-                ).all()
-                user_data["roles"] = [role.name for role in user_roles]
-                
-                export_data["users"].append(user_data)
-        
-        # Export projects and documents
-        if include_projects:
-            try:
-                from app.models.business import Project, Document
-                
-                projects = db.query(Project).filter(Project.tenant_id == tenant_id).all()
-                export_data["projects"] = []
-                
-                for project in projects:
-                    project_data = {
-                        "id": str(project.id),
-                        "name": project.name,
-                        "description": project.description,
-                        "status": project.status,
-                        "created_at": project.created_at.isoformat(),
-                        "created_by": str(project.created_by)
-                    }
-                    
-                    # Get project documents
-                    documents = db.query(Document).filter(Document.project_id == project.id).all()
-                    project_data["documents"] = []
-                    
-                    for doc in documents:
-                        doc_data = {
-                            "id": str(doc.id),
-                            "title": doc.title,
-                            "file_size": doc.file_size,
-                            "mime_type": doc.mime_type,
-                            "created_at": doc.created_at.isoformat(),
-                            "created_by": str(doc.created_by)
-                        }
-                        project_data["documents"].append(doc_data)
-                    
-                    export_data["projects"].append(project_data)
-            
-            except ImportError:
-                export_data["projects"] = "Business models not available"
-        
-        # Export audit logs (optional)
-        if include_audit_logs:
-            recent_logs = db.query(AuditLog).filter(
-                AuditLog.tenant_id == tenant_id
-            ).order_by(desc(AuditLog.created_at)).limit(1000).all()
-            
-            export_data["audit_logs"] = []
-            for log in recent_logs:
-                log_data = {
-                    "action": log.action,
-                    "resource_type": log.resource_type,
-                    "resource_id": str(log.resource_id) if log.resource_id else None,
-                    "user_id": str(log.user_id) if log.user_id else None,
-                    "created_at": log.created_at.isoformat(),
-                    "ip_address": str(log.ip_address) if log.ip_address else None
-                }
-                export_data["audit_logs"].append(log_data)
-        
-        return export_data
-    
     @staticmethod
     def get_tenant_usage_report(
         db: Session,
@@ -0,0 +1,356 @@
+# ================================
+# USER EXPORT SERVICE (services/user_export_service.py)
+# ================================
+
+from sqlalchemy import select, and_, func
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any, Iterator
+from datetime import datetime, timezone
+import csv
+import io
+import json
+import logging
+import tempfile
+import uuid
+
+from app.config import settings
+from app.core.database import SessionLocal, set_tenant_context
+from app.core.db_routing import use_replica
+from app.core.exceptions import AppException
+from app.models.rbac import Role, UserRole
+from app.models.user import User
+from app.services.export_job_service import (
+    GZIP_MEDIA_TYPE, FLUSH_BYTES, ExportJobRegistry, gzip_chunks, spooled
+)
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "json": "application/json",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+EXPORT_FIELDS = [
+    "id", "tenant_id", "email", "first_name", "last_name", "auth_method",
+    "is_active", "is_verified", "created_at", "last_login_at", "roles"
+]
+
+_READ_CHUNK_BYTES = 256 * 1024
+
+_export_jobs = ExportJobRegistry()
+
+
+class UserExportService:
+    """
+    User export as CSV, JSON or XLSX with constant memory.
+    
+    Users and their role names come from one grouped query read through a server-side
+    cursor (EXPORT_BATCH_SIZE rows per fetch) and are encoded batch by batch. CSV and
+    JSON go straight to the response, optionally gzip-compressed; XLSX (a zip container)
+    is written to a spooled temp file first. Large exports run as a job that uploads to
+    S3 and hands out a presigned link.
+    """
+    
+    @staticmethod
+    def check_format(format: str) -> None:
+        """Raise before the response starts if the format can't be produced"""
+        if format not in EXPORT_FORMATS:
+            raise AppException(
+                f"Unsupported export format: {format}", 400, "INVALID_EXPORT_FORMAT"
+            )
+        if format == "xlsx":
+            try:
+                import openpyxl  # noqa: F401
+            except ImportError:
+                raise AppException(
+                    "XLSX export is not available (openpyxl not installed)", 501, "XLSX_UNAVAILABLE"
+                )
+    
+    @staticmethod
+    def media_type(format: str, compress: bool) -> str:
+        return GZIP_MEDIA_TYPE if UserExportService._gzipped(format, compress) else EXPORT_FORMATS[format]
+    
+    @staticmethod
+    def filename(format: str, compress: bool) -> str:
+        name = f"users-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.{format}"
+        return name + ".gz" if UserExportService._gzipped(format, compress) else name
+    
+    @staticmethod
+    def _gzipped(format: str, compress: bool) -> bool:
+        # XLSX ist bereits ein Zip-Container
+        return compress and format != "xlsx"
+    
+    # ================================
+    # ROWS
+    # ================================
+    
+    @staticmethod
+    def _iter_rows(db: Session, tenant_id: Optional[uuid.UUID]) -> Iterator[Dict[str, Any]]:
+        """Users with their role names (tenant_id None = all tenants)"""
+        roles = func.array_agg(Role.name).filter(Role.id.isnot(None))
+        statement = select(
+            User.id,
+            User.tenant_id,
+            User.email,
+            User.first_name,
+            User.last_name,
+            User.auth_method,
+            User.is_active,
+            User.is_verified,
+            User.created_at,
+            User.last_login_at,
+            roles.label("roles")
+        ).outerjoin(
+            UserRole, and_(UserRole.user_id == User.id, UserRole.tenant_id == User.tenant_id)
+        ).outerjoin(
+            Role, Role.id == UserRole.role_id
+        ).group_by(User.id).order_by(User.created_at, User.id)
+        
+        if tenant_id:
+            statement = statement.where(User.tenant_id == tenant_id)
+        
+        result = db.execute(statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        try:
+            for batch in result.partitions():
+                for row in batch:
+                    yield {
+                        "id": str(row.id),
+                        "tenant_id": str(row.tenant_id) if row.tenant_id else None,
+                        "email": row.email,
+                        "first_name": row.first_name,
+                        "last_name": row.last_name,
+                        "auth_method": row.auth_method,
+                        "is_active": row.is_active,
+                        "is_verified": row.is_verified,
+                        "created_at": row.created_at.isoformat(),
+                        "last_login_at": row.last_login_at.isoformat() if row.last_login_at else None,
+                        "roles": sorted(row.roles or [])
+                    }
+        finally:
+            result.close()
+    
+    # ================================
+    # ENCODERS
+    # ================================
+    
+    @staticmethod
+    def _encode_csv(rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        
+        for row in rows:
+            writer.writerow([
+                "; ".join(row[field]) if field == "roles" else row[field]
+                for field in EXPORT_FIELDS
+            ])
+            if buffer.tell() >= FLUSH_BYTES:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        
+        yield buffer.getvalue().encode("utf-8")
+    
+    @staticmethod
+    def _encode_json(rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+        """Same shape as before ({"users": [...], "total": n}), written as it is read"""
+        buffer = io.StringIO()
+        buffer.write('{"users": [')
+        total = 0
+        
+        for row in rows:
+            if total:
+                buffer.write(", ")
+            buffer.write(json.dumps(row, ensure_ascii=False))
+            total += 1
+            if buffer.tell() >= FLUSH_BYTES:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        
+        buffer.write(f'], "total": {total}}}')
+        yield buffer.getvalue().encode("utf-8")
+    
+    @staticmethod
+    def _encode_xlsx(rows: Iterator[Dict[str, Any]]) -> Iterator[bytes]:
+        from openpyxl import Workbook
+        
+        # Write-only Workbook hält nur die aktuelle Zeile; das Zip braucht aber eine seekbare Datei
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet("Users")
+        sheet.append(EXPORT_FIELDS)
+        for row in rows:
+            sheet.append([
+                "; ".join(row[field]) if field == "roles" else row[field]
+                for field in EXPORT_FIELDS
+            ])
+        
+        with tempfile.SpooledTemporaryFile(max_size=settings.EXPORT_SPOOL_MB * 1024 * 1024) as spool:
+            workbook.save(spool)
+            spool.seek(0)
+            while True:
+                chunk = spool.read(_READ_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+    
+    @staticmethod
+    def iter_export(
+        db: Session,
+        tenant_id: Optional[uuid.UUID],
+        format: str,
+        compress: bool = False
+    ) -> Iterator[bytes]:
+        """Encoded export in chunks"""
+        encoder = getattr(UserExportService, f"_encode_{format}")
+        chunks = encoder(UserExportService._iter_rows(db, tenant_id))
+        if UserExportService._gzipped(format, compress):
+            chunks = gzip_chunks(chunks)
+        return chunks
+    
+    @staticmethod
+    def stream_export(
+        tenant_id: Optional[uuid.UUID],
+        format: str,
+        compress: bool = False,
+        user_id: Optional[uuid.UUID] = None
+    ) -> Iterator[bytes]:
+        """
+        Export for a StreamingResponse, on its own session (the request session is closed
+        as soon as the response starts). An error after the first byte can only abort the
+        download, which the client sees as an incomplete transfer.
+        """
+        db = SessionLocal()
+        try:
+            use_replica(db, user_id)
+            set_tenant_context(db, tenant_id)
+            yield from UserExportService.iter_export(db, tenant_id, format, compress)
+        except Exception as e:
+            logger.error(f"User export ({format}) failed: {str(e)}")
+            raise
+        finally:
+            db.close()
+    
+    # ================================
+    # EXPORT JOBS (S3)
+    # ================================
+    
+    @staticmethod
+    def export_key(tenant_id: Optional[uuid.UUID], job_id: str, format: str, compressed: bool) -> str:
+        key = f"{tenant_id or 'all'}/exports/users-{job_id}.{format}"
+        return key + ".gz" if compressed else key
+    
+    @staticmethod
+    def create_job(
+        tenant_id: Optional[uuid.UUID],
+        format: str,
+        compress: bool,
+        user_id: uuid.UUID
+    ) -> Dict[str, Any]:
+        """Register a background export job"""
+        job_id = str(uuid.uuid4())
+        compressed = UserExportService._gzipped(format, compress)
+        return _export_jobs.add({
+            "job_id": job_id,
+            "tenant_id": str(tenant_id) if tenant_id else None,
+            "user_id": user_id,
+            "format": format,
+            "compressed": compressed,
+            "status": "pending",
+            "s3_key": UserExportService.export_key(tenant_id, job_id, format, compressed),
+            "size_bytes": None,
+            "error": None,
+            "created_at": datetime.now(timezone.utc),
+            "completed_at": None
+        })
+    
+    @staticmethod
+    def run_job(job_id: str) -> None:
+        """Write the export to a spooled temp file and upload it (blocking, for a background task)"""
+        from app.services.s3_service import get_s3_service
+        
+        job = _export_jobs.get(job_id)
+        tenant_id = uuid.UUID(job["tenant_id"]) if job["tenant_id"] else None
+        db = SessionLocal()
+        try:
+            use_replica(db, job["user_id"])
+            set_tenant_context(db, tenant_id)
+            job["status"] = "running"
+            
+            chunks = UserExportService.iter_export(db, tenant_id, job["format"], job["compressed"])
+            with spooled(chunks) as (spool, size):
+                job["size_bytes"] = size
+                db.commit()  # Lesende Transaktion vor dem Upload beenden
+                
+                get_s3_service().upload_fileobj(
+                    spool, job["s3_key"],
+                    GZIP_MEDIA_TYPE if job["compressed"] else EXPORT_FORMATS[job["format"]],
+                    metadata={
+                        "tenant_id": job["tenant_id"] or "all",
+                        "export": "users",
+                        "user_id": str(job["user_id"])
+                    }
+                )
+            
+            job["status"] = "completed"
+        
+        except Exception as e:
+            logger.error(f"User export job {job_id} failed: {str(e)}")
+            job["status"] = "failed"
+            job["error"] = e.detail if isinstance(e, AppException) else "Export failed"
+        
+        finally:
+            job["completed_at"] = datetime.now(timezone.utc)
+            db.close()
+    
+    @staticmethod
+    def _job_from_s3(s3, job_id: str, current_user: User) -> Optional[Dict[str, Any]]:
+        """State of a job run by another worker: completed once its file is in S3"""
+        tenant_id = current_user.tenant_id if not current_user.is_super_admin else None
+        for format in EXPORT_FORMATS:
+            for compressed in ((True, False) if format != "xlsx" else (False,)):
+                key = UserExportService.export_key(tenant_id, job_id, format, compressed)
+                info = s3.get_image_info(key)
+                if not info:
+                    continue
+                owner = info["metadata"].get("user_id")
+                if owner != str(current_user.id) and not current_user.is_super_admin:
+                    return None
+                return {
+                    "job_id": job_id,
+                    "tenant_id": str(tenant_id) if tenant_id else None,
+                    "format": format,
+                    "compressed": compressed,
+                    "status": "completed",
+                    "s3_key": key,
+                    "size_bytes": info["size"],
+                    "error": None,
+                    "completed_at": info.get("last_modified")
+                }
+        return None
+    
+    @staticmethod
+    def get_job(job_id: uuid.UUID, current_user: User) -> Dict[str, Any]:
+        """
+        Job status; completed jobs carry a presigned download link.
+        
+        Progress is only known to the worker running the job; elsewhere a job shows up
+        once its file is in S3.
+        """
+        from app.services.s3_service import get_s3_service
+        
+        s3 = get_s3_service()
+        job = _export_jobs.get(str(job_id))
+        if job and job["user_id"] != current_user.id and not current_user.is_super_admin:
+            job = None
+        if not job:
+            job = UserExportService._job_from_s3(s3, str(job_id), current_user)
+        if not job:
+            raise AppException("Export job not found", 404, "EXPORT_JOB_NOT_FOUND")
+        
+        status = {key: value for key, value in job.items() if key not in ("user_id", "s3_key")}
+        if job["status"] == "completed":
+            status["download_url"] = s3.generate_presigned_url(
+                job["s3_key"], expiration=settings.EXPORT_DOWNLOAD_URL_EXPIRY_SECONDS
+            )
+        return status
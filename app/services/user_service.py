@@ -476,40 +476,6 @@ class UserService:
         
         return {"message": "Password changed successfully", "sessions_invalidated": True}
     
-    @staticmethod
-    def export_users(
-        db: Session,
-        tenant_id: uuid.UUID,
-        format: str = "json"
-    ) -> Dict[str, Any]:
-        """Export user list"""
-        query = db.query(User).filter(User.tenant_id == tenant_id)
-        users = query.all()
-        
-        user_data = []
-        for user in users:
-            user_data.append({
-                "id": str(user.id),
-                "email": user.email,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "auth_method": user.auth_method,
-                "is_active": user.is_active,
-                "is_verified": user.is_verified,
-                "created_at": user.created_at.isoformat(),
-                "last_login_at": user.last_login_at.isoformat() if user.last_login_at else None
-            })
-        
-        if format == "json":
-            return {"users": user_data, "total": len(user_data)}
-        else:
-            # For CSV/Excel, would return download URL
-            return {
-                "message": f"Export initiated in {format} format",
-                "download_url": f"/api/v1/exports/users-{uuid.uuid4().hex}.{format}",
-                "total_users": len(user_data)
-            }
-    
     @staticmethod
     def get_user_roles(
         db: Session,
@@ -2,16 +2,21 @@
 # AUDIT LOGGING UTILITY (utils/audit.py)
 # ================================
 
+from sqlalchemy import event, insert, text
 from sqlalchemy.orm import Session
 from app.models.audit import AuditLog
 from app.models.user import User
-from typing import Optional, Dict, Any, Union
-from datetime import datetime, timedelta
+from app.config import settings
+from typing import Optional, Dict, Any, Union, List
+from datetime import datetime, timedelta, timezone
 from ipaddress import IPv4Address, IPv6Address
 from decimal import Decimal
 import uuid
 import json
 import logging
+import queue
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -28,15 +33,21 @@ class AuditLogger:
     - Security-focused with sensitive data protection
     """
     
-    def __init__(self, buffer_size: int = 100):
-        """
-        Initialize the audit logger.
-        
-        Args:
-            buffer_size: Number of log entries to buffer before bulk insert
-        """
-        self.buffer_size = buffer_size
-        self._log_buffer = []
+    # Written inside the caller's transaction, never deferred
+    SYNCHRONOUS_ACTIONS = frozenset({
+        "ACCOUNT_LOCKED",
+        "PASSWORD_CHANGED",
+        "PASSWORD_RESET_COMPLETED",
+        "SESSIONS_TERMINATED",
+        "SUPER_ADMIN_IMPERSONATE",
+        "ROLE_ASSIGNED",
+        "ROLE_REMOVED",
+        "ROLE_PERMISSIONS_UPDATED",
+        "TENANT_DELETED",
+    })
+    
+    def __init__(self):
+        """Initialize the audit logger (rows are batched by the shared AuditWriter)."""
     
     def log_auth_event(
         self,
@@ -50,11 +61,17 @@ class AuditLogger:
         resource_type: Optional[str] = None,
         resource_id: Optional[uuid.UUID] = None,
         old_values: Optional[Dict[str, Any]] = None,
-        impersonating_admin_id: Optional[uuid.UUID] = None
-    ) -> AuditLog:
+        impersonating_admin_id: Optional[uuid.UUID] = None,
+        synchronous: bool = False
+    ) -> Optional[AuditLog]:
         """
         Log an authentication or authorization event.
         
+        By default the event is handed to the write-behind AuditWriter once the caller's
+        transaction commits (and dropped if it rolls back). Security-critical actions
+        (SYNCHRONOUS_ACTIONS) or synchronous=True write the row inside the caller's
+        transaction as before.
+        
         Args:
             db: Database session
             action: Action performed (e.g., 'LOGIN_SUCCESS', 'USER_CREATED')
@@ -67,11 +84,29 @@ class AuditLogger:
             resource_id: ID of affected resource (optional)
             old_values: Previous values before change (for updates)
             impersonating_admin_id: Super admin ID if impersonating
+            synchronous: Write the row in the caller's transaction
         
         Returns:
-            Created AuditLog instance
+            Created AuditLog instance, None if queued for write-behind
         """
         try:
+            if not synchronous and action not in self.SYNCHRONOUS_ACTIONS:
+                queued = audit_writer.enqueue(db, {
+                    "tenant_id": tenant_id,
+                    "user_id": user_id,
+                    "impersonating_super_admin_id": impersonating_admin_id,
+                    "action": action,
+                    "resource_type": resource_type,
+                    "resource_id": resource_id,
+                    "old_values": dict(old_values) if old_values else None,
+                    "details": dict(details) if details else None,
+                    "ip_address": ip_address,
+                    "user_agent": user_agent,
+                    "created_at": datetime.now(timezone.utc)
+                })
+                if queued:
+                    return None
+            
             # Sanitize and prepare data
             sanitized_details = self._sanitize_sensitive_data(details or {})
             sanitized_old_values = self._sanitize_sensitive_data(old_values or {})
@@ -187,7 +222,8 @@ class AuditLogger:
             details=enhanced_details,
             ip_address=ip_address,
             user_agent=user_agent,
-            resource_type="security"
+            resource_type="security",
+            synchronous=True
         )
     
     def log_admin_action(
@@ -282,9 +318,26 @@ class AuditLogger:
             events: List of event dictionaries with audit log data
         
         Returns:
-            Number of events successfully logged
+            Number of events successfully logged (or queued for the AuditWriter)
         """
         try:
+            if audit_writer.running:
+                now = datetime.now(timezone.utc)
+                for event in events:
+                    audit_writer.enqueue(db, {
+                        "tenant_id": event.get('tenant_id'),
+                        "user_id": event.get('user_id'),
+                        "action": event['action'],
+                        "resource_type": event.get('resource_type'),
+                        "resource_id": event.get('resource_id'),
+                        "old_values": event.get('old_values'),
+                        "details": event.get('details'),
+                        "ip_address": event.get('ip_address'),
+                        "user_agent": event.get('user_agent'),
+                        "created_at": now
+                    })
+                return len(events)
+            
             audit_entries = []
             
             for event in events:
@@ -572,6 +625,207 @@ class AuditLogger:
         key_lower = key.lower()
         return any(pattern in key_lower for pattern in sensitive_patterns)
 
+# ================================
+# WRITE-BEHIND AUDIT WRITER
+# ================================
+
+class AuditWriter:
+    """
+    Write-behind pipeline for audit events.
+    
+    Events collected in a session are queued when that session commits (and discarded
+    when it rolls back or closes without commit). A background thread sanitizes them and inserts them in batches
+    (multi-row INSERT) on its own connection. If the queue is full the committing
+    thread inserts its events directly (back-pressure), so nothing is dropped.
+    """
+    
+    PENDING_KEY = "pending_audit_events"
+    
+    def __init__(self):
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=settings.AUDIT_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._sanitizer = AuditLogger()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "enqueued": 0,
+            "written": 0,
+            "batches": 0,
+            "failed": 0,
+            "discarded_on_rollback": 0,
+            "backpressure_writes": 0,
+            "queue_high_watermark": 0,
+            "last_batch_size": 0,
+            "last_flush_ms": 0.0,
+        }
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start the background flush thread (application startup)"""
+        if not settings.AUDIT_ASYNC_ENABLED or self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+        logger.info("Audit writer started")
+    
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush remaining events and stop the background thread (application shutdown)"""
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+        # Anything that arrived after the thread exited
+        self._write_batch(self._drain(), direct=True)
+        logger.info("Audit writer stopped")
+    
+    def enqueue(self, db: Session, event: Dict[str, Any]) -> bool:
+        """Attach an event to the session; returns False if the writer is not running"""
+        if not self.running or db is None:
+            return False
+        db.info.setdefault(self.PENDING_KEY, []).append(event)
+        return True
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        metrics["queue_depth"] = self._queue.qsize()
+        metrics["queue_capacity"] = self._queue.maxsize
+        metrics["running"] = self.running
+        return metrics
+    
+    def _count(self, key: str, value: int = 1) -> None:
+        with self._lock:
+            self._metrics[key] += value
+    
+    def _on_commit(self, session: Session) -> None:
+        # released_connection() ends a read-only transaction mid-request; events wait for the real commit
+        if session.info.get("releasing_connection"):
+            return
+        events = session.info.pop(self.PENDING_KEY, None)
+        if not events:
+            return
+        overflow = []
+        for item in events:
+            try:
+                self._queue.put_nowait(item)
+            except queue.Full:
+                overflow.append(item)
+        self._count("enqueued", len(events) - len(overflow))
+        depth = self._queue.qsize()
+        with self._lock:
+            if depth > self._metrics["queue_high_watermark"]:
+                self._metrics["queue_high_watermark"] = depth
+        if overflow:
+            logger.warning(f"Audit queue full, writing {len(overflow)} event(s) synchronously")
+            self._count("backpressure_writes", len(overflow))
+            self._write_batch(overflow, direct=True)
+    
+    def _on_transaction_end(self, session: Session, transaction) -> None:
+        # Runs after _on_commit; anything left over was rolled back or closed without commit.
+        # Savepoints (parent is not None) keep their events.
+        if transaction.parent is not None or session.info.get("releasing_connection"):
+            return
+        events = session.info.pop(self.PENDING_KEY, None)
+        if events:
+            self._count("discarded_on_rollback", len(events))
+    
+    def _drain(self, first: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        batch = [first] if first is not None else []
+        while len(batch) < settings.AUDIT_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _run(self) -> None:
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=settings.AUDIT_FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                continue
+            self._write_batch(self._drain(first))
+    
+    def _to_row(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        sanitizer = self._sanitizer
+        details = sanitizer._sanitize_sensitive_data(item.get("details") or {})
+        old_values = sanitizer._sanitize_sensitive_data(item.get("old_values") or {})
+        user_agent = item.get("user_agent")
+        sanitizer._log_to_application_logger(item["action"], item.get("user_id"), item.get("tenant_id"), details)
+        return {
+            "id": uuid.uuid4(),
+            "tenant_id": item.get("tenant_id"),
+            "user_id": item.get("user_id"),
+            "impersonating_super_admin_id": item.get("impersonating_super_admin_id"),
+            "action": item["action"],
+            "resource_type": item.get("resource_type"),
+            "resource_id": item.get("resource_id"),
+            "old_values": old_values or None,
+            "new_values": details or None,
+            "ip_address": sanitizer._normalize_ip_address(item.get("ip_address")),
+            "user_agent": user_agent[:500] if user_agent else None,
+            "created_at": item["created_at"],
+            "updated_at": item["created_at"],
+        }
+    
+    def _insert(self, conn, rows: List[Dict[str, Any]]) -> None:
+        # Group by tenant so inserts pass the tenant_isolation RLS policy
+        by_tenant: Dict[Any, List[Dict[str, Any]]] = {}
+        for row in rows:
+            by_tenant.setdefault(row["tenant_id"], []).append(row)
+        for tenant_id, tenant_rows in by_tenant.items():
+            conn.execute(
+                text("SELECT set_config('app.current_tenant_id', :tenant_id, true)"),
+                {"tenant_id": str(tenant_id) if tenant_id else ""}
+            )
+            conn.execute(insert(AuditLog.__table__), tenant_rows)
+    
+    def _write_batch(self, items: List[Dict[str, Any]], direct: bool = False) -> None:
+        if not items:
+            return
+        from app.core.database import engine
+        
+        started = time.perf_counter()
+        rows = []
+        for item in items:
+            try:
+                rows.append(self._to_row(item))
+            except Exception as e:
+                logger.error(f"Failed to prepare audit event {item.get('action')}: {e}", exc_info=True)
+                self._count("failed")
+        
+        try:
+            with engine.begin() as conn:
+                self._insert(conn, rows)
+            self._count("written", len(rows))
+        except Exception as e:
+            logger.error(f"Audit batch insert of {len(rows)} rows failed, retrying row by row: {e}")
+            for row in rows:
+                try:
+                    with engine.begin() as conn:
+                        self._insert(conn, [row])
+                    self._count("written")
+                except Exception as row_error:
+                    logger.error(f"Failed to write audit log {row['action']}: {row_error}")
+                    self._count("failed")
+        
+        with self._lock:
+            if not direct:
+                self._metrics["batches"] += 1
+                self._metrics["last_batch_size"] = len(rows)
+                self._metrics["last_flush_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+
+# Shared writer instance, started/stopped with the application
+audit_writer = AuditWriter()
+event.listen(Session, "after_commit", audit_writer._on_commit)
+event.listen(Session, "after_transaction_end", audit_writer._on_transaction_end)
+
 # ================================
 # AUDIT DECORATORS
 # ================================
@@ -722,6 +976,8 @@ def audit_context(
 
 __all__ = [
     "AuditLogger",
+    "AuditWriter",
+    "audit_writer",
     "audit_action",
     "audit_context"
 ]
\ No newline at end of file
@@ -2,12 +2,13 @@
 # OAUTH CLIENTS UTILITY (utils/oauth_clients.py)
 # ================================
 
-import httpx
 import secrets
 from typing import Dict, Any, Optional
 from urllib.parse import urlencode
 import logging
 
+from app.core.metrics import http_client
+
 logger = logging.getLogger(__name__)
 
 class MicrosoftEnterpriseClient:
@@ -53,7 +54,7 @@ class MicrosoftEnterpriseClient:
         if redirect_uri:
             data["redirect_uri"] = redirect_uri
         
-        async with httpx.AsyncClient() as client:
+        async with http_client("microsoft_oauth") as client:
             response = await client.post(
                 f"{self.base_url}/token",
                 data=data,
@@ -75,7 +76,7 @@ class MicrosoftEnterpriseClient:
             "grant_type": "refresh_token"
         }
         
-        async with httpx.AsyncClient() as client:
+        async with http_client("microsoft_oauth") as client:
             response = await client.post(
                 f"{self.base_url}/token",
                 data=data,
@@ -92,7 +93,7 @@ class MicrosoftEnterpriseClient:
         """Holt User-Info von Microsoft Graph"""
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        async with httpx.AsyncClient() as client:
+        async with http_client("microsoft_oauth") as client:
             response = await client.get(
                 f"{self.graph_url}/me",
                 headers=headers
@@ -112,7 +113,7 @@ class MicrosoftEnterpriseClient:
     
     async def get_discovery_document(self) -> Dict[str, Any]:
         """Holt OpenID Connect Discovery Document"""
-        async with httpx.AsyncClient() as client:
+        async with http_client("microsoft_oauth") as client:
             response = await client.get(self.discovery_endpoint)
             
             if response.status_code != 200:
@@ -163,7 +164,7 @@ class GoogleEnterpriseClient:
         if redirect_uri:
             data["redirect_uri"] = redirect_uri
         
-        async with httpx.AsyncClient() as client:
+        async with http_client("google_oauth") as client:
             response = await client.post(
                 f"{self.base_url}/token",
                 data=data,
@@ -185,7 +186,7 @@ class GoogleEnterpriseClient:
             "grant_type": "refresh_token"
         }
         
-        async with httpx.AsyncClient() as client:
+        async with http_client("google_oauth") as client:
             response = await client.post(
                 f"{self.base_url}/token",
                 data=data,
@@ -202,7 +203,7 @@ class GoogleEnterpriseClient:
         """Holt User-Info von Google"""
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        async with httpx.AsyncClient() as client:
+        async with http_client("google_oauth") as client:
             response = await client.get(
                 self.userinfo_url,
                 headers=headers
@@ -216,7 +217,7 @@ class GoogleEnterpriseClient:
     
     async def revoke_token(self, token: str) -> bool:
         """Widerruft Token"""
-        async with httpx.AsyncClient() as client:
+        async with http_client("google_oauth") as client:
             response = await client.post(
                 f"https://oauth2.googleapis.com/revoke?token={token}"
             )
@@ -225,7 +226,7 @@ class GoogleEnterpriseClient:
     
     async def get_discovery_document(self) -> Dict[str, Any]:
         """Holt OpenID Connect Discovery Document"""
-        async with httpx.AsyncClient() as client:
+        async with http_client("google_oauth") as client:
             response = await client.get(self.discovery_endpoint)
             
             if response.status_code != 200:
@@ -253,7 +254,7 @@ class GenericOIDCClient:
     async def _get_discovery_document(self) -> Dict[str, Any]:
         """Cached Discovery Document"""
         if not self._discovery_cache:
-            async with httpx.AsyncClient() as client:
+            async with http_client("oidc") as client:
                 response = await client.get(self.discovery_endpoint)
                 
                 if response.status_code != 200:
@@ -299,7 +300,7 @@ class GenericOIDCClient:
         if redirect_uri:
             data["redirect_uri"] = redirect_uri
         
-        async with httpx.AsyncClient() as client:
+        async with http_client("oidc") as client:
             response = await client.post(
                 token_endpoint,
                 data=data,
@@ -322,7 +323,7 @@ class GenericOIDCClient:
         
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        async with httpx.AsyncClient() as client:
+        async with http_client("oidc") as client:
             response = await client.get(
                 userinfo_endpoint,
                 headers=headers
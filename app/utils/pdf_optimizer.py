@@ -1,15 +1,125 @@
 import io
+import asyncio
+import hashlib
 import logging
-from typing import BinaryIO, Optional, Tuple
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Optional, Tuple, Dict, Any
 import PyPDF2
 from PIL import Image
 import fitz  # PyMuPDF
-import tempfile
-import os
+
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+# ================================
+# WORKER FUNCTIONS (run inside the process pool)
+# ================================
+
+def _save(doc) -> bytes:
+    return doc.tobytes(
+        garbage=4,  # Maximum garbage collection
+        deflate=True,  # Compress streams
+        deflate_images=True,  # Compress images
+        deflate_fonts=True,  # Compress fonts
+        clean=True,  # Clean up PDF
+    )
+
+
+def _downsample_images(doc, target_dpi: int, jpeg_quality: int) -> int:
+    """Replace images displayed above target_dpi by JPEGs rendered at target_dpi. Returns number replaced."""
+    # Largest displayed size (in points) of every image xref over all pages
+    placements: Dict[int, Tuple[Any, float, float]] = {}
+    for page in doc:
+        for img in page.get_images(full=True):
+            xref, smask = img[0], img[1]
+            if smask:
+                # JPEG has no alpha channel - keep transparent images as they are
+                continue
+            for rect in page.get_image_rects(xref):
+                _, max_w, max_h = placements.get(xref, (page, 0.0, 0.0))
+                if rect.width > max_w or rect.height > max_h:
+                    placements[xref] = (page, max(rect.width, max_w), max(rect.height, max_h))
+    
+    replaced = 0
+    for xref, (page, shown_w, shown_h) in placements.items():
+        if shown_w <= 0 or shown_h <= 0:
+            continue
+        try:
+            original = doc.extract_image(xref)
+            if not original:
+                continue
+            width, height = original["width"], original["height"]
+            
+            # Effective resolution at the largest placement (72 pt per inch)
+            dpi = min(width / (shown_w / 72.0), height / (shown_h / 72.0))
+            if dpi <= target_dpi * 1.2:
+                continue
+            
+            scale = target_dpi / dpi
+            new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+            
+            pix = fitz.Pixmap(doc, xref)
+            if pix.alpha:
+                continue
+            if pix.n > 3:  # CMYK: convert to RGB
+                pix = fitz.Pixmap(fitz.csRGB, pix)
+            mode = "L" if pix.n == 1 else "RGB"
+            image = Image.frombytes(mode, (pix.width, pix.height), pix.samples)
+            image = image.resize(new_size, Image.Resampling.LANCZOS)
+            
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=jpeg_quality, optimize=True)
+            data = buffer.getvalue()
+            
+            # Only swap the stream if it actually gets smaller
+            if len(data) >= len(original["image"]):
+                continue
+            
+            page.replace_image(xref, stream=data)
+            replaced += 1
+        except Exception as e:
+            logger.debug(f"Skipping image xref {xref}: {str(e)}")
+    return replaced
+
+
+def _optimize_pdf_bytes(
+    data: bytes,
+    target_size_bytes: int,
+    target_dpi: int,
+    jpeg_quality: int
+) -> Tuple[bytes, Dict[str, Any]]:
+    """Optimize a PDF held in memory. Runs in a worker process."""
+    started = time.perf_counter()
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        stats = {"pages": doc.page_count, "images_replaced": 0, "aggressive": False}
+        
+        # First pass: lossless garbage collection and stream compression
+        optimized = _save(doc)
+        
+        # If still too large, downsample oversized images in place and save again
+        if len(optimized) > target_size_bytes:
+            stats["aggressive"] = True
+            stats["images_replaced"] = _downsample_images(doc, target_dpi, jpeg_quality)
+            if stats["images_replaced"]:
+                optimized = _save(doc)
+    finally:
+        doc.close()
+    
+    stats["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return optimized, stats
+
+
+# ================================
+# PDF OPTIMIZER
+# ================================
+
 class PDFOptimizer:
     """Service for optimizing PDF files to reduce size without losing quality"""
     
@@ -19,11 +129,113 @@ class PDFOptimizer:
     # Target DPI for images in PDFs
     TARGET_DPI = 150
     
+    # JPEG quality for downsampled images
+    JPEG_QUALITY = 85
+    
+    # Minimum reduction for the optimized file to be used
+    MIN_REDUCTION = 0.1
+    
+    # Upper bound of cached results (besides the byte budget from settings)
+    CACHE_MAX_ENTRIES = 1000
+    
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+    
+    # Results by input content hash: (optimized bytes or None if not worth it, new size)
+    _cache: "OrderedDict[str, Tuple[Optional[bytes], int]]" = OrderedDict()
+    _cache_bytes = 0
+    
+    _metrics = {
+        "documents": 0,
+        "optimized": 0,
+        "cache_hits": 0,
+        "failures": 0,
+        "bytes_in": 0,
+        "bytes_out": 0,
+        "total_duration_ms": 0.0,
+    }
+    _recent = deque(maxlen=100)
+    
     @staticmethod
     def should_optimize(file_size_bytes: int) -> bool:
         """Check if a PDF should be optimized - we optimize all PDFs"""
         return True  # Always try to optimize PDFs
     
+    @classmethod
+    def _get_executor(cls) -> ProcessPoolExecutor:
+        with cls._lock:
+            if cls._executor is None:
+                # spawn: workers must not inherit DB connections or the event loop
+                cls._executor = ProcessPoolExecutor(
+                    max_workers=settings.PDF_OPTIMIZER_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return cls._executor
+    
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the worker processes (application shutdown)"""
+        with cls._lock:
+            if cls._executor is not None:
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = None
+    
+    @classmethod
+    def _cache_get(cls, key: str) -> Optional[Tuple[Optional[bytes], int]]:
+        with cls._lock:
+            entry = cls._cache.get(key)
+            if entry is not None:
+                cls._cache.move_to_end(key)
+            return entry
+    
+    @classmethod
+    def _cache_put(cls, key: str, optimized: Optional[bytes], new_size: int) -> None:
+        budget = settings.PDF_OPTIMIZER_CACHE_MB * 1024 * 1024
+        size = len(optimized) if optimized else 0
+        if size > budget:
+            return
+        with cls._lock:
+            previous = cls._cache.pop(key, None)
+            if previous and previous[0]:
+                cls._cache_bytes -= len(previous[0])
+            cls._cache[key] = (optimized, new_size)
+            cls._cache_bytes += size
+            while cls._cache and (cls._cache_bytes > budget or len(cls._cache) > cls.CACHE_MAX_ENTRIES):
+                _, (evicted, _) = cls._cache.popitem(last=False)
+                if evicted:
+                    cls._cache_bytes -= len(evicted)
+    
+    @classmethod
+    def _record(cls, entry: Dict[str, Any]) -> None:
+        with cls._lock:
+            cls._metrics["documents"] += 1
+            cls._metrics["bytes_in"] += entry["original_size"]
+            cls._metrics["bytes_out"] += entry["new_size"]
+            cls._metrics["total_duration_ms"] += entry.get("duration_ms", 0.0)
+            if entry.get("cached"):
+                cls._metrics["cache_hits"] += 1
+            if entry.get("was_optimized"):
+                cls._metrics["optimized"] += 1
+            if entry.get("error"):
+                cls._metrics["failures"] += 1
+            cls._recent.append(entry)
+    
+    @classmethod
+    def get_metrics(cls) -> Dict[str, Any]:
+        """Aggregate counters plus the most recent per-document records"""
+        with cls._lock:
+            metrics = dict(cls._metrics)
+            recent = list(cls._recent)
+            cache_entries = len(cls._cache)
+            cache_bytes = cls._cache_bytes
+        metrics["reduction_percent"] = round(
+            (1 - metrics["bytes_out"] / metrics["bytes_in"]) * 100, 1
+        ) if metrics["bytes_in"] else 0.0
+        metrics["cache_entries"] = cache_entries
+        metrics["cache_bytes"] = cache_bytes
+        metrics["recent"] = recent
+        return metrics
+    
     @staticmethod
     async def optimize_pdf(
         pdf_file: BinaryIO,
@@ -33,172 +245,94 @@ class PDFOptimizer:
         """
         Optimize a PDF file to reduce size while maintaining quality
         
+        The work runs in a process pool; results are cached by the SHA-256 of the input.
+        
         Args:
             pdf_file: The PDF file to optimize
             original_size: Original file size in bytes
             target_size_mb: Target size in MB (optional, defaults to 10MB)
-            
+        
         Returns:
             Tuple of (optimized_file, new_size, was_optimized)
         """
         target_size_mb = target_size_mb or PDFOptimizer.TARGET_FILE_SIZE_MB
         target_size_bytes = target_size_mb * 1024 * 1024
         
+        pdf_file.seek(0)
+        data = pdf_file.read()
+        pdf_file.seek(0)
+        original_size = len(data) or original_size
+        content_hash = hashlib.sha256(data).hexdigest()
+        cache_key = f"{content_hash}:{target_size_bytes}:{PDFOptimizer.TARGET_DPI}:{PDFOptimizer.JPEG_QUALITY}"
+        
+        entry = {
+            "sha256": content_hash,
+            "original_size": original_size,
+            "new_size": original_size,
+            "was_optimized": False,
+            "cached": False
+        }
+        
+        cached = PDFOptimizer._cache_get(cache_key)
+        if cached is not None:
+            optimized, new_size = cached
+            entry.update(cached=True, duration_ms=0.0)
+            if optimized is None:
+                PDFOptimizer._record(entry)
+                return pdf_file, original_size, False
+            entry.update(new_size=new_size, was_optimized=True)
+            PDFOptimizer._record(entry)
+            logger.info(f"PDF optimization cache hit for {content_hash[:12]}")
+            return io.BytesIO(optimized), new_size, True
+        
         # If already under target size, still try basic optimization
         if original_size <= target_size_bytes:
             logger.info(f"PDF already under {target_size_mb}MB ({original_size/1024/1024:.2f}MB), applying basic optimization")
         
+        started = time.perf_counter()
         try:
-            # First, try PyMuPDF optimization (better compression)
-            optimized_file, new_size = await PDFOptimizer._optimize_with_pymupdf(
-                pdf_file, original_size
+            loop = asyncio.get_running_loop()
+            optimized, stats = await loop.run_in_executor(
+                PDFOptimizer._get_executor(),
+                _optimize_pdf_bytes,
+                data,
+                target_size_bytes,
+                PDFOptimizer.TARGET_DPI,
+                PDFOptimizer.JPEG_QUALITY
             )
-            
-            # If still too large, try additional compression
-            if new_size > target_size_bytes:
-                logger.info(f"PDF still large after optimization ({new_size/1024/1024:.2f}MB), trying aggressive compression")
-                optimized_file, new_size = await PDFOptimizer._aggressive_optimize(
-                    optimized_file, new_size
-                )
-            
-            # Check if we achieved meaningful compression
-            compression_ratio = (original_size - new_size) / original_size
-            was_optimized = compression_ratio > 0.1  # At least 10% reduction
-            
-            if was_optimized:
-                logger.info(f"PDF optimized: {original_size/1024/1024:.2f}MB -> {new_size/1024/1024:.2f}MB ({compression_ratio*100:.1f}% reduction)")
-            else:
-                logger.info(f"PDF optimization resulted in minimal size reduction, using original")
-                pdf_file.seek(0)
-                return pdf_file, original_size, False
-                
-            return optimized_file, new_size, True
-            
         except Exception as e:
             logger.error(f"Failed to optimize PDF: {str(e)}")
+            entry.update(error=str(e), duration_ms=round((time.perf_counter() - started) * 1000, 1))
+            PDFOptimizer._record(entry)
             # Return original file on error
-            pdf_file.seek(0)
             return pdf_file, original_size, False
-    
-    @staticmethod
-    async def _optimize_with_pymupdf(
-        pdf_file: BinaryIO, 
-        original_size: int
-    ) -> Tuple[BinaryIO, int]:
-        """Optimize PDF using PyMuPDF (better compression algorithms)"""
-        pdf_file.seek(0)
         
-        # Create temporary file for processing
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_in:
-            temp_in.write(pdf_file.read())
-            temp_in_path = temp_in.name
+        entry.update(stats)
+        # Wall time including pool queueing; stats["duration_ms"] is the pure processing time
+        entry["processing_ms"] = entry.pop("duration_ms")
+        entry["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
         
-        try:
-            # Open with PyMuPDF
-            doc = fitz.open(temp_in_path)
-            
-            # Optimize settings
-            optimize_output = io.BytesIO()
-            
-            # Save with optimization flags
-            doc.save(
-                optimize_output,
-                garbage=4,  # Maximum garbage collection
-                deflate=True,  # Compress streams
-                deflate_images=True,  # Compress images
-                deflate_fonts=True,  # Compress fonts
-                clean=True,  # Clean up PDF
-            )
-            
-            doc.close()
-            
-            # Get optimized size
-            optimize_output.seek(0, 2)  # Seek to end
-            new_size = optimize_output.tell()
-            optimize_output.seek(0)  # Reset to beginning
-            
-            return optimize_output, new_size
-            
-        finally:
-            # Clean up temp file
-            if os.path.exists(temp_in_path):
-                os.unlink(temp_in_path)
-    
-    @staticmethod
-    async def _aggressive_optimize(
-        pdf_file: BinaryIO,
-        current_size: int
-    ) -> Tuple[BinaryIO, int]:
-        """More aggressive optimization - reduce image quality"""
-        pdf_file.seek(0)
+        new_size = len(optimized)
         
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_in:
-            temp_in.write(pdf_file.read())
-            temp_in_path = temp_in.name
+        # Check if we achieved meaningful compression
+        compression_ratio = (original_size - new_size) / original_size if original_size else 0
+        was_optimized = compression_ratio > PDFOptimizer.MIN_REDUCTION
         
-        try:
-            doc = fitz.open(temp_in_path)
-            
-            # Process each page
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # Get all images on the page
-                image_list = page.get_images()
-                
-                for img_index, img in enumerate(image_list):
-                    # Extract image
-                    xref = img[0]
-                    pix = fitz.Pixmap(doc, xref)
-                    
-                    if pix.n - pix.alpha > 3:  # CMYK: convert to RGB
-                        pix = fitz.Pixmap(fitz.csRGB, pix)
-                    
-                    # Convert to PIL Image for processing
-                    img_data = pix.tobytes("png")
-                    image = Image.open(io.BytesIO(img_data))
-                    
-                    # Reduce quality if image is large
-                    if image.width > 1920 or image.height > 1920:
-                        # Resize image maintaining aspect ratio
-                        image.thumbnail((1920, 1920), Image.Resampling.LANCZOS)
-                    
-                    # Save with JPEG compression
-                    img_buffer = io.BytesIO()
-                    if image.mode == 'RGBA':
-                        # Convert RGBA to RGB
-                        rgb_image = Image.new('RGB', image.size, (255, 255, 255))
-                        rgb_image.paste(image, mask=image.split()[3])
-                        image = rgb_image
-                    
-                    image.save(img_buffer, format='JPEG', quality=85, optimize=True)
-                    img_buffer.seek(0)
-                    
-                    # Replace image in PDF
-                    page.clean_contents()
-            
-            # Save optimized PDF
-            optimized_output = io.BytesIO()
-            doc.save(
-                optimized_output,
-                garbage=4,
-                deflate=True,
-                deflate_images=True,
-                deflate_fonts=True,
-                clean=True,
-            )
-            doc.close()
-            
-            # Get new size
-            optimized_output.seek(0, 2)
-            new_size = optimized_output.tell()
-            optimized_output.seek(0)
-            
-            return optimized_output, new_size
-            
-        finally:
-            if os.path.exists(temp_in_path):
-                os.unlink(temp_in_path)
+        if not was_optimized:
+            logger.info(f"PDF optimization resulted in minimal size reduction, using original")
+            PDFOptimizer._cache_put(cache_key, None, original_size)
+            PDFOptimizer._record(entry)
+            return pdf_file, original_size, False
+        
+        logger.info(
+            f"PDF optimized: {original_size/1024/1024:.2f}MB -> {new_size/1024/1024:.2f}MB "
+            f"({compression_ratio*100:.1f}% reduction, {entry['images_replaced']} images downsampled, "
+            f"{entry['duration_ms']:.0f}ms)"
+        )
+        PDFOptimizer._cache_put(cache_key, optimized, new_size)
+        entry.update(new_size=new_size, was_optimized=True)
+        PDFOptimizer._record(entry)
+        return io.BytesIO(optimized), new_size, True
     
     @staticmethod
     def get_pdf_info(pdf_file: BinaryIO) -> dict:
@@ -218,8 +352,8 @@ class PDFOptimizer:
             
             pdf_file.seek(0)
             return info
-            
+        
         except Exception as e:
             logger.error(f"Failed to get PDF info: {str(e)}")
             pdf_file.seek(0)
-            return {"pages": 0, "encrypted": False}
\ No newline at end of file
+            return {"pages": 0, "encrypted": False}
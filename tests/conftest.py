@@ -0,0 +1,66 @@
+# ================================
+# SHARED TEST FIXTURES (tests/conftest.py)
+# ================================
+
+import os
+
+import pytest
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+class InMemoryS3:
+    """Stands in for S3Service: keeps uploaded objects in a dict"""
+    
+    def __init__(self):
+        self.objects = {}
+    
+    def upload_fileobj(self, fileobj, s3_key, content_type, metadata=None):
+        self.objects[s3_key] = {"body": fileobj.read(), "content_type": content_type, "metadata": metadata or {}}
+    
+    def get_image_info(self, s3_key):
+        obj = self.objects.get(s3_key)
+        if not obj:
+            return None
+        return {"size": len(obj["body"]), "content_type": obj["content_type"], "metadata": obj["metadata"]}
+    
+    def generate_presigned_url(self, s3_key, expiration=3600):
+        return f"memory://{s3_key}"
+
+
+@pytest.fixture
+def in_memory_s3(monkeypatch):
+    """InMemoryS3 returned by get_s3_service() for the duration of the test"""
+    from app.services import s3_service
+    
+    s3 = InMemoryS3()
+    monkeypatch.setattr(s3_service, "get_s3_service", lambda: s3)
+    return s3
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """Engine on TEST_DATABASE_URL with the same tenant-context instrumentation as the app"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("Set TEST_DATABASE_URL to run database tests")
+    
+    from sqlalchemy import create_engine
+    from app.core.database import _instrument_tenant_context
+    
+    engine = create_engine(TEST_DATABASE_URL)
+    _instrument_tenant_context(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def session_factory(engine):
+    """Sessions like SessionLocal: RoutingSession, so set_tenant_context takes effect"""
+    from sqlalchemy.orm import sessionmaker
+    from app.core.db_routing import RoutingSession
+    
+    return sessionmaker(bind=engine, autoflush=False, class_=RoutingSession)
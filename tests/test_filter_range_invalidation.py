@@ -0,0 +1,149 @@
+# ================================
+# FILTER RANGE INVALIDATION TESTS (test_filter_range_invalidation.py)
+# ================================
+
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture(scope="module")
+def tenants(session_factory):
+    """Two tenants with one project each, removed again after the module"""
+    from app.models.business import Project
+    from app.models.tenant import Tenant
+    from app.models.user import User
+    
+    tenant_ids = []
+    with session_factory() as db:
+        for _ in range(2):
+            suffix = uuid.uuid4().hex[:8]
+            tenant = Tenant(name=f"Range Test {suffix}", slug=f"range-test-{suffix}")
+            db.add(tenant)
+            db.flush()
+            user = User(email=f"range-{suffix}@example.com", tenant_id=tenant.id)
+            db.add(user)
+            db.flush()
+            db.add(Project(
+                name="Range Project", street="Teststraße", house_number="1",
+                city="Berlin", state="Berlin", zip_code="10115",
+                tenant_id=tenant.id, created_by=user.id
+            ))
+            tenant_ids.append(tenant.id)
+        db.commit()
+    
+    yield tenant_ids
+    
+    with session_factory() as db:
+        db.query(Project).filter(Project.tenant_id.in_(tenant_ids)).delete(synchronize_session=False)
+        db.query(User).filter(User.tenant_id.in_(tenant_ids)).delete(synchronize_session=False)
+        db.query(Tenant).filter(Tenant.id.in_(tenant_ids)).delete(synchronize_session=False)
+        db.commit()
+
+
+@pytest.fixture
+def cached_ranges(tenants):
+    """Cache entries for both tenants, as left behind by earlier list requests"""
+    from app.services.filter_range_service import _filter_range_cache
+    
+    _filter_range_cache.clear()
+    for tenant_id in tenants:
+        _filter_range_cache.set(f"filter_ranges:properties:{tenant_id}", {})
+        _filter_range_cache.set(f"filter_ranges:projects:{tenant_id}", {})
+    yield _filter_range_cache
+    _filter_range_cache.clear()
+
+
+def _cached(cache, tenant_id):
+    return [
+        cache.get(f"filter_ranges:{kind}:{tenant_id}") is not None
+        for kind in ("properties", "projects")
+    ]
+
+
+class TestBulkFilterRangeInvalidation:
+    """ORM bulk statements drop only the ranges of the tenant in their WHERE clause."""
+    
+    def test_rollup_keeps_other_tenants(self, session_factory, tenants, cached_ranges):
+        from app.services.project_service import ProjectService
+        
+        tenant_a, tenant_b = tenants
+        
+        with session_factory() as db:
+            ProjectService.recompute_project_rollups(db, tenant_a)
+            db.commit()
+        
+        assert _cached(cached_ranges, tenant_a) == [False, False]
+        assert _cached(cached_ranges, tenant_b) == [True, True]
+    
+    def test_legacy_query_update_keeps_other_tenants(self, session_factory, tenants, cached_ranges):
+        from sqlalchemy import and_
+        from app.models.business import Project
+        
+        tenant_a, tenant_b = tenants
+        
+        with session_factory() as db:
+            db.query(Project).filter(
+                and_(Project.tenant_id == tenant_b, Project.construction_year.is_(None))
+            ).update({Project.construction_year: None}, synchronize_session=False)
+            db.commit()
+        
+        assert _cached(cached_ranges, tenant_a) == [True, True]
+        assert _cached(cached_ranges, tenant_b) == [False, False]
+    
+    def test_update_without_tenant_clears_all(self, session_factory, tenants, cached_ranges):
+        from sqlalchemy import or_, update
+        from app.models.business import Project
+        
+        with session_factory() as db:
+            # OR hebt die Einschränkung auf den Tenant wieder auf
+            db.execute(
+                update(Project)
+                .where(or_(Project.tenant_id == tenants[0], Project.id.is_(None)))
+                .values(construction_year=Project.construction_year)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        
+        for tenant_id in tenants:
+            assert _cached(cached_ranges, tenant_id) == [False, False]
+    
+    def test_rollback_keeps_cache(self, session_factory, tenants, cached_ranges):
+        from app.services.project_service import ProjectService
+        
+        with session_factory() as db:
+            ProjectService.recompute_project_rollups(db, tenants[0])
+            db.rollback()
+        
+        for tenant_id in tenants:
+            assert _cached(cached_ranges, tenant_id) == [True, True]
+
+
+class TestBulkPropertyStatsInvalidation:
+    """Property stats snapshots follow the same tenant scoping as the filter ranges."""
+    
+    def test_tenant_update_keeps_other_snapshots(self, session_factory, tenants):
+        from sqlalchemy import update
+        from app.models.business import Property
+        from app.services.property_service import _property_stats_cache
+        
+        tenant_a, tenant_b = tenants
+        _property_stats_cache.clear()
+        for key in (f"property_stats:{tenant_a}", f"property_stats:{tenant_b}", "property_stats:all"):
+            _property_stats_cache.set(key, {})
+        
+        with session_factory() as db:
+            db.execute(
+                update(Property)
+                .where(Property.tenant_id == tenant_a)
+                .values(visibility=Property.visibility)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+        
+        assert _property_stats_cache.get(f"property_stats:{tenant_a}") is None
+        assert _property_stats_cache.get("property_stats:all") is None
+        assert _property_stats_cache.get(f"property_stats:{tenant_b}") is not None
+        _property_stats_cache.clear()
@@ -0,0 +1,109 @@
+# ================================
+# PROPERTY DETAIL LOADER TESTS (test_property_detail_loader.py)
+# ================================
+
+from types import SimpleNamespace
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+# Statements per include selection, independent of the number of images and documents
+QUERY_BUDGET = {
+    ("project", "city", "documents"): 6,
+    ("project", "city"): 4,
+    ("documents",): 4,
+    (): 2,
+}
+
+
+@pytest.fixture(scope="module")
+def image_rich_property(session_factory):
+    """The property with the most images (worst case for the old joined loads)"""
+    from sqlalchemy import func
+    from app.models.business import Property, PropertyImage
+    
+    with session_factory() as db:
+        row = db.query(Property.id, Property.tenant_id).outerjoin(Property.images).group_by(
+            Property.id, Property.tenant_id
+        ).order_by(func.count(PropertyImage.id).desc()).first()
+    if not row:
+        pytest.skip("No properties in the test database")
+    return row
+
+
+class _QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+    
+    @property
+    def count(self):
+        return len(self.statements)
+    
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+    
+    def __enter__(self):
+        from sqlalchemy import event
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+    
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+
+class TestPropertyDetailLoader:
+    """The detail bundle loads in a fixed number of statements and mapping it never lazy-loads."""
+    
+    @pytest.mark.parametrize("include", list(QUERY_BUDGET))
+    def test_query_budget(self, engine, session_factory, image_rich_property, include):
+        from app.core.database import set_tenant_context
+        from app.mappers.document_mapper import map_property_documents
+        from app.mappers.property_mapper import map_property_to_response
+        from app.services.property_service import PropertyService
+        
+        property_id, tenant_id = image_rich_property
+        current_user = SimpleNamespace(tenant_id=tenant_id)
+        
+        with session_factory() as db:
+            set_tenant_context(db, tenant_id)
+            with _QueryCounter(engine) as counter:
+                prop = PropertyService.get_property(
+                    db, property_id, current_user, with_micro_location=True, include=include
+                )
+                map_property_to_response(
+                    prop, include_project="project" in include, include_city="city" in include
+                )
+                if "documents" in include:
+                    map_property_documents(prop)
+        
+        assert counter.count <= QUERY_BUDGET[include]
+        # Wie im Request: der Tenant-Kontext geht mit dem ersten Statement mit, ohne eigenen Roundtrip
+        assert counter.statements[0].startswith("SELECT set_config")
+    
+    def test_excluded_project_is_not_loaded(self, session_factory, image_rich_property):
+        from sqlalchemy.exc import InvalidRequestError
+        from app.core.database import set_tenant_context
+        from app.services.property_service import PropertyService
+        
+        property_id, tenant_id = image_rich_property
+        
+        with session_factory() as db:
+            set_tenant_context(db, tenant_id)
+            prop = PropertyService.get_property(
+                db, property_id, SimpleNamespace(tenant_id=tenant_id), include=()
+            )
+            with pytest.raises(InvalidRequestError):
+                prop.project
+    
+    def test_parse_include(self):
+        from app.core.exceptions import AppException
+        from app.services.property_service import PropertyService, PROPERTY_DETAIL_INCLUDES
+        
+        assert PropertyService.parse_detail_include(None) == set(PROPERTY_DETAIL_INCLUDES)
+        assert PropertyService.parse_detail_include("") == set()
+        assert PropertyService.parse_detail_include("documents, city") == {"documents", "city"}
+        with pytest.raises(AppException):
+            PropertyService.parse_detail_include("project,reservations")
@@ -0,0 +1,154 @@
+# ================================
+# TENANT CONTEXT TESTS (test_tenant_context.py)
+# ================================
+
+import os
+import uuid
+
+import pytest
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+pytestmark = pytest.mark.integration
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+CURRENT_TENANT = "SELECT current_setting('app.current_tenant_id', true)"
+
+
+@pytest.fixture(scope="module")
+def session_factory():
+    """Sessions on a single pooled connection, so every checkout reuses the previous one."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("Set TEST_DATABASE_URL to run tenant context tests")
+    
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from app.core.database import _instrument_tenant_context
+    from app.core.db_routing import RoutingSession
+    
+    engine = create_engine(TEST_DATABASE_URL, pool_size=1, max_overflow=0)
+    _instrument_tenant_context(engine)
+    yield sessionmaker(bind=engine, autoflush=False, class_=RoutingSession)
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def probe_table(session_factory):
+    """Table whose column default records the tenant context at insert time"""
+    from sqlalchemy import text
+    
+    with session_factory() as db:
+        db.execute(text(
+            "CREATE TABLE IF NOT EXISTS tenant_context_probe "
+            "(n integer, tenant text DEFAULT current_setting('app.current_tenant_id', true))"
+        ))
+        db.commit()
+    yield "tenant_context_probe"
+    with session_factory() as db:
+        db.execute(text("DROP TABLE IF EXISTS tenant_context_probe"))
+        db.commit()
+
+
+def _current_tenant(db):
+    from sqlalchemy import text
+    return db.execute(text(CURRENT_TENANT)).scalar() or ""
+
+
+class TestTenantContext:
+    """Tenant context is transaction-local and never leaks to the next checkout."""
+    
+    def test_applied_to_first_statement(self, session_factory):
+        from app.core.database import set_tenant_context
+        
+        tenant_id = uuid.uuid4()
+        with session_factory() as db:
+            set_tenant_context(db, tenant_id)
+            assert _current_tenant(db) == str(tenant_id)
+    
+    def test_survives_commit_within_session(self, session_factory):
+        from app.core.database import set_tenant_context
+        
+        tenant_id = uuid.uuid4()
+        with session_factory() as db:
+            set_tenant_context(db, tenant_id)
+            assert _current_tenant(db) == str(tenant_id)
+            db.commit()
+            assert _current_tenant(db) == str(tenant_id)
+    
+    def test_switch_inside_running_transaction(self, session_factory):
+        from app.core.database import set_tenant_context
+        
+        tenant_a, tenant_b = uuid.uuid4(), uuid.uuid4()
+        with session_factory() as db:
+            set_tenant_context(db, tenant_a)
+            assert _current_tenant(db) == str(tenant_a)
+            set_tenant_context(db, tenant_b)
+            assert _current_tenant(db) == str(tenant_b)
+    
+    def test_applied_to_server_side_cursor(self, session_factory):
+        from sqlalchemy import func, select
+        from app.core.database import set_tenant_context
+        
+        # First statement of the transaction is a DECLARE on a named cursor (yield_per)
+        tenant_id = uuid.uuid4()
+        with session_factory() as db:
+            set_tenant_context(db, tenant_id)
+            result = db.execute(
+                select(func.current_setting("app.current_tenant_id", True)).execution_options(yield_per=10)
+            )
+            assert result.scalars().all() == [str(tenant_id)]
+            assert _current_tenant(db) == str(tenant_id)
+    
+    def test_applied_to_executemany(self, session_factory, probe_table):
+        from sqlalchemy import text
+        from app.core.database import set_tenant_context
+        
+        tenant_id = uuid.uuid4()
+        with session_factory() as db:
+            set_tenant_context(db, tenant_id)
+            db.execute(text(f"INSERT INTO {probe_table} (n) VALUES (:n)"), [{"n": 1}, {"n": 2}])
+            tenants = db.execute(text(f"SELECT tenant FROM {probe_table}")).scalars().all()
+            assert tenants == [str(tenant_id), str(tenant_id)]
+            assert _current_tenant(db) == str(tenant_id)
+            db.rollback()
+    
+    @pytest.mark.parametrize("finish", ["commit", "rollback", "close"])
+    def test_no_leak_to_next_checkout(self, session_factory, finish):
+        from app.core.database import set_tenant_context
+        
+        with session_factory() as db:
+            set_tenant_context(db, uuid.uuid4())
+            _current_tenant(db)
+            getattr(db, finish)()
+        
+        # Same physical connection, session without tenant (e.g. a scheduler job)
+        with session_factory() as db:
+            assert _current_tenant(db) == ""
+    
+    def test_no_leak_of_unsent_context(self, session_factory):
+        from app.core.database import set_tenant_context
+        
+        # Transaction begun but no statement sent: the queued context must be discarded
+        with session_factory() as db:
+            set_tenant_context(db, uuid.uuid4())
+            db.connection()
+        
+        with session_factory() as db:
+            assert _current_tenant(db) == ""
+    
+    def test_no_tenant_clears_context(self, session_factory):
+        from app.core.database import set_tenant_context
+        
+        with session_factory() as db:
+            set_tenant_context(db, None)
+            assert _current_tenant(db) == ""
+    
+    def test_rejects_non_uuid_tenant(self, session_factory):
+        from app.core.database import set_tenant_context
+        
+        with session_factory() as db:
+            with pytest.raises(ValueError):
+                set_tenant_context(db, "x'; DROP TABLE tenants; --")
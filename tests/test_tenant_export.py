@@ -0,0 +1,129 @@
+# ================================
+# TENANT EXPORT TESTS (test_tenant_export.py)
+# ================================
+
+import gzip
+import json
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+USER_COUNT = 5
+PROJECT_COUNT = 3
+
+
+@pytest.fixture(scope="module")
+def tenant_with_data(session_factory):
+    """A tenant with USER_COUNT users and PROJECT_COUNT projects, removed again after the module"""
+    from app.models.business import Project
+    from app.models.tenant import Tenant
+    from app.models.user import User
+    
+    suffix = uuid.uuid4().hex[:8]
+    with session_factory() as db:
+        tenant = Tenant(name=f"Export Test {suffix}", slug=f"export-test-{suffix}")
+        db.add(tenant)
+        db.flush()
+        users = [
+            User(email=f"tenant-export-{suffix}-{i}@example.com", tenant_id=tenant.id)
+            for i in range(USER_COUNT)
+        ]
+        db.add_all(users)
+        db.flush()
+        db.add_all(
+            Project(
+                name=f"Project {i}", street="Teststraße", house_number=str(i + 1),
+                city="Berlin", state="Berlin", zip_code="10115",
+                tenant_id=tenant.id, created_by=users[0].id
+            )
+            for i in range(PROJECT_COUNT)
+        )
+        db.commit()
+        tenant_id = tenant.id
+    
+    yield tenant_id
+    
+    with session_factory() as db:
+        db.query(Project).filter(Project.tenant_id == tenant_id).delete()
+        db.query(User).filter(User.tenant_id == tenant_id).delete()
+        db.query(Tenant).filter(Tenant.id == tenant_id).delete()
+        db.commit()
+
+
+@pytest.fixture
+def export_env(monkeypatch, session_factory, in_memory_s3):
+    """Export service on the test database, small batches (several fetches per section), S3 in memory"""
+    from app.config import settings
+    from app.services import tenant_export_service
+    
+    monkeypatch.setattr(tenant_export_service, "SessionLocal", session_factory)
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    return in_memory_s3
+
+
+def _lines(body):
+    return [json.loads(line) for line in body.decode("utf-8").splitlines()]
+
+
+def _section_counts(lines):
+    return {line["section"]: line["count"] for line in lines if line.get("event") == "section_end"}
+
+
+class TestTenantExport:
+    """Every section starts a server-side cursor; sections after the first run in a new transaction."""
+    
+    @pytest.mark.parametrize("resume_from", ["users", "projects", "audit_logs"])
+    def test_resumed_stream(self, export_env, tenant_with_data, resume_from):
+        from app.services.tenant_export_service import TenantExportService
+        
+        sections = TenantExportService.resolve_sections(True, True, True, resume_from=resume_from)
+        
+        lines = _lines(b"".join(TenantExportService.stream_export(tenant_with_data, sections)))
+        
+        assert lines[0] == {"section": resume_from, "event": "section_start"}
+        assert lines[-1] == {"event": "export_complete", "sections": sections}
+        counts = _section_counts(lines)
+        assert list(counts) == sections
+        if "users" in counts:
+            assert counts["users"] == USER_COUNT
+        if "projects" in counts:
+            assert counts["projects"] == PROJECT_COUNT
+    
+    def test_multi_section_job(self, export_env, tenant_with_data):
+        from app.services.tenant_export_service import TenantExportService, EXPORT_SECTIONS
+        
+        sections = TenantExportService.resolve_sections(True, True, True)
+        job = TenantExportService.create_job(tenant_with_data, sections, user_id=uuid.uuid4())
+        
+        TenantExportService.run_job(job["job_id"])
+        
+        assert job["status"] == "completed", job["error"]
+        assert job["completed_sections"] == list(EXPORT_SECTIONS)
+        assert job["records"]["users"] == USER_COUNT
+        assert job["records"]["projects"] == PROJECT_COUNT
+        for section in sections:
+            uploaded = export_env.objects[TenantExportService.export_key(tenant_with_data, job["job_id"], section)]
+            lines = _lines(gzip.decompress(uploaded["body"]))
+            assert _section_counts(lines) == {section: job["records"][section]}
+            assert uploaded["metadata"]["records"] == str(job["records"][section])
+    
+    def test_resumed_job_skips_uploaded_sections(self, export_env, tenant_with_data):
+        from app.services.tenant_export_service import TenantExportService
+        
+        sections = TenantExportService.resolve_sections(True, True, True)
+        first = TenantExportService.create_job(tenant_with_data, sections, user_id=uuid.uuid4())
+        TenantExportService.run_job(first["job_id"])
+        
+        # Lost users section: a rerun of the same job uploads only that one again
+        users_key = TenantExportService.export_key(tenant_with_data, first["job_id"], "users")
+        del export_env.objects[users_key]
+        rerun = TenantExportService.create_job(
+            tenant_with_data, sections, user_id=uuid.uuid4(), job_id=uuid.UUID(first["job_id"])
+        )
+        TenantExportService.run_job(rerun["job_id"])
+        
+        assert rerun["status"] == "completed", rerun["error"]
+        assert rerun["records"] == {"users": USER_COUNT}
+        assert users_key in export_env.objects
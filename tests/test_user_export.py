@@ -0,0 +1,124 @@
+# ================================
+# USER EXPORT TESTS (test_user_export.py)
+# ================================
+
+import csv
+import gzip
+import io
+import json
+import uuid
+
+import pytest
+
+pytestmark = pytest.mark.integration
+
+USER_COUNT = 5
+
+
+@pytest.fixture(scope="module")
+def tenant_with_users(session_factory):
+    """A tenant with USER_COUNT users, removed again after the module"""
+    from app.models.tenant import Tenant
+    from app.models.user import User
+    
+    suffix = uuid.uuid4().hex[:8]
+    with session_factory() as db:
+        tenant = Tenant(name=f"Export Test {suffix}", slug=f"export-test-{suffix}")
+        db.add(tenant)
+        db.flush()
+        emails = [f"export-{suffix}-{i}@example.com" for i in range(USER_COUNT)]
+        db.add_all(User(email=email, tenant_id=tenant.id, first_name="Export", last_name=str(i)) for i, email in enumerate(emails))
+        db.commit()
+        tenant_id = tenant.id
+    
+    yield tenant_id, set(emails)
+    
+    with session_factory() as db:
+        db.query(User).filter(User.tenant_id == tenant_id).delete()
+        db.query(Tenant).filter(Tenant.id == tenant_id).delete()
+        db.commit()
+
+
+@pytest.fixture
+def export_env(monkeypatch, session_factory, in_memory_s3):
+    """Export service on the test database, small batches (several fetches per export), S3 in memory"""
+    from app.config import settings
+    from app.services import user_export_service
+    
+    monkeypatch.setattr(user_export_service, "SessionLocal", session_factory)
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    return in_memory_s3
+
+
+def _emails(format, body):
+    if format == "csv":
+        return {row["email"] for row in csv.DictReader(io.StringIO(body.decode("utf-8")))}
+    if format == "json":
+        return {user["email"] for user in json.loads(body)["users"]}
+    from openpyxl import load_workbook
+    rows = load_workbook(io.BytesIO(body), read_only=True)["Users"].iter_rows(values_only=True)
+    header = next(rows)
+    return {row[header.index("email")] for row in rows}
+
+
+class TestUserExport:
+    """Exports read through a server-side cursor right after the tenant context is set."""
+    
+    @pytest.mark.parametrize("format", ["csv", "json", "xlsx"])
+    def test_stream_export(self, export_env, tenant_with_users, format):
+        from app.services.user_export_service import UserExportService
+        
+        if format == "xlsx":
+            pytest.importorskip("openpyxl")
+        tenant_id, emails = tenant_with_users
+        
+        body = b"".join(UserExportService.stream_export(tenant_id, format))
+        
+        assert _emails(format, body) == emails
+    
+    def test_stream_export_gzip(self, export_env, tenant_with_users):
+        from app.services.user_export_service import UserExportService
+        
+        tenant_id, emails = tenant_with_users
+        
+        body = b"".join(UserExportService.stream_export(tenant_id, "csv", compress=True))
+        
+        assert _emails("csv", gzip.decompress(body)) == emails
+    
+    def test_run_job(self, export_env, tenant_with_users):
+        from app.services.user_export_service import UserExportService
+        
+        tenant_id, emails = tenant_with_users
+        job = UserExportService.create_job(tenant_id, "json", compress=True, user_id=uuid.uuid4())
+        
+        UserExportService.run_job(job["job_id"])
+        
+        assert job["status"] == "completed", job["error"]
+        uploaded = export_env.objects[job["s3_key"]]
+        assert uploaded["metadata"]["tenant_id"] == str(tenant_id)
+        assert job["size_bytes"] == len(uploaded["body"])
+        assert _emails("json", gzip.decompress(uploaded["body"])) == emails
+    
+    def test_job_visible_to_other_workers(self, export_env, tenant_with_users, monkeypatch):
+        from types import SimpleNamespace
+        from app.core.exceptions import AppException
+        from app.services import user_export_service
+        from app.services.export_job_service import ExportJobRegistry
+        from app.services.user_export_service import UserExportService
+        
+        tenant_id, _ = tenant_with_users
+        owner = SimpleNamespace(id=uuid.uuid4(), tenant_id=tenant_id, is_super_admin=False)
+        job = UserExportService.create_job(tenant_id, "csv", compress=True, user_id=owner.id)
+        UserExportService.run_job(job["job_id"])
+        
+        # Ein anderer Worker kennt den Job nicht, nur die Datei in S3
+        monkeypatch.setattr(user_export_service, "_export_jobs", ExportJobRegistry())
+        status = UserExportService.get_job(uuid.UUID(job["job_id"]), owner)
+        
+        assert status["status"] == "completed"
+        assert status["format"] == "csv" and status["compressed"] is True
+        assert status["download_url"] == f"memory://{job['s3_key']}"
+        
+        other = SimpleNamespace(id=uuid.uuid4(), tenant_id=tenant_id, is_super_admin=False)
+        with pytest.raises(AppException):
+            UserExportService.get_job(uuid.UUID(job["job_id"]), other)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark: property list page via ORM objects vs. column projection.
+
+- "orm":        Property objects with subqueryload of Property.images and Project.images,
+                mapped by map_property_to_overview (the previous list_properties path)
+- "projection": overview columns with the maintained cover_thumbnail_url, rows mapped by
+                map_property_row_to_overview (PropertyService.list_properties)
+
+Each iteration uses a fresh session (as a request would) and builds PropertyOverview
+objects. Reports rows per second and latency per page size, and checks that both
+paths return the same items (which also checks cover_thumbnail_url against the images).
+
+    python utility_scripts/benchmark_property_list.py --page-size 20 100 500 --iterations 30
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import func
+from sqlalchemy.orm import subqueryload
+
+
+def _orm_page(db, tenant_id, page_size):
+    from app.models.business import Property, Project
+    from app.mappers.property_mapper import map_property_to_overview
+    from app.schemas.business import PropertyOverview
+    
+    properties = db.query(Property).options(
+        subqueryload(Property.images),
+        subqueryload(Property.project).subqueryload(Project.images)
+    ).filter(
+        Property.tenant_id == tenant_id
+    ).order_by(Property.created_at.desc(), Property.id.desc()).limit(page_size).all()
+    
+    return [PropertyOverview(**map_property_to_overview(prop)) for prop in properties]
+
+
+def _projection_page(db, tenant_id, page_size):
+    from app.models.business import Property
+    from app.mappers.property_mapper import map_property_row_to_overview
+    from app.schemas.business import PropertyOverview
+    from app.services.property_service import PropertyService
+    
+    query = db.query(Property).join(Property.project).filter(
+        Property.tenant_id == tenant_id
+    ).order_by(Property.created_at.desc(), Property.id.desc())
+    rows = PropertyService._overview_projection(query).limit(page_size).all()
+    
+    return [PropertyOverview(**map_property_row_to_overview(row)) for row in rows]
+
+
+def _run(mode, tenant_id, page_size, iterations):
+    from app.core.database import SessionLocal, set_tenant_context
+    
+    page = _orm_page if mode == "orm" else _projection_page
+    latencies = []
+    rows = 0
+    for _ in range(iterations):
+        db = SessionLocal()
+        try:
+            set_tenant_context(db, tenant_id)
+            started = time.perf_counter()
+            items = page(db, tenant_id, page_size)
+            latencies.append(time.perf_counter() - started)
+            rows += len(items)
+        finally:
+            db.close()
+    
+    latencies.sort()
+    return {
+        "mode": mode,
+        "page_size": page_size,
+        "rows_per_s": round(rows / sum(latencies), 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p95_ms": round(latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000, 1),
+    }
+
+
+def _busiest_tenant():
+    from app.core.database import SessionLocal
+    from app.models.business import Property
+    
+    db = SessionLocal()
+    try:
+        row = db.query(Property.tenant_id, func.count(Property.id)).group_by(
+            Property.tenant_id
+        ).order_by(func.count(Property.id).desc()).first()
+        return row[0] if row else None
+    finally:
+        db.close()
+
+
+def _check_same_items(tenant_id, page_size):
+    from app.core.database import SessionLocal, set_tenant_context
+    
+    db = SessionLocal()
+    try:
+        set_tenant_context(db, tenant_id)
+        orm_items = [item.model_dump() for item in _orm_page(db, tenant_id, page_size)]
+        projection_items = [item.model_dump() for item in _projection_page(db, tenant_id, page_size)]
+    finally:
+        db.close()
+    
+    mismatches = sum(1 for a, b in zip(orm_items, projection_items) if a != b)
+    if len(orm_items) != len(projection_items) or mismatches:
+        print(f"WARNING: paths differ (page_size={page_size}, {mismatches} mismatching items)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tenant-id", help="Tenant to list (default: tenant with the most properties)")
+    parser.add_argument("--page-size", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--iterations", type=int, default=30)
+    args = parser.parse_args()
+    
+    tenant_id = args.tenant_id or _busiest_tenant()
+    if not tenant_id:
+        print("No properties found")
+        return
+    
+    results = []
+    for page_size in args.page_size:
+        _check_same_items(tenant_id, page_size)
+        for mode in ("orm", "projection"):
+            _run(mode, tenant_id, page_size, 2)  # Warm-up
+            results.append(_run(mode, tenant_id, page_size, args.iterations))
+    
+    columns = ["mode", "page_size", "rows_per_s", "p50_ms", "p95_ms"]
+    print(" | ".join(f"{c:>12}" for c in columns))
+    for result in results:
+        print(" | ".join(f"{str(result[c]):>12}" for c in columns))
+    
+    from app.core.database import engine
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Benchmark: project detail serialization and response compression.
+
+- "fastapi":        route returns the model, FastAPI dumps it, validates it against
+                    response_model again and encodes it with json (the previous path)
+- "model_response": ModelResponse, one model_dump_json by pydantic-core (GET /projects/{id})
+- "stdlib":         model dumped once, encoded by starlette's JSONResponse (json.dumps)
+- "orjson":         model dumped once, encoded by FastJSONResponse (default response class)
+
+Builds the ProjectResponse of the project with the most properties (as GET /projects/{id}
+does), or with --synthetic a generated one without a database (N properties, M project
+images, a full micro location). Reports serialization CPU time per response, then payload
+size and compression time for identity, gzip and br at the configured
+RESPONSE_COMPRESSION_* settings.
+
+    python utility_scripts/benchmark_serialization.py --iterations 200
+    python utility_scripts/benchmark_serialization.py --synthetic --properties 120 --images 25
+
+Synthetic defaults (120 properties, 25 images, 105.6 KB JSON), 1 vCPU, p50 CPU per response:
+fastapi 5.3 ms, model_response 0.77 ms, stdlib 3.0 ms, orjson 1.1 ms; gzip (level 6)
+11.6 KB in 1.6 ms, br (quality 4) 10.5 KB in 1.1 ms.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import UUID, uuid4
+
+# Add parent directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import func
+
+
+def _largest_project_response(project_id=None):
+    from app.core.database import SessionLocal
+    from app.mappers.project_mapper import map_project_to_response
+    from app.mappers.property_mapper import map_property_to_overview
+    from app.models.business import Property, Project
+    from app.schemas.business import ProjectResponse, PropertyOverview
+    from app.services.project_service import ProjectService
+    
+    db = SessionLocal()
+    try:
+        if project_id is None:
+            row = db.query(Property.project_id, Property.tenant_id).group_by(
+                Property.project_id, Property.tenant_id
+            ).order_by(func.count(Property.id).desc()).first()
+            if not row:
+                return None
+            project_id, tenant_id = row
+        else:
+            tenant_id = db.query(Project.tenant_id).filter(Project.id == project_id).scalar()
+        
+        project = ProjectService.get_project(db, project_id, tenant_id, with_micro_location=True)
+        response_data = map_project_to_response(project)
+        response_data['properties'] = [
+            PropertyOverview(**map_property_to_overview(prop)) for prop in project.properties
+        ]
+        return ProjectResponse(**response_data)
+    finally:
+        db.close()
+
+
+def _synthetic_project_response(property_count, image_count):
+    """ProjectResponse shaped like a real project detail, generated deterministically"""
+    from app.schemas.business import ProjectResponse, PropertyOverview
+    
+    rng = random.Random(42)
+    created_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    project_id = uuid4()
+    
+    images = [
+        {
+            "id": uuid4(),
+            "project_id": project_id,
+            "image_url": f"https://cdn.example.com/tenants/demo/projects/{project_id}/images/{uuid4()}.jpg",
+            "image_type": rng.choice(["exterior", "interior", "floor_plan"]),
+            "title": f"Ansicht {i + 1}",
+            "description": None,
+            "display_order": i,
+            "file_size": rng.randint(200_000, 2_000_000),
+            "mime_type": "image/jpeg",
+            "width": 1920,
+            "height": 1280,
+            "created_at": created_at,
+            "updated_at": created_at
+        }
+        for i in range(image_count)
+    ]
+    
+    categories = {}
+    for category in ("supermarket", "school", "kindergarten", "pharmacy", "doctor", "restaurant", "park", "transit_station"):
+        categories[category] = [
+            {
+                "name": f"{category.title()} {i + 1}",
+                "address": f"Musterstraße {rng.randint(1, 200)}, 10115 Berlin",
+                "rating": round(rng.uniform(3.0, 5.0), 1),
+                "distances": {
+                    "walking": {"distance_meters": rng.randint(80, 2500), "duration_minutes": rng.randint(1, 30)},
+                    "driving": {"distance_meters": rng.randint(200, 5000), "duration_minutes": rng.randint(1, 15)}
+                }
+            }
+            for i in range(10)
+        ]
+    micro_location = {
+        "location": {"lat": 52.5321, "lng": 13.3849},
+        "street_view": {"available": True, "url": "https://maps.example.com/streetview?location=52.5321,13.3849"},
+        "categories": categories
+    }
+    
+    properties = []
+    for i in range(property_count):
+        price = rng.randint(180_000, 650_000)
+        rent = round(price * rng.uniform(0.0025, 0.0038), 2)
+        properties.append(PropertyOverview(
+            id=uuid4(), project_id=project_id, project_name="Wohnpark Mitte",
+            project_street="Musterstraße", project_house_number="12",
+            unit_number=f"WE {i + 1}", city="Berlin", state="Berlin", property_type="apartment",
+            purchase_price=price, monthly_rent=rent, size_sqm=round(rng.uniform(28, 120), 1),
+            rooms=rng.choice([1, 1.5, 2, 2.5, 3, 4]), floor=str(rng.randint(0, 6)), investagon_id=str(100000 + i),
+            active=1, pre_sale=0, draft=0, visibility=1,
+            initial_maintenance_expenses=round(rng.uniform(0, 15), 2),
+            gross_rental_yield=round(rent * 12 * 100 / price, 2),
+            thumbnail_url=images[0]["image_url"] if images else None
+        ))
+    
+    return ProjectResponse(
+        id=project_id, name="Wohnpark Mitte", street="Musterstraße", house_number="12",
+        city="Berlin", district="Mitte", state="Berlin", zip_code="10115",
+        latitude=52.5321, longitude=13.3849, construction_year=1908, renovation_year=2021,
+        total_floors=6, total_units=property_count, building_type="Altbau",
+        has_elevator=True, has_parking=False, has_basement=True, has_garden=True,
+        energy_certificate_type="Verbrauchsausweis", energy_consumption=112.4, energy_class="D",
+        heating_type="Fernwärme", description="Saniertes Altbauensemble mit Innenhof. " * 20,
+        amenities=["Aufzug", "Keller", "Fahrradraum", "Innenhof"], micro_location_v2=micro_location,
+        city_id=None, investagon_id="P-4711", images=images, city_ref=None, properties=properties,
+        property_count=property_count, thumbnail_url=images[0]["image_url"] if images else None,
+        created_at=created_at, updated_at=created_at + timedelta(days=30)
+    )
+
+
+def _fastapi_path(model):
+    # Wie fastapi.routing.serialize_response mit response_model_exclude_none=True
+    revalidated = type(model).model_validate(model.model_dump())
+    content = revalidated.model_dump(mode="json", by_alias=True, exclude_none=True)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _model_response_path(model):
+    from app.core.responses import ModelResponse
+    return ModelResponse(model).body
+
+
+def _stdlib_path(model):
+    from starlette.responses import JSONResponse
+    return JSONResponse(model.model_dump(mode="json", by_alias=True, exclude_none=True)).body
+
+
+def _orjson_path(model):
+    from app.core.responses import FastJSONResponse
+    return FastJSONResponse(model.model_dump(mode="json", by_alias=True, exclude_none=True)).body
+
+
+def _cpu_ms(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.process_time()
+        fn()
+        timings.append(time.process_time() - started)
+    timings.sort()
+    return (
+        round(statistics.median(timings) * 1000, 3),
+        round(timings[max(int(len(timings) * 0.95) - 1, 0)] * 1000, 3),
+    )
+
+
+def _compressors():
+    from app.config import settings
+    
+    compressors = {
+        "identity": lambda body: body,
+        "gzip": lambda body: _gzip(body, settings.RESPONSE_COMPRESSION_GZIP_LEVEL),
+    }
+    try:
+        import brotli
+        compressors["br"] = lambda body: brotli.compress(body, quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY)
+    except ImportError:
+        print("brotli not installed, skipping br")
+    return compressors
+
+
+def _gzip(body, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31 = gzip-Container
+    return compressor.compress(body) + compressor.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project-id", type=UUID, help="Project to serialize (default: project with the most properties)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--synthetic", action="store_true", help="Generated project instead of the database")
+    parser.add_argument("--properties", type=int, default=120, help="Properties of the synthetic project")
+    parser.add_argument("--images", type=int, default=25, help="Project images of the synthetic project")
+    args = parser.parse_args()
+    
+    if args.synthetic:
+        model = _synthetic_project_response(args.properties, args.images)
+    else:
+        model = _largest_project_response(args.project_id)
+    if model is None:
+        print("No projects with properties found")
+        return
+    print(f"Project {model.id}: {len(model.properties)} properties")
+    
+    paths = {
+        "fastapi": _fastapi_path,
+        "model_response": _model_response_path,
+        "stdlib": _stdlib_path,
+        "orjson": _orjson_path,
+    }
+    
+    # Alle Pfade müssen denselben Inhalt liefern
+    reference = json.loads(_fastapi_path(model))
+    for name, path in paths.items():
+        if json.loads(path(model)) != reference:
+            print(f"WARNING: {name} output differs from fastapi")
+    
+    columns = ["mode", "bytes", "p50_cpu_ms", "p95_cpu_ms"]
+    print(" | ".join(f"{c:>14}" for c in columns))
+    for name, path in paths.items():
+        path(model)  # Warm-up
+        body = path(model)
+        p50, p95 = _cpu_ms(lambda: path(model), args.iterations)
+        print(" | ".join(f"{str(v):>14}" for v in (name, len(body), p50, p95)))
+    
+    body = _model_response_path(model)
+    print()
+    columns = ["encoding", "bytes", "ratio", "p50_cpu_ms"]
+    print(" | ".join(f"{c:>14}" for c in columns))
+    for name, compress in _compressors().items():
+        compressed = compress(body)
+        p50, _ = _cpu_ms(lambda: compress(body), max(args.iterations // 4, 1))
+        ratio = round(len(compressed) / len(body), 3)
+        print(" | ".join(f"{str(v):>14}" for v in (name, len(compressed), ratio, p50)))
+    
+    if not args.synthetic:
+        from app.core.database import engine
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()